@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Delta order path reads (set_leverage, balance, price, tp / sl order status)
+one after the other vs DeltaOrderPath (module/async_client.py), against a
+local stub server that answers after LATENCY_MS like a remote exchange.
+
+    python benchmarks/bench_async_client.py
+"""
+
+import sys
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.async_client import DeltaOrderPath
+from module.http_session import get_session, close_sessions
+from test_http_session import start_stub
+
+LATENCY_MS = 50
+REPEAT = 10
+
+
+class StubBroker:
+    """The DeltaBroker reads of the order path as GETs to the stub"""
+
+    def __init__(self, url):
+        self.url = f"{url}/delay/{LATENCY_MS}"
+        self.session = get_session(url)
+
+    def _get(self, path):
+        return self.session.get(f"{self.url}{path}").json()
+
+    def set_leverage(self, leverage):
+        return self._get(f"/leverage/{leverage}")
+
+    def get_usd_balance(self):
+        return self._get("/balance")
+
+    def get_market_price(self):
+        return self._get("/price")
+
+    def get_order_status(self, order_id):
+        return self._get(f"/orders/{order_id}")
+
+
+def sequential(broker):
+    broker.set_leverage(10)
+    broker.get_usd_balance()
+    broker.get_market_price()
+    broker.get_order_status(1)
+    broker.get_order_status(2)
+
+
+def concurrent(orders):
+    orders.entry_snapshot_sync(10)
+    orders.bracket_states_sync(1, 2)
+
+
+def timed(func):
+    func()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    server, url = start_stub()
+    broker = StubBroker(url)
+    orders = DeltaOrderPath(broker)
+    before = timed(lambda: sequential(broker))
+    after = timed(lambda: concurrent(orders))
+    print(f"order path reads ({LATENCY_MS} ms exchange latency)")
+    print(f"  sequential      {before * 1000:7.1f} ms")
+    print(f"  DeltaOrderPath  {after * 1000:7.1f} ms   ({before / after:.1f}x)")
+    close_sessions()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Reading a range of one year of 1m candles from the on-disk archive
+(module/candle_archive.py) vs parsing the same candles from a CSV file.
+
+    python benchmarks/bench_candle_archive.py
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.candle_archive import CandleArchive
+
+N = 525_600  # one year of 1m candles
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    close = 2000 + np.cumsum(rng.normal(0, 1, N))
+    candles = pd.DataFrame({
+        'time': 1_700_000_040_000 + 60_000 * np.arange(N), 'open': close, 'high': close + 1,
+        'low': close - 1, 'close': close, 'volume': rng.random(N),
+    })
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSDT', '1')
+        write_time, _ = timed(lambda: series.write(candles), repeat=1)
+        csv_path = os.path.join(root, 'candles.csv')
+        candles.to_csv(csv_path, index=False)
+
+        start, end = candles['time'].iloc[N // 2], candles['time'].iloc[N // 2 + 10_000]
+        archive_time, df = timed(lambda: series.read(start, end))
+
+        def read_csv():
+            df = pd.read_csv(csv_path)
+            return df[(df['time'] >= start) & (df['time'] < end)]
+
+        csv_time, _ = timed(read_csv, repeat=1)
+        gaps_time, _ = timed(lambda: series.gaps(candles['time'].iloc[0], candles['time'].iloc[-1]))
+
+        print(f"archive write ({N} candles)   {write_time * 1000:9.1f} ms")
+        print(f"archive read (10000 candles)  {archive_time * 1000:9.2f} ms")
+        print(f"CSV parse + filter            {csv_time * 1000:9.1f} ms")
+        print(f"gaps over the whole year      {gaps_time * 1000:9.1f} ms")
+        assert len(df) == 10_000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Per-cycle kline read: LiveCandleStore (in memory) vs one Bybit REST get_klines
+request. The REST column needs network access and is skipped without it.
+
+    python benchmarks/bench_candle_store.py
+"""
+
+import sys
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from test_candle_store import FakeExchange, new_store
+
+
+def per_call(func, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    exchange = FakeExchange(cursor=1200)
+    store = new_store(exchange, capacity=1000)
+    message = exchange.message(1200)
+
+    print(f"{'read':>22} {'per call':>12}")
+    for name, func in (('frame(200)', lambda: store.frame(200)),
+                       ('arrays(200)', lambda: store.arrays(200)),
+                       ('last_close()', store.last_close),
+                       ('websocket message', lambda: store.handle_message(message))):
+        print(f"{name:>22} {per_call(func) * 1e6:>10.1f}us")
+
+    try:
+        from bybit_client import BybitClient
+        client = BybitClient()
+        rest = per_call(lambda: client.get_klines(symbol="ETHUSD", category="inverse", interval="15", limit=200),
+                        repeat=5)
+        print(f"{'REST get_klines(200)':>22} {rest * 1e6:>10.1f}us")
+    except Exception as e:
+        print(f"{'REST get_klines(200)':>22} {'skipped':>12} ({type(e).__name__})")
+
+
+if __name__ == "__main__":
+    main()
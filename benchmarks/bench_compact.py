@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Memory of the pipeline signal frames in pipeline dtypes vs compact_signal_frame,
+for the bot's 200 candle window and longer per symbol histories (the candles of
+data/ETHUSD.csv repeated with a price drift)
+
+    python benchmarks/bench_compact.py
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.compact import compact_signal_frame, expand_signal_frame, frame_memory
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS, IMPORTANT_SIGNAL_COLUMNS
+
+SIZES = [200, 10_000, 100_000]
+
+
+def history(n):
+    """n candles: data/ETHUSD.csv tiled, each copy shifted to continue the last close"""
+    base = pd.read_csv(os.path.join(ROOT, 'data', 'ETHUSD.csv')).sort_values('time').reset_index(drop=True)
+    copies = []
+    offset = 0.0
+    for k in range(-(-n // len(base))):
+        part = base.copy()
+        for col in ('open', 'high', 'low', 'close'):
+            part[col] = np.round(part[col] + offset, 2)
+        part['time'] = base['time'] + k * (base['time'].iloc[-1] - base['time'].iloc[0] + 300)
+        offset = part['close'].iloc[-1] - base['close'].iloc[0]
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True).head(n)
+
+
+def main():
+    print(f"{'bars':>8} {'config':>10} {'pipeline':>12} {'compact':>12} {'ratio':>7} {'pack':>9} {'expand':>9}")
+    for n in SIZES:
+        klines = history(n)
+        for name, columns in (('main', MAIN_SIGNAL_COLUMNS), ('important', IMPORTANT_SIGNAL_COLUMNS)):
+            frame = signal_pipeline(heiken=True).run(klines, columns)
+            start = time.perf_counter()
+            compact = compact_signal_frame(frame)
+            pack = time.perf_counter() - start
+            start = time.perf_counter()
+            expand_signal_frame(compact)
+            expand = time.perf_counter() - start
+            before, after = frame_memory(frame), frame_memory(compact)
+            print(f"{n:>8} {name:>10} {before / 1024:>10.1f}KB {after / 1024:>10.1f}KB "
+                  f"{before / after:>6.1f}x {pack:>8.4f}s {expand:>8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
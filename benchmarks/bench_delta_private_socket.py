@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Fill detection: the main loop polling get_order_status every cycle vs the
+Delta private websocket book (utils/websocket_data_delta.py). A fill is pushed
+at a random moment of the cycle; the loop notices it after its sleep (REST
+polling) or as soon as the push arrives (wait_for_event). Network latency is
+not simulated, it adds the same RTT to both.
+
+    python benchmarks/bench_delta_private_socket.py
+"""
+
+import sys
+import os
+import random
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from test_delta_private_socket import live_socket, bracket_order
+
+CYCLE = 0.5    # main.py sleeps 2s, scaled down
+TRIALS = 10
+REST_CALLS_PER_CYCLE = 3    # tp status, sl status, active positions
+
+
+def detect(socket, use_events):
+    """Seconds between the fill push and the loop seeing it"""
+    socket.handle_message({'type': 'orders', 'action': 'update', **bracket_order(11, state='pending')})
+    socket.wait_for_event(0)
+    filled = {}
+
+    def push():
+        time.sleep(random.uniform(0, CYCLE))
+        filled['at'] = time.perf_counter()
+        socket.handle_message({'type': 'orders', 'action': 'update', **bracket_order(11, state='closed')})
+
+    threading.Thread(target=push).start()
+    while True:
+        if use_events:
+            socket.wait_for_event(CYCLE)
+        else:
+            time.sleep(CYCLE)
+        if socket.order_status(11)['result']['state'] == 'closed':
+            return time.perf_counter() - filled['at']
+
+
+def main():
+    random.seed(0)
+    socket = live_socket()
+    polled = [detect(socket, use_events=False) for _ in range(TRIALS)]
+    pushed = [detect(socket, use_events=True) for _ in range(TRIALS)]
+    print(f"fill detection delay, {CYCLE}s cycle, {TRIALS} fills")
+    print(f"  polling         mean {sum(polled) / TRIALS * 1000:7.1f} ms   max {max(polled) * 1000:7.1f} ms")
+    print(f"  websocket push  mean {sum(pushed) / TRIALS * 1000:7.1f} ms   max {max(pushed) * 1000:7.1f} ms")
+    print(f"REST calls per hour with a position open (main.py 2s cycle): "
+          f"polling {REST_CALLS_PER_CYCLE * 3600 // 2}, websocket live 0")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Per-request latency against a local stub server: bare requests.get (a new
+connection per call) vs the shared keep-alive session (module/http_session.py).
+With the openssl command available the stub also serves HTTPS (self-signed
+certificate), where the saved TLS handshake is most of the difference.
+
+    python benchmarks/bench_http_session.py
+"""
+
+import sys
+import os
+import ssl
+import subprocess
+import tempfile
+import time
+import warnings
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.http_session import new_session
+from test_http_session import start_stub
+
+
+def per_call(func, repeat=300):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def wrap_tls(server, directory):
+    """Serve the stub over TLS with a fresh self-signed certificate, None without openssl"""
+    key, cert = os.path.join(directory, 'key.pem'), os.path.join(directory, 'cert.pem')
+    try:
+        subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                        '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1', '-keyout', key, '-out', cert],
+                       check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    return cert
+
+
+def compare(name, url, verify=True):
+    session = new_session()
+    bare = per_call(lambda: requests.get(f"{url}/v5/market/kline", verify=verify))
+    pooled = per_call(lambda: session.get(f"{url}/v5/market/kline", verify=verify))
+    session.close()
+    print(f"{name:6s} requests.get {bare * 1000:7.3f} ms   shared session {pooled * 1000:7.3f} ms"
+          f"   ({bare / pooled:.1f}x)")
+
+
+def main():
+    server, url = start_stub()
+    compare('http', url)
+    server.shutdown()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server, url = start_stub()
+        cert = wrap_tls(server, directory)
+        if cert is None:
+            print("https  skipped (no openssl)")
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                compare('https', url.replace('http://', 'https://'), verify=cert)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+calculate_inside_ib_box: old per-row df.loc version vs the array kernel
+
+    python benchmarks/bench_inside_bar.py
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.ib_indicator import calculate_inside_ib_box, inside_ib_box_arrays
+from test_inside_bar_kernel import old_calculate_inside_ib_box
+
+SIZES = [200, 1000, 5000]
+
+
+def synthetic_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 2500 + np.cumsum(rng.normal(0, 1.5, n))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    spread = np.abs(rng.normal(0, 2.0, n))
+    return pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) + spread,
+                         'low': np.minimum(open_, close) - spread, 'close': close})
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'bars':>8} {'old df.loc':>12} {'DataFrame':>12} {'arrays':>12} {'speedup':>9}")
+    for n in SIZES:
+        df = synthetic_candles(n)
+        old = timed(lambda: old_calculate_inside_ib_box(df), 1)
+        new = timed(lambda: calculate_inside_ib_box(df), 5)
+        arrays = timed(lambda: inside_ib_box_arrays(df['open'].values, df['high'].values,
+                                                    df['low'].values, df['close'].values), 5)
+        print(f"{n:>8} {old:>11.4f}s {new:>11.4f}s {arrays:>11.4f}s {old / new:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
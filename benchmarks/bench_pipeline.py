@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Signal frame of main / important: old rename -> Heiken-Ashi -> run_filter ->
+rename -> RSI -> Gainzy -> IB box -> drop -> tail sequence vs the pipeline
+
+    python benchmarks/bench_pipeline.py
+"""
+
+import sys
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS, IMPORTANT_SIGNAL_COLUMNS
+from test_pipeline import load_klines, old_main_signals, old_indicators
+
+SIZES = [200, 1000]
+
+
+def timed(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'bars':>8} {'config':>10} {'old':>10} {'pipeline':>10} {'speedup':>9}")
+    for n in SIZES:
+        klines = load_klines(n)
+        cases = (
+            ('main', lambda: old_main_signals(klines.copy(), True),
+             lambda: signal_pipeline(heiken=True).run(klines, MAIN_SIGNAL_COLUMNS, window=200)),
+            ('important', lambda: old_indicators(klines.copy(), True, atr=True, gainzy=True),
+             lambda: signal_pipeline(heiken=True).run(klines, IMPORTANT_SIGNAL_COLUMNS, window=200)),
+        )
+        for name, old_func, new_func in cases:
+            old = timed(old_func, 3)
+            new = timed(new_func, 5)
+            print(f"{n:>8} {name:>10} {old:>9.4f}s {new:>9.4f}s {old / new:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep: RangeFilter.run_filter_grid vs one run_filter call per combination
+
+    python benchmarks/bench_range_filter_grid.py [bars]
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.rf import RangeFilter
+
+GRID = dict(range_quantity=[1.5, 2.0, 2.618, 3.0, 3.5],
+            range_period=[10, 14, 20, 28],
+            smooth_period=[14, 20, 27, 40],
+            average_samples=[2, 3, 4])
+
+
+def synthetic_candles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 2500 + np.cumsum(rng.normal(0, 1.5, n))
+    spread = np.abs(rng.normal(0, 1.0, n))
+    return pd.DataFrame({'Open': np.roll(close, 1), 'High': close + spread,
+                         'Low': close - spread, 'Close': close})
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 43_200  # a month of 1m bars
+    df = synthetic_candles(n)
+    rf = RangeFilter()
+    combos = int(np.prod([len(v) for v in GRID.values()]))
+
+    start = time.perf_counter()
+    rf.run_filter_grid(df, **GRID)
+    batched = time.perf_counter() - start
+
+    # time a handful of single calls and extrapolate, the full loop takes minutes
+    sample = 5
+    start = time.perf_counter()
+    for q in GRID['range_quantity'][:sample]:
+        rf.run_filter(df, range_quantity=q)
+    per_call = (time.perf_counter() - start) / sample
+
+    print(f"{combos} combinations x {n} bars")
+    print(f"  run_filter_grid : {batched:8.2f}s")
+    print(f"  run_filter loop : {per_call * combos:8.2f}s (estimated, {per_call:.3f}s per call)")
+    print(f"  speedup         : {per_call * combos / batched:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Conditional EMA: old per-bar Python loop vs the shared recursion kernel on every
+available backend, at 200 / 10k / 1M bars
+
+    python benchmarks/bench_recursion.py
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module import recursion
+
+SIZES = [200, 10_000, 1_000_000]
+PERIOD = 27
+
+
+def old_conditional_ema(values, condition, period):
+    result = np.full_like(values, np.nan, dtype=float)
+    alpha = 2.0 / (period + 1)
+    ema_val = np.nan
+    for i in range(len(values)):
+        if condition[i] and not np.isnan(values[i]):
+            if np.isnan(ema_val):
+                ema_val = values[i]
+            else:
+                ema_val = (values[i] - ema_val) * alpha + ema_val
+        result[i] = ema_val
+    return result
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    active = recursion.get_backend()
+    print(f"{'bars':>10} {'impl':>8} {'seconds':>12} {'speedup':>9}")
+    for n in SIZES:
+        values = 2500 + np.cumsum(rng.normal(0, 1, n))
+        condition = np.abs(np.diff(values, prepend=values[0])) > 0.2
+        repeat = 5 if n < 1_000_000 else 1
+
+        baseline = best_of(lambda: old_conditional_ema(values, condition, PERIOD), repeat)
+        print(f"{n:>10} {'loop':>8} {baseline:>12.6f} {1.0:>8.1f}x")
+        for name in recursion.available_backends():
+            recursion.set_backend(name)
+            recursion.conditional_ema_filter(values[:10], condition[:10], 2.0 / (PERIOD + 1))  # jit warmup
+            elapsed = best_of(lambda: recursion.conditional_ema_filter(values, condition, 2.0 / (PERIOD + 1)), repeat)
+            print(f"{n:>10} {name:>8} {elapsed:>12.6f} {baseline / elapsed:>8.1f}x")
+    recursion.set_backend(active)
+
+
+if __name__ == "__main__":
+    main()
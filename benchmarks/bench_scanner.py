@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Multi-symbol scan: one process per symbol loop vs scan_symbols over 1, 2, 4 ...
+processes (up to the core count). 40 symbols of 400 candles each, slices of
+data/ETHUSD.csv standing in for the perpetuals.
+
+    python benchmarks/bench_scanner.py [symbols]
+"""
+
+import sys
+import os
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+from module.scanner import scan_symbols
+
+
+def frames(count, bars=400):
+    df = pd.read_csv(os.path.join(ROOT, 'data', 'ETHUSD.csv')).sort_values('time').reset_index(drop=True)
+    step = max(1, (len(df) - bars) // count)
+    return {f"SYM{k:02d}": df.iloc[k * step:k * step + bars].reset_index(drop=True) for k in range(count)}
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    candles = frames(count)
+    pipeline = signal_pipeline(heiken=True)
+    serial = timed(lambda: [pipeline.run(df, MAIN_SIGNAL_COLUMNS, window=200) for df in candles.values()])
+    print(f"{count} symbols, {os.cpu_count()} cores")
+    print(f"{'processes':>10} {'time':>10} {'speedup':>9}")
+    print(f"{'loop':>10} {serial:>9.4f}s {1.0:>8.1f}x")
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        elapsed = timed(lambda: scan_symbols(candles, processes=processes))
+        print(f"{processes:>10} {elapsed:>9.4f}s {serial / elapsed:>8.1f}x")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+All four K-modes over a signal history: SignalManager.should_take_trade per bar
+and K vs evaluate_strategies (one bitmask table lookup)
+
+    python benchmarks/bench_strategy_masks.py
+"""
+
+import sys
+import os
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from module.pipeline import signal_pipeline, IMPORTANT_SIGNAL_COLUMNS
+from module.strategy_masks import STRATEGY_COLUMNS, evaluate_strategies
+from test_strategy_masks import open_manager, frame_signals
+
+
+def main():
+    klines = pd.read_csv(os.path.join(ROOT, 'data', 'ETHUSD.csv')).sort_values('time').reset_index(drop=True)
+    df = signal_pipeline(heiken=True).run(klines, IMPORTANT_SIGNAL_COLUMNS)
+    manager = open_manager()
+
+    start = time.perf_counter()
+    signals = [frame_signals(df, i) for i in range(len(df))]
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for row in signals:
+        for k in STRATEGY_COLUMNS:
+            manager.should_take_trade(row, k)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    evaluate_strategies(df)
+    masks = time.perf_counter() - start
+
+    print(f"{len(df)} bars, {len(STRATEGY_COLUMNS)} K-modes")
+    print(f"dict per bar      {build + loop:.4f}s  (building dicts {build:.4f}s)")
+    print(f"bitmask evaluator {masks:.4f}s  {(build + loop) / masks:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
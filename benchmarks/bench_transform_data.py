@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+convert_to_complete_format: old row-wise df.apply vs the array expressions, on
+data/SAMPLE.csv tiled up to 1M rows, plus the per candle cost of the streaming
+CompleteFormatState
+
+    python benchmarks/bench_transform_data.py [rows]
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from transform_data import convert_to_complete_format, CompleteFormatState
+from test_transform_data import old_convert_to_complete_format
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def scaled_sample(n):
+    """data/SAMPLE.csv repeated to n rows, one minute apart, each copy continuing the last close"""
+    base = pd.read_csv(os.path.join(ROOT, 'data', 'SAMPLE.csv'))[['timestamp', 'volume', 'close', 'open', 'high', 'low']]
+    copies = -(-n // len(base))
+    drift = np.repeat(np.arange(copies) * (base['close'].iloc[-1] - base['close'].iloc[0]), len(base))[:n]
+    df = pd.concat([base] * copies, ignore_index=True).head(n)
+    for col in ('close', 'open', 'high', 'low'):
+        df[col] = df[col].values + drift
+    df['timestamp'] = pd.date_range(base['timestamp'].iloc[0], periods=n, freq='min').astype(str)
+    return df
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else SIZES
+    print(f"{'rows':>10} {'apply':>10} {'arrays':>10} {'speedup':>9}")
+    for n in sizes:
+        df = scaled_sample(n)
+        old = timed(lambda: old_convert_to_complete_format(df.copy()))
+        new = timed(lambda: convert_to_complete_format(df))
+        print(f"{n:>10} {old:>9.3f}s {new:>9.3f}s {old / new:>8.0f}x")
+
+    df = scaled_sample(10_000)
+    state = CompleteFormatState.from_history(df.iloc[:-1000])
+    candles = df.iloc[-1000:].to_dict('records')
+    elapsed = timed(lambda: [state.update(candle) for candle in candles])
+    full = timed(lambda: convert_to_complete_format(df))
+    print(f"streaming append {elapsed / len(candles) * 1e6:.1f}us per candle "
+          f"(full 10k row conversion {full * 1e3:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
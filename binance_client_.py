@@ -1,5 +1,4 @@
 import os
-import requests
 import pandas as pd
 import numpy as np
 import time
@@ -10,12 +9,14 @@ import websocket
 import json
 import threading 
 from collections import deque
+from module.http_session import get_session
 
 class BinanceClient:
     def __init__(self, api_key, api_secret_key,testnet=0):
         self.api_key = api_key
         self.api_secret_key = api_secret_key
         self.base_url="https://fapi.binance.com"
+        self.session = get_session(self.base_url)
         # if testnet==1:
         #     self.base_url ="https://testnet.binancefuture.com"
         # else:
@@ -23,14 +24,18 @@ class BinanceClient:
             
         self.client = Client(api_key,api_secret_key)
 
-    def get_klines(self, symbol, interval='15m', limit=100):
+    def get_klines(self, symbol, interval='15m', limit=100, start_time=None, end_time=None):
         url = f"{self.base_url}/fapi/v1/klines"
         params = {
             "symbol": symbol,
             "interval": interval,
             "limit": limit
         }
-        response = requests.get(url, params=params)
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        if end_time is not None:
+            params["endTime"] = int(end_time)
+        response = self.session.get(url, params=params)
         data = response.json()
         # here i have changed the open time in col1 to time , i have removed the rest of the columns and only kept time,ohlcv
         columns = [
@@ -52,7 +57,7 @@ class BinanceClient:
     
     def get_symbol_info(self, symbol):
         url = f"{self.base_url}/fapi/v1/exchangeInfo"
-        response = requests.get(url)
+        response = self.session.get(url)
         data = response.json()
         
         for s in data['symbols']:
@@ -102,7 +107,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+        response = self.session.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
 
         if response.status_code == 200:
             print("Login successful! API key is correct.")
@@ -129,7 +134,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.delete(url, headers=headers, params=params)
+        response = self.session.delete(url, headers=headers, params=params)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -152,7 +157,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
+        response = self.session.get(f"{self.base_url}{endpoint}", headers=headers, params=params)
         balance_info = response.json()
         #print("Account Balance:", balance_info)
         try:
@@ -182,7 +187,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.post(url, headers=headers, params=params)
+        response = self.session.post(url, headers=headers, params=params)
         response_data = response.json()
 
         if response.status_code == 200:
@@ -217,7 +222,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.post(url, headers=headers, params=params)
+        response = self.session.post(url, headers=headers, params=params)
         response_data = response.json()
 
         if response.status_code == 200:
@@ -245,7 +250,7 @@ class BinanceClient:
         signature = self.generate_signature(query_string)
         headers = {"X-MBX-APIKEY": self.api_key}
         params["signature"] = signature
-        response = requests.post(url, headers=headers, params=params)
+        response = self.session.post(url, headers=headers, params=params)
         response_data = response.json()
 
         if response.status_code == 200:
@@ -279,7 +284,7 @@ class BinanceClient:
             "X-MBX-APIKEY": self.api_key
         }
         params["signature"] = signature
-        response = requests.post(f"{self.base_url}{endpoint}", headers=headers, params=params)
+        response = self.session.post(f"{self.base_url}{endpoint}", headers=headers, params=params)
         
         if response.status_code == 200:
             print(f"Leverage set to {leverage} for {symbol}")
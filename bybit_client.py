@@ -1,14 +1,15 @@
-import requests
 import pandas as pd
 from config import *
+from module.http_session import get_session
 
 class BybitClient:
     def __init__(self):
         self.api_key = BYBIT_API_KEY
         self.secret_key = BYBIT_API_SECRET
         self.base_url = "https://api.bybit.com"
+        self.session = get_session(self.base_url)
 
-    def get_klines(self, symbol="ETHUSDT", category="linear", interval="15", limit=200):
+    def get_klines(self, symbol="ETHUSDT", category="linear", interval="15", limit=200, start=None, end=None):
         """
         Fetch OHLCV data using Bybit v5 API.
         
@@ -17,6 +18,7 @@ class BybitClient:
             category: Product type - "spot", "linear", "inverse"
             interval: Kline interval - 1,3,5,15,30,60,120,240,360,720,D,M,W
             limit: Number of candles to fetch (max 1000)
+            start, end: Optional candle start time range in milliseconds
         """
         # Correct v5 endpoint
         endpoint = f"{self.base_url}/v5/market/kline"
@@ -27,8 +29,12 @@ class BybitClient:
             "interval": interval,
             "limit": limit
         }
+        if start is not None:
+            params["start"] = int(start)
+        if end is not None:
+            params["end"] = int(end)
 
-        response = requests.get(endpoint, params=params)
+        response = self.session.get(endpoint, params=params)
         response.raise_for_status()
         result = response.json()
 
@@ -43,6 +43,24 @@ END_MINUTE = 59
 RENTRY_TIME_BINANCE = 900 # this is the time in seconds to enter once the trade has been closed for binance
 MASTER_HEIKEN_CHOICE = 1
 BYBIT_INTERVAL = "15" # use 60 for 1h , 15 for 15m etc 
+KLINE_CACHE_SECONDS = 1 # reuse the klines fetched less than this many seconds ago, 0 fetches every time
+KLINE_SOURCE = "websocket" # "websocket" serves the klines from the live Bybit candle store (module/candle_store.py), "rest" polls get_klines every cycle
+ORDER_EVENTS_SOURCE = "websocket" # "websocket" answers get_order_status / get_active_positions from the Delta private websocket (utils/websocket_data_delta.py), "rest" polls them every cycle
+CANDLE_ARCHIVE_DIR = "data/archive" # on-disk candle archive (module/candle_archive.py), one file per exchange / symbol / interval
+HTTP_CONNECT_TIMEOUT = 3.05 # seconds to open a connection to an exchange / webhook (module/http_session.py)
+HTTP_READ_TIMEOUT = 10 # seconds to wait for a response
+HTTP_ORDER_READ_TIMEOUT = None # seconds to wait for an order response, None waits like before (a timed out order may still be filled)
+HTTP_POOL_SIZE = 10 # keep-alive connections kept per host
+HTTP2 = False # True uses HTTP/2 when httpx[http2] is installed
+KLINE_FETCH_MODE = "fixed" # "fixed" requests the old 200 (Bybit) / 1000 (Binance) candles, "warmup" only the candles the indicators need (module/warmup.py, calibrated on data/ETHUSD.csv)
+SIGNAL_WARMUP_TOLERANCE = 0.001 # share of the pre-window history the recursive filters may still carry in "warmup" mode
+COMPACT_SIGNAL_FRAMES = False # True keeps the signal frames in compact dtypes (float32 prices, packed uint8 signal flags), see module/compact.py
+SCAN_SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "BNBUSDT", "DOGEUSDT", "ADAUSDT", "AVAXUSDT",
+                "LINKUSDT", "DOTUSDT", "LTCUSDT", "BCHUSDT", "TRXUSDT", "NEARUSDT", "ATOMUSDT", "UNIUSDT",
+                "APTUSDT", "ARBUSDT", "OPUSDT", "SUIUSDT", "FILUSDT", "INJUSDT", "AAVEUSDT", "ETCUSDT",
+                "TONUSDT", "SEIUSDT", "TIAUSDT", "WLDUSDT", "PEPEUSDT", "WIFUSDT"] # perpetuals scanned by scan.py
+SCAN_CATEGORY = "linear" # Bybit category of SCAN_SYMBOLS
+SCAN_PROCESSES = None # worker processes of scan.py, None uses every core
 
 DESIRED_TYPES = [2,-2]
 # DESIRED_TYPES = [2,-2]
@@ -3,6 +3,9 @@ from module.rf import RangeFilter
 from module.ib_indicator import calculate_inside_ib_box
 from module.rsi_gaizy import RSIGainzy
 from module.rsi_buy_sell import RSIBuySellIndicator
+from module.heiken_ashi import replace_with_heiken_ashi
+from module.pipeline import signal_pipeline, IMPORTANT_SIGNAL_COLUMNS
+import transform_data
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -14,95 +17,16 @@ bsrsi = RSIBuySellIndicator()
 Grsi = RSIGainzy()
 
 def calculate_heiken_ashi(df):
+    """Replace df's Open/High/Low/Close with Heiken-Ashi values in place"""
     try:
-        # print("heiken-ashi is being calculated.")
-        # Ensure required columns exist
-        required_cols = {'Open', 'High', 'Low', 'Close'}
-        if not required_cols.issubset(df.columns):
-            raise ValueError(f"DataFrame must contain the following columns: {required_cols}")
-
-        # Create new columns for Heiken-Ashi
-        df['HA_Close'] = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
-        df['HA_Open'] = 0.0
-        df['HA_High'] = 0.0
-        df['HA_Low'] = 0.0
-
-        # Initialize first HA_Open
-        df.at[df.index[0], 'HA_Open'] = (df.at[df.index[0], 'Open'] + df.at[df.index[0], 'Close']) / 2
-
-        # Calculate remaining Heiken-Ashi values
-        for i in range(1, len(df)):
-            prev_ha_open = df.at[df.index[i - 1], 'HA_Open']
-            prev_ha_close = df.at[df.index[i - 1], 'HA_Close']
-
-            df.at[df.index[i], 'HA_Open'] = (prev_ha_open + prev_ha_close) / 2
-            df.at[df.index[i], 'HA_High'] = max(
-                df.at[df.index[i], 'High'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-            df.at[df.index[i], 'HA_Low'] = min(
-                df.at[df.index[i], 'Low'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-
-        # Replace original OHLC columns with Heiken-Ashi values
-        df.drop(columns=['Open', 'High', 'Low', 'Close'], inplace=True)
-        df.rename(columns={
-            'HA_Open': 'Open',
-            'HA_High': 'High',
-            'HA_Low': 'Low',
-            'HA_Close': 'Close'
-        }, inplace=True)
-        # print("DONE")
+        replace_with_heiken_ashi(df)
     except Exception as e:
         print(f"Error in heiken-ashi calculation : {e}")
 
 def calculate_heiken_ashi_testnet(df):
+    """Same as calculate_heiken_ashi but returns df"""
     try:
-        # print("heiken-ashi is being calculated.")
-        # Ensure required columns exist
-        required_cols = {'Open', 'High', 'Low', 'Close'}
-        if not required_cols.issubset(df.columns):
-            raise ValueError(f"DataFrame must contain the following columns: {required_cols}")
-
-        # Create new columns for Heiken-Ashi
-        df['HA_Close'] = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
-        df['HA_Open'] = 0.0
-        df['HA_High'] = 0.0
-        df['HA_Low'] = 0.0
-
-        # Initialize first HA_Open
-        df.at[df.index[0], 'HA_Open'] = (df.at[df.index[0], 'Open'] + df.at[df.index[0], 'Close']) / 2
-
-        # Calculate remaining Heiken-Ashi values
-        for i in range(1, len(df)):
-            prev_ha_open = df.at[df.index[i - 1], 'HA_Open']
-            prev_ha_close = df.at[df.index[i - 1], 'HA_Close']
-
-            df.at[df.index[i], 'HA_Open'] = (prev_ha_open + prev_ha_close) / 2
-            df.at[df.index[i], 'HA_High'] = max(
-                df.at[df.index[i], 'High'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-            df.at[df.index[i], 'HA_Low'] = min(
-                df.at[df.index[i], 'Low'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-
-        # Replace original OHLC columns with Heiken-Ashi values
-        df.drop(columns=['Open', 'High', 'Low', 'Close'], inplace=True)
-        df.rename(columns={
-            'HA_Open': 'Open',
-            'HA_High': 'High',
-            'HA_Low': 'Low',
-            'HA_Close': 'Close'
-        }, inplace=True)
-        return df
-        # print("DONE")
+        return replace_with_heiken_ashi(df)
     except Exception as e:
         print(f"Error in heiken-ashi calculation : {e}")
 
@@ -172,34 +96,9 @@ def calculate_signals(df):
 
         # Remove any rows with NaN values
         df = df.dropna()
-        if MASTER_HEIKEN_CHOICE == 1:
-            calculate_heiken_ashi(df)
-        high = df['High']
-        low = df['Low']
-        close = df['Close']
-        prev_close = close.shift(1)
-
-        tr1 = high - low
-        tr2 = (high - prev_close).abs()
-        tr3 = (low - prev_close).abs()
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
-        atr_period = 14
-        df['atr'] = true_range.rolling(window=atr_period).mean()
-        df = rf.run_filter(df)
-        # df['gaizy_color'] = self.Grsi.calculate_signals(df=df)
-        df.rename(columns={'Close':'close','Open':'open','High':'high','Low':'low','Volume':'volume'},inplace=True)
-        df['rsi'],df['rsi_buy'],df['rsi_sell'] = bsrsi.generate_signals(df['close'])
-        df['gaizy_color'] = Grsi.calculate_gainzy_colors(df=df)
-        # df,_ = calculate_inside_bar_boxes(df)
-        df = calculate_inside_ib_box(df)
-        columns_to_drop = [
-            'RF_UpperBand', 'RF_LowerBand', 'RF_Filter', 'RF_Trend',
-            'IsIB', 'BoxHigh', 'BoxLow', 'BarColor','rsi'
-        ]
-        df = df.drop(columns=columns_to_drop)
-
-        df = df.tail(200)
+
+        # Heiken-Ashi candles -> ATR, RF, RSI, Gainzy colors and IB box in one pass (module/pipeline.py)
+        df = signal_pipeline(heiken=MASTER_HEIKEN_CHOICE == 1).run(df, IMPORTANT_SIGNAL_COLUMNS, window=200)
         df['Signal_Final'] = 0
 
         # Configuration parameter for lookback window
@@ -1123,65 +1022,9 @@ def execute_signals(df):
         traceback.print_exc()
 
 def convert_to_complete_format(df):
-    # df = pd.read_csv('Sample.csv')
-
-    # Convert timestamp to datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-    # Calculate price changes and patterns
-    df['price_change'] = df['close'].diff()
-    df['price_change_pct'] = df['close'].pct_change()
-
-    # Calculate RSI (Relative Strength Index)
-    def calculate_rsi(data, periods=14):
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-
-    df['RSI'] = calculate_rsi(df['close'])
-
-    # Calculate signals based on price movements and RSI
-    df['RF_BuySignal'] = ((df['price_change'] > 0) & (df['RSI'] < 30)).astype(int)
-    df['RF_SellSignal'] = ((df['price_change'] < 0) & (df['RSI'] > 70)).astype(int)
-
-    # RSI buy/sell signals
-    df['rsi_buy'] = df['RSI'] < 30
-    df['rsi_sell'] = df['RSI'] > 70
-
-    # Calculate gaizy color based on price movement
-    df['gaizy_color'] = np.where(df['close'] > df['open'], 'green', 'black')
-
-    # Calculate Green and Red arrows based on significant price movements
-    df['GreenArrow'] = (df['price_change_pct'] > 0.001) & (df['close'] > df['open'])
-    df['RedArrow'] = (df['price_change_pct'] < -0.001) & (df['close'] < df['open'])
-
-    # Rename columns to match Sample2.csv
-    df = df.rename(columns={
-        'timestamp': 'Timestamp',
-        'Volume': 'volume',
-        'close': 'close',
-        'open': 'open',
-        'high': 'high',
-        'low': 'low'
-    })
-
-    # Add time column (Unix timestamp)
-    df['time'] = df['Timestamp'].astype(np.int64) // 10**9
-
-    # Reorder columns to match Sample2.csv
-    columns_order = [
-        'time', 'volume', 'Timestamp', 'close', 'open', 'high', 'low',
-        'RF_BuySignal', 'RF_SellSignal', 'rsi_buy', 'rsi_sell',
-        'gaizy_color', 'GreenArrow', 'RedArrow'
-    ]
-    df = df[columns_order]
-
-    # Save the transformed data
-    # df.to_csv('Sample2.csv', index=False)
-    # print("Transformation completed successfully!") 
-    return df
+    # Array expressions over the whole frame, see transform_data.py (no Signal_Final here,
+    # calculate_signals builds its own)
+    return transform_data.convert_to_complete_format(df, signal_final=False)
 
 # execute_signals(
 #     calculate_signals(
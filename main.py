@@ -6,15 +6,25 @@ from module.rf import RangeFilter
 from module.ib_indicator import calculate_inside_ib_box
 from module.rsi_gaizy import RSIGainzy
 from module.rsi_buy_sell import RSIBuySellIndicator
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+from module.signal_cache import SignalCache, KlineCache
+from module.warmup import warmup_bars
+from module.compact import compact_signal_frame
+from module.candle_store import LiveCandleStore
+from module.candle_archive import CandleArchive
+from module.http_session import get_session
+from module.async_client import DeltaOrderPath
 from important import *
 import warnings
 import requests
 import json
+import uuid
 from delta_rest_client import DeltaRestClient
 from my_logger import get_logger
 import hashlib
 import hmac
 from binance_client_ import BinanceClient
+from utils.websocket_data_delta import DeltaPrivateSocket
 
 # Suppress specific FutureWarnings from pandas
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -37,6 +47,16 @@ candle_exit = None
 # pending_double_trigger = False # track if next level increase should be double
 # DOUBLE_TRIGGER_WINDOW = RENTRY_TIME_BINANCE # for the 15 the timeframe being used for trading - ONE CANDLE ONLY 
 DOUBLE_TRIGGER_WINDOW = 15
+signal_cache = SignalCache()  # calculate_signals results per kline window
+kline_cache = KlineCache(max_age=KLINE_CACHE_SECONDS)  # back to back Bybit fetches in one cycle
+# Bybit kline websocket window, started in __main__ when KLINE_SOURCE == "websocket"
+candle_store = LiveCandleStore(symbol="ETHUSD", category="inverse", interval=BYBIT_INTERVAL,
+                               archive=CandleArchive().series("bybit", "ETHUSD", BYBIT_INTERVAL))
+# Delta order / position book, started in __main__ when ORDER_EVENTS_SOURCE == "websocket"
+private_socket = DeltaPrivateSocket(DELTA_API_KEY, DELTA_API_SECRET, symbols=[DELTA_SYMBOL_PLACE_ORDER])
+# candles per Bybit request: the old fixed 200, or just the warmup the last two signal rows need
+KLINE_FETCH_LIMIT = 200 if KLINE_FETCH_MODE == "fixed" else warmup_bars(
+    SIGNAL_WARMUP_TOLERANCE, output_bars=2, heiken=int(MASTER_HEIKEN_CHOICE)==1, n_candle_lookback=5)
 
 class DeltaBroker:
     def __init__(self):
@@ -45,6 +65,7 @@ class DeltaBroker:
         # self.base_url = "https://cdn-ind.testnet.deltaex.org"
         self.base_url = "https://api.india.delta.exchange"
         self.broker = DeltaRestClient(base_url=self.base_url, api_key=self.api_key, api_secret=self.api_secret)
+        self.session = get_session(self.base_url)
         self.product_symbol = DELTA_SYMBOL
         self.product_symbol_place_order = DELTA_SYMBOL_PLACE_ORDER
         self.product_id = DELTA_TOKEN
@@ -52,6 +73,8 @@ class DeltaBroker:
         self.base_leverage = DELTA_BASE_LEVERAGE
         self.df = None
         self.current_candle_time = None
+        # orders wait for the exchange's answer: a timed out order may still be filled
+        self.order_timeout = (HTTP_CONNECT_TIMEOUT, HTTP_ORDER_READ_TIMEOUT)
 
     def generate_signature(self, secret, message):
         try:
@@ -71,13 +94,15 @@ class DeltaBroker:
 
     def place_order_market(self, side="buy", size=1):
         """Place a market order"""
+        client_order_id = uuid.uuid4().hex
         try:
             payload = {
                 "product_symbol": self.product_symbol_place_order,
                 "size": abs(size),
                 "side": side,
                 "order_type": "market_order",
-                "time_in_force": "gtc"
+                "time_in_force": "gtc",
+                "client_order_id": client_order_id
             }
 
             method = 'POST'
@@ -97,7 +122,7 @@ class DeltaBroker:
                 'Content-Type': 'application/json'
             }
 
-            response = requests.post(url, headers=headers, data=payload_json)
+            response = self.session.post(url, headers=headers, data=payload_json, timeout=self.order_timeout)
             print(f"Market Order Response Code: {response.status_code}")
             result = response.json()
             print(f"Market Order Response: {result}")
@@ -106,10 +131,98 @@ class DeltaBroker:
                 return result['result']
             return None
 
+        except requests.exceptions.ReadTimeout as e:
+            # the order was sent, the answer did not come: it may be filled
+            print(f"Market order timed out waiting for the response: {e}")
+            logger.info(f"market order {client_order_id} timed out, checking the exchange")
+            return self.recover_market_order(client_order_id, side, size)
         except Exception as e:
             print(f"Error in place_order_market function: {e}")
             return None
 
+    def get_order_by_client_id(self, client_order_id):
+        """The order placed with client_order_id (Delta order dict), None when not found"""
+        try:
+            method = "GET"
+            path = f"/v2/orders/client_order_id/{client_order_id}"
+            url = self.base_url + path
+            timestamp = str(int(time.time()))
+            signature_data = method + timestamp + path
+            signature = self.generate_signature(self.api_secret, signature_data)
+
+            headers = {
+                "api-key": self.api_key,
+                "timestamp": timestamp,
+                "signature": signature,
+                "User-Agent": "python-rest-client"
+            }
+
+            response = self.session.get(url, headers=headers)
+            result = response.json()
+            if response.status_code == 200 and result.get('success'):
+                return result['result']
+            return None
+
+        except Exception as e:
+            print(f"Error in get_order_by_client_id: {e}")
+            return None
+
+    def recover_market_order(self, client_order_id, side, size):
+        """
+        Result of a market order whose response timed out: the order itself
+        when the exchange knows it, else a placeholder when a position is open
+        (the order opened it), else None
+        """
+        order = self.get_order_by_client_id(client_order_id)
+        if order is not None:
+            logger.info(f"timed out market order {client_order_id} found: {order}")
+            return order if order.get('state') != 'cancelled' else None
+        if self.get_active_positions() is False:
+            logger.info(f"timed out market order {client_order_id} not found but a position is open")
+            return {'id': None, 'client_order_id': client_order_id, 'side': side, 'size': abs(size),
+                    'state': 'unknown'}
+        logger.info(f"timed out market order {client_order_id} not found and no position is open")
+        return None
+
+    def get_open_bracket_orders(self):
+        """
+        Open stop loss / take profit orders of the product as
+        {'stop_loss_order': order, 'take_profit_order': order} (the newest of each,
+        a missing leg left out), None when the request fails
+        """
+        try:
+            method = "GET"
+            path = "/v2/orders"
+            url = self.base_url + path
+            timestamp = str(int(time.time()))
+
+            params = {'product_ids': str(DELTA_TOKEN), 'states': 'open,pending'}
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            signature_data = method + timestamp + path + '?' + query_string
+            signature = self.generate_signature(self.api_secret, signature_data)
+
+            headers = {
+                "api-key": self.api_key,
+                "timestamp": timestamp,
+                "signature": signature,
+                "User-Agent": "python-rest-client"
+            }
+
+            # the query string exactly as signed (params= would encode the comma)
+            response = self.session.get(url + '?' + query_string, headers=headers)
+            result = response.json()
+            if response.status_code != 200 or not result.get('success'):
+                return None
+            legs = {}
+            for order in sorted(result['result'], key=lambda o: o.get('id') or 0):
+                if order.get('stop_order_type') in ('stop_loss_order', 'take_profit_order'):
+                    legs[order['stop_order_type']] = order
+            return legs
+
+        except Exception as e:
+            print(f"Error in get_open_bracket_orders: {e}")
+            return None
+
     def place_order_bracket(self, side="buy", size=1, entry_price=None, stop_price=None, take_profit_price=None):
         """Place a bracket order with entry, stop loss, and take profit"""
         try:
@@ -161,7 +274,7 @@ class DeltaBroker:
                 'Content-Type': 'application/json'
             }
 
-            response = requests.post(url, headers=headers, data=payload_json)
+            response = self.session.post(url, headers=headers, data=payload_json, timeout=self.order_timeout)
             print(f"Bracket Order Response Code: {response.status_code}")
             result = response.json()
             print(f"Bracket Order Response: {result}")
@@ -171,6 +284,18 @@ class DeltaBroker:
                 return result
             return None
 
+        except requests.exceptions.ReadTimeout as e:
+            # the bracket may be placed: return it as the exchange has it rather than placing a second one
+            print(f"Bracket order timed out waiting for the response: {e}, checking the exchange")
+            legs = self.get_open_bracket_orders()
+            if legs and 'stop_loss_order' in legs and 'take_profit_order' in legs:
+                logger.info(f"timed out bracket order found: {legs}")
+                return {'success': True, 'result': legs}
+            # not placed (or only partly visible): None lets the caller place the fallback bracket
+            position_open = self.get_active_positions() is False
+            print(f"Bracket order not found, position open: {position_open}")
+            logger.info(f"timed out bracket order not found ({legs}), position open: {position_open}")
+            return None
         except Exception as e:
             print(f"Error in place_order_bracket function: {e}")
             return None
@@ -185,6 +310,8 @@ class DeltaBroker:
             return float(last['Close'])
         
     def get_market_price(self):
+        if candle_store.is_live():
+            return candle_store.last_close()
         try:
             # df = self.fetch_data() # HERE I AM FETCHING DATA FROM BINANCE BECAUSE THE DATA FROM DELTA EXCHANGE IS GIVING A LAG OF 1 MINUTE
             df = self.fetch_data_binance()
@@ -205,6 +332,9 @@ class DeltaBroker:
 
     def get_active_positions(self):
         """Get active positions from Delta Exchange for ETHUSD (product_id: 1699)""" # 1699 for testnet/3136 for the mainnet
+        size = private_socket.position_size(self.product_symbol_place_order)
+        if size is not None:
+            return int(abs(size)) == 0
         try:
             method = "GET"
             path = "/v2/positions"
@@ -229,7 +359,7 @@ class DeltaBroker:
             }
             
             # Make the request with query parameters
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params)
             
             positions_data = response.json()
             print(f"response is {response}")
@@ -271,7 +401,7 @@ class DeltaBroker:
                 }
                 
                 # Make the request with query parameters
-                response = requests.get(url, headers=headers, params=params)
+                response = self.session.get(url, headers=headers, params=params)
                 
                 positions_data = response.json()
                 print(f"response is {response}")
@@ -289,6 +419,10 @@ class DeltaBroker:
     
     def get_order_status(self, order_id):
         """Get order status"""
+        if private_socket.is_live():
+            order = private_socket.order_status(order_id)
+            if order is not None:
+                return order
         try:
             method = "GET"
             path = f"/v2/orders/{order_id}"
@@ -305,7 +439,7 @@ class DeltaBroker:
                 "User-Agent": "python-rest-client"
             }
 
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             if response.status_code == 200:
                 return response.json()
             return None
@@ -332,7 +466,7 @@ class DeltaBroker:
                 "User-Agent": "python-rest-client"
             }
 
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers)
             wallet_data = response.json()
             print(wallet_data['result'][0]['balance'])
             
@@ -390,7 +524,7 @@ class DeltaBroker:
                 'User-Agent': 'custom-python-client/1.0'
             }
 
-            response = requests.post(url, headers=headers, data=payload_json)
+            response = self.session.post(url, headers=headers, data=payload_json)
             print(f"Set Leverage status: {response.status_code}")
             
             if response.status_code == 200:
@@ -428,7 +562,7 @@ class DeltaBroker:
                     'User-Agent': 'custom-python-client/1.0'
                 }
 
-                response = requests.post(url, headers=headers, data=payload_json)
+                response = self.session.post(url, headers=headers, data=payload_json)
                 print(f"Set Leverage status: {response.status_code}")
                 
                 if response.status_code == 200:
@@ -494,6 +628,14 @@ class DeltaBroker:
             return 60  # Default to 1 minute
     
     def fetch_data_binance(self):
+        if candle_store.is_live():
+            # in memory, no REST request (module/candle_store.py)
+            self.df = candle_store.frame(KLINE_FETCH_LIMIT)
+        else:
+            self.df = kline_cache.get(self._fetch_data_binance)
+        return self.df
+
+    def _fetch_data_binance(self):
         # from binance_client_ import BinanceClient
         from bybit_client import BybitClient
         # binance_client = BinanceClient(api_key=BINANCE_API_KEY,api_secret_key=BINANCE_API_SECRET,testnet=0)
@@ -503,7 +645,7 @@ class DeltaBroker:
         end_time = int(time.time() * 1000)
         start_time = end_time - (interval_seconds * 1000 * limit)
         # self.df = binance_client.get_klines(symbol=BINANCE_SYMBOL,interval=BINANCE_INTERVAL,limit=199)
-        self.df = binance_client.get_klines(symbol="ETHUSD",category="inverse",interval=BYBIT_INTERVAL,limit=200)
+        self.df = binance_client.get_klines(symbol="ETHUSD",category="inverse",interval=BYBIT_INTERVAL,limit=KLINE_FETCH_LIMIT)
         self.df['Timestamp'] = pd.to_datetime(self.df['time'],unit='ms')
         self.df.sort_values(by='Timestamp',ascending=False,inplace=True)
         self.df = self.df.iloc[::-1].reset_index(drop=True)
@@ -810,8 +952,7 @@ class MartingaleManager:
                     # CRITICAL: Check if TP/SL already hit before attempting close
                     global bracket_tp_order_id, bracket_sl_order_id
                     try:
-                        tp_check = delta_client.get_order_status(order_id=bracket_tp_order_id)
-                        sl_check = delta_client.get_order_status(order_id=bracket_sl_order_id)
+                        tp_check, sl_check = delta_orders.bracket_states_sync(bracket_tp_order_id, bracket_sl_order_id)
                         
                         if tp_check and sl_check:
                             tp_state = tp_check['result']['state']
@@ -1053,10 +1194,8 @@ class MartingaleManager:
 
             try:
                 # Fetch updated order status
-                tp_res = delta_client.get_order_status(order_id=bracket_tp_order_id)
+                tp_res, sl_res = delta_orders.bracket_states_sync(bracket_tp_order_id, bracket_sl_order_id)
                 current_bracket_state_tp = tp_res['result']['state']
-
-                sl_res = delta_client.get_order_status(order_id=bracket_sl_order_id)
                 current_bracket_state_sl = sl_res['result']['state']
 
                 # Check if either TP or SL is closed
@@ -1106,6 +1245,7 @@ try:
     Grsi = RSIGainzy()
     delta_client = DeltaBroker()
     delta_client.connect()
+    delta_orders = DeltaOrderPath(delta_client)  # concurrent REST reads of the order path
     
     # risk_manager = RiskManager(SL_BUFFER_POINTS, TP_PERCENT, INITIAL_CAPITAL)
     risk_manager = RiskManager(DELTA_SL_BUFFER_POINTS,DELTA_TP_PERCENT,initial_capital=DELTA_INITIAL_CAPITAL)
@@ -1279,10 +1419,8 @@ def close_position_on_fake_signal():
             current_price = delta_client.get_market_price()
             logger.info(f"this is a fake order so the market order will be placed to close it , the current price is {current_price}")
             # here i will add the logic for not closing if the tp/sl got hit
-            tp_res = delta_client.get_order_status(order_id=bracket_tp_order_id)
+            tp_res, sl_res = delta_orders.bracket_states_sync(bracket_tp_order_id, bracket_sl_order_id)
             current_bracket_state_tp = tp_res['result']['state']
-
-            sl_res = delta_client.get_order_status(order_id=bracket_sl_order_id)
             current_bracket_state_sl = sl_res['result']['state']
             # logger.info(f"the current sl status is {current_bracket_state_sl} and the current tp status is {current_bracket_state_tp}")
             if current_bracket_state_sl == "FILLED" or current_bracket_state_tp == "FILLED" or current_bracket_state_sl == "closed" or current_bracket_state_tp == "closed": # this logic is correct
@@ -1342,53 +1480,6 @@ def is_time_in_range_ist():
     end_time = time(END_HOUR, END_MINUTE)
     return start_time <= current_time <= end_time
 
-def calculate_heiken_ashi_testnet(df):
-    try:
-        # print("heiken-ashi is being calculated.")
-        # Ensure required columns exist
-        required_cols = {'Open', 'High', 'Low', 'Close'}
-        if not required_cols.issubset(df.columns):
-            raise ValueError(f"DataFrame must contain the following columns: {required_cols}")
-
-        # Create new columns for Heiken-Ashi
-        df['HA_Close'] = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
-        df['HA_Open'] = 0.0
-        df['HA_High'] = 0.0
-        df['HA_Low'] = 0.0
-
-        # Initialize first HA_Open
-        df.at[df.index[0], 'HA_Open'] = (df.at[df.index[0], 'Open'] + df.at[df.index[0], 'Close']) / 2
-
-        # Calculate remaining Heiken-Ashi values
-        for i in range(1, len(df)):
-            prev_ha_open = df.at[df.index[i - 1], 'HA_Open']
-            prev_ha_close = df.at[df.index[i - 1], 'HA_Close']
-
-            df.at[df.index[i], 'HA_Open'] = (prev_ha_open + prev_ha_close) / 2
-            df.at[df.index[i], 'HA_High'] = max(
-                df.at[df.index[i], 'High'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-            df.at[df.index[i], 'HA_Low'] = min(
-                df.at[df.index[i], 'Low'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-
-        # Replace original OHLC columns with Heiken-Ashi values
-        df.drop(columns=['Open', 'High', 'Low', 'Close'], inplace=True)
-        df.rename(columns={
-            'HA_Open': 'Open',
-            'HA_High': 'High',
-            'HA_Low': 'Low',
-            'HA_Close': 'Close'
-        }, inplace=True)
-        return df
-        # print("DONE")
-    except Exception as e:
-        print(f"Error in heiken-ashi calculation : {e}")
-
 def calculate_takeprofit( entry_price, side):
     """Calculate take profit based on risk-reward ratio"""
     try:
@@ -1405,201 +1496,21 @@ def calculate_takeprofit( entry_price, side):
         return None
 
 def calculate_signals(df):
-    try:
-        from module.rf import RangeFilter
-        from module.ib_indicator import calculate_inside_ib_box
-        from module.rsi_buy_sell import RSIBuySellIndicator
-        rf = RangeFilter()
-        bsrsi = RSIBuySellIndicator()
-        
-        df.rename(columns={'close':'Close','open':'Open','high':'High','low':'Low','volume':'Volume'},inplace=True)
-        if int(MASTER_HEIKEN_CHOICE)==1:
-            calculate_heiken_ashi(df)
-        # df = rf.run_filter(df)
-        df = rf.run_filter(df)
-        df.rename(columns={'Close':'close','Open':'open','High':'high','Low':'low','Volume':'volume'},inplace=True)
-        df['rsi'],df['rsi_buy'],df['rsi_sell'] = bsrsi.generate_signals(df['close'])
-        df = calculate_inside_ib_box(df)
-        columns_to_drop = [
-            'RF_UpperBand', 'RF_LowerBand','RF_Trend',
-            'IsIB', 'BoxHigh', 'BoxLow', 'BarColor','rsi'
-        ]
-        df = df.drop(columns=columns_to_drop)
-
-        df = df.tail(200)
-        df['Signal_Final'] = 0
+    """Signals of the kline window, recomputed only when the window's candles change"""
+    return signal_cache.get_or_compute(df, _calculate_signals)
 
+def _calculate_signals(df):
+    try:
         # Configuration variable for RF signal lookback period
         N_CANDLE_LOOKBACK = 5
 
-        # Initialize signal tracking variables
-        last_rf_buy_signal = False
-        last_rf_sell_signal = False
-        rf_signal_candle = -1
-        rf_used = False
-
-        # Initialize IB Arrow signal tracking variables
-        last_green_arrow = False
-        last_red_arrow = False
-        arrow_signal_candle = -1
-        arrow_used = False
-
-        # Initialize RSI signal tracking variables
-        last_rsi_buy_signal = False
-        last_rsi_sell_signal = False
-        rsi_signal_candle = -1
-        rsi_used = False
-
-        for i in range(len(df)):
-            row = df.iloc[i]
-            prev_row = df.iloc[i - 1] if i > 0 else None
-
-            # Detect new RF signals (transition from 0 to 1)
-            current_rf_buy = row['RF_BuySignal'] == 1
-            current_rf_sell = row['RF_SellSignal'] == 1
-
-            new_rf_buy = current_rf_buy and (prev_row is None or prev_row['RF_BuySignal'] != 1)
-            new_rf_sell = current_rf_sell and (prev_row is None or prev_row['RF_SellSignal'] != 1)
-
-            # Detect new IB Arrow signals
-            new_green_arrow = row['GreenArrow'] == 1 and (prev_row is None or prev_row['GreenArrow'] != 1)
-            new_red_arrow = row['RedArrow'] == 1 and (prev_row is None or prev_row['RedArrow'] != 1)
-
-            # Detect new RSI signals
-            new_rsi_buy = row['rsi_buy'] == 1 and (prev_row is None or prev_row['rsi_buy'] != 1)
-            new_rsi_sell = row['rsi_sell'] == 1 and (prev_row is None or prev_row['rsi_sell'] != 1)
-
-            # Update RF signal tracking
-            if new_rf_buy:
-                last_rf_buy_signal = True
-                last_rf_sell_signal = False
-                rf_signal_candle = i
-                rf_used = False
-            elif new_rf_sell:
-                last_rf_sell_signal = True
-                last_rf_buy_signal = False
-                rf_signal_candle = i
-                rf_used = False
-
-            # Update IB Arrow signal tracking
-            if new_green_arrow:
-                last_green_arrow = True
-                last_red_arrow = False
-                arrow_signal_candle = i
-                arrow_used = False
-            elif new_red_arrow:
-                last_red_arrow = True
-                last_green_arrow = False
-                arrow_signal_candle = i
-                arrow_used = False
-
-            # Update RSI signal tracking
-            if new_rsi_buy:
-                last_rsi_buy_signal = True
-                last_rsi_sell_signal = False
-                rsi_signal_candle = i
-                rsi_used = False
-            elif new_rsi_sell:
-                last_rsi_sell_signal = True
-                last_rsi_buy_signal = False
-                rsi_signal_candle = i
-                rsi_used = False
-
-            # Reset signals if they're older than specified timeframes and not used
-            # RF signals valid for N_CANDLE_LOOKBACK candles until IB trigger
-            if (i - rf_signal_candle) > N_CANDLE_LOOKBACK and (last_rf_buy_signal or last_rf_sell_signal) and not rf_used:
-                last_rf_buy_signal = False
-                last_rf_sell_signal = False
-                rf_used = False
-
-            # IB Arrow signals valid for 1 candle for RF confirmation
-            if (i - arrow_signal_candle) > 1 and (last_green_arrow or last_red_arrow) and not arrow_used:
-                last_green_arrow = False
-                last_red_arrow = False
-                arrow_used = False
-
-            # RSI signals valid for 1 candle for IB confirmation
-            if (i - rsi_signal_candle) > 1 and (last_rsi_buy_signal or last_rsi_sell_signal) and not rsi_used:
-                last_rsi_buy_signal = False
-                last_rsi_sell_signal = False
-                rsi_used = False
-
-            signal = 0
-
-            # CONDITION 4: IB and RF in same candle (Highest Priority)
-            if new_rf_buy and new_green_arrow and not rf_used and not arrow_used:
-                signal = 2  # RF + IB_Box buy signal (same candle)
-                rf_used = True
-                arrow_used = True
-                last_rf_buy_signal = False
-                last_green_arrow = False
-                # print(f"RF + IB_Box BUY signal triggered at candle {i} (same candle)")
-            elif new_rf_sell and new_red_arrow and not rf_used and not arrow_used:
-                signal = -2  # RF + IB_Box sell signal (same candle)
-                rf_used = True
-                arrow_used = True
-                last_rf_sell_signal = False
-                last_red_arrow = False
-                # print(f"RF + IB_Box SELL signal triggered at candle {i} (same candle)")
-            
-            # CONDITION 1: RF signal first, then IB box after few candles
-            elif last_rf_buy_signal and not rf_used and new_green_arrow:
-                signal = 2  # RF + IB_Box buy signal
-                rf_used = True
-                arrow_used = True
-                last_rf_buy_signal = False
-                last_green_arrow = False
-                # print(f"RF + IB_Box BUY signal triggered at candle {i} (RF at {rf_signal_candle}, IB at {i})")
-            elif last_rf_sell_signal and not rf_used and new_red_arrow:
-                signal = -2  # RF + IB_Box sell signal
-                rf_used = True
-                arrow_used = True
-                last_rf_sell_signal = False
-                last_red_arrow = False
-                # print(f"RF + IB_Box SELL signal triggered at candle {i} (RF at {rf_signal_candle}, IB at {i})")
-
-            # CONDITION 2: IB box first, then RF signal on immediate next candle
-            elif last_green_arrow and not arrow_used and new_rf_buy and (i - arrow_signal_candle) == 1:
-                signal = 2  # RF + IB_Box buy signal
-                arrow_used = True
-                rf_used = True
-                last_green_arrow = False
-                last_rf_buy_signal = False
-                # print(f"RF + IB_Box BUY signal triggered at candle {i} (IB at {arrow_signal_candle}, RF at {i})")
-            elif last_red_arrow and not arrow_used and new_rf_sell and (i - arrow_signal_candle) == 1:
-                signal = -2  # RF + IB_Box sell signal
-                arrow_used = True
-                rf_used = True
-                last_red_arrow = False
-                last_rf_sell_signal = False
-                # print(f"RF + IB_Box SELL signal triggered at candle {i} (IB at {arrow_signal_candle}, RF at {i})")
-
-            # CONDITION 5: RSI and IB in same candle
-            elif signal == 0 and new_rsi_buy and new_green_arrow and not rsi_used:
-                signal = 4  # RSI + IB_Box buy signal (same candle)
-                rsi_used = True
-                last_rsi_buy_signal = False
-                # print(f"RSI + IB_Box BUY signal triggered at candle {i} (same candle)")
-            elif signal == 0 and new_rsi_sell and new_red_arrow and not rsi_used:
-                signal = -4  # RSI + IB_Box sell signal (same candle)
-                rsi_used = True
-                last_rsi_sell_signal = False
-                # print(f"RSI + IB_Box SELL signal triggered at candle {i} (same candle)")
-
-            # CONDITION 3: RSI signal first, then IB on immediate next candle
-            elif signal == 0 and last_rsi_buy_signal and not rsi_used and new_green_arrow and (i - rsi_signal_candle) == 1:
-                signal = 4  # RSI + IB_Box buy signal
-                rsi_used = True
-                last_rsi_buy_signal = False
-                # print(f"RSI + IB_Box BUY signal triggered at candle {i} (RSI at {rsi_signal_candle}, IB at {i})")
-            elif signal == 0 and last_rsi_sell_signal and not rsi_used and new_red_arrow and (i - rsi_signal_candle) == 1:
-                signal = -4  # RSI + IB_Box sell signal
-                rsi_used = True
-                last_rsi_sell_signal = False
-                # print(f"RSI + IB_Box SELL signal triggered at candle {i} (RSI at {rsi_signal_candle}, IB at {i})")
-
-            # Assign the final signal
-            df.iat[i, df.columns.get_loc('Signal_Final')] = signal
+        # Heiken-Ashi candles -> RF / RSI / IB box -> Signal_Final in one pass,
+        # see module/pipeline.py (nodes) and module/signal_final.py (confluence rules)
+        pipeline = signal_pipeline(heiken=int(MASTER_HEIKEN_CHOICE)==1, n_candle_lookback=N_CANDLE_LOOKBACK)
+        df = pipeline.run(df, MAIN_SIGNAL_COLUMNS, window=200)
+        if COMPACT_SIGNAL_FRAMES:
+            # float32 prices, one uint8 flag column, int8 Signal_Final (module/compact.py)
+            df = compact_signal_frame(df)
 
         df.to_csv('Delta_Final.csv')
         # df.to_csv("data/Delta_Final_main.csv")
@@ -1734,6 +1645,11 @@ if __name__ == "__main__":
         
         # Set initial leverage
         delta_client.set_leverage(base_leverage)
+
+        if KLINE_SOURCE == "websocket":
+            candle_store.start()
+        if ORDER_EVENTS_SOURCE == "websocket":
+            private_socket.start()
         
     except Exception as e:
         print(f"Error in initial setup: {e}")
@@ -1836,8 +1752,10 @@ if __name__ == "__main__":
                                 current_leverage = martingale_manager.get_leverage()
                                 trade_amount = delta_client.calculate_trade_size(entry_price, current_leverage, base_capital)
                                 
-                                # Set leverage before placing trade
-                                delta_client.set_leverage(current_leverage)
+                                # Set leverage, then read the balance and the price at the same time before placing trade
+                                leverage_set, balance, current_price = delta_orders.entry_snapshot_sync(current_leverage)
+                                if not leverage_set:
+                                    raise RuntimeError(f"setting the leverage to {current_leverage}x failed, trade not placed")
                                 
                                 print(f"  Trade Details:")
                                 print(f"  Direction: {direction.upper()}")
@@ -1848,13 +1766,10 @@ if __name__ == "__main__":
                                 print(f"  Leverage: {current_leverage}x")
                                 print(f"  Notional: ${trade_amount * entry_price}")
                                 
-                                # Check balance
-                                balance = delta_client.get_usd_balance()
                                 print(f"Account Balance: ${balance}")
                                 
                                 # Step 1: Place market order first
                                 print(" Placing market order...")
-                                current_price = delta_client.get_market_price()
                                 logger.info(f"current_price is {current_price} before placing the market order")
                                 market_order = delta_client.place_order_market(direction, trade_amount)
                                 set_candle_entry_time(time=df.iloc[-1]['time'])
@@ -1931,8 +1846,8 @@ if __name__ == "__main__":
                                         except Exception as e:
                                             print(f"exception {e} occured.")
 
-                                    current_bracket_state_tp = delta_client.get_order_status(order_id=bracket_tp_order_id)
-                                    current_bracket_state_sl = delta_client.get_order_status(order_id=bracket_sl_order_id)
+                                    current_bracket_state_tp, current_bracket_state_sl = delta_orders.bracket_states_sync(
+                                        bracket_tp_order_id, bracket_sl_order_id)
                                     print(f"current bracket order tp id is {bracket_tp_order_id} and state is {current_bracket_state_tp}")
                                     print(f"current bracket order sl id is {bracket_sl_order_id} and state is {current_bracket_state_sl}")
                                         
@@ -1976,9 +1891,9 @@ if __name__ == "__main__":
                 except Exception as status_e:
                     print(f"Error displaying status: {status_e}")
                 
-                # Sleep between cycles
+                # Sleep between cycles, an order / position push from the private websocket ends it early
                 print(f" Sleeping for {2} seconds...")
-                time.sleep(2)
+                private_socket.wait_for_event(2)
             else:
                 print("Outside trading hours, sleeping...")
                 time.sleep(2)
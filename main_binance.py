@@ -10,10 +10,17 @@ from binance_client_ import BinanceClient
 from important import *
 import warnings
 from utils.websocket_data_binance import WebsocketClass
+from module.warmup import warmup_bars
 
 # Suppress specific FutureWarnings from pandas
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
+# candles per get_historical_klines request: the old fixed 1000, or the warmup in front of
+# the 200 candle Signal_Final loop of important.calculate_signals
+BINANCE_KLINE_LIMIT = 1000 if KLINE_FETCH_MODE == "fixed" else warmup_bars(
+    SIGNAL_WARMUP_TOLERANCE, output_bars=200, heiken=MASTER_HEIKEN_CHOICE == 1, pivot_length=10,
+    n_candle_lookback=N_CANDLE_LOOKBACK)
+
 class RiskManager:
     def __init__(self, sl_buffer_points, tp_percent, initial_capital):
         self.sl_buffer_points = sl_buffer_points
@@ -211,7 +218,7 @@ class MartingaleManager:
 
             while True:
                 interval_seconds = interval_to_seconds(BINANCE_INTERVAL)
-                limit = 1000
+                limit = BINANCE_KLINE_LIMIT
                 poll_interval = 10  # seconds between re-checks
                 end_time = int(time.time() * 1000)
                 start_time = end_time - (interval_seconds * 1000 * limit)
@@ -518,7 +525,7 @@ if __name__ == "__main__":
                 # if 1==1:
                     try:
                         # Fetch and prepare data
-                        limit = 1000
+                        limit = BINANCE_KLINE_LIMIT
                         interval_seconds = interval_to_seconds(BINANCE_INTERVAL)
                         end_time = int(time.time() * 1000)
                         start_time = end_time - (interval_seconds * 1000 * limit)
@@ -607,7 +614,7 @@ if __name__ == "__main__":
                                     time.sleep(2) # delay so it immediately doesn't check
                                     martingale_manager.position_order_id = position_order_id
 
-                                    limit = 1000
+                                    limit = BINANCE_KLINE_LIMIT
                                     interval_seconds = interval_to_seconds(BINANCE_INTERVAL)
                                     end_time = int(time.time() * 1000)
                                     start_time = end_time - (interval_seconds * 1000 * limit)
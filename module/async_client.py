@@ -0,0 +1,107 @@
+"""
+Asyncio layer over the sync exchange clients
+
+The Delta order path runs every REST call one after the other although most
+reads do not depend on each other. AsyncClient wraps DeltaBroker, BybitClient
+or binance_client_.BinanceClient: every method becomes a coroutine that runs
+the UNCHANGED sync method on a shared thread pool, so signing
+(DeltaBroker.generate_signature, the Binance HMAC) and error handling stay
+exactly as they are, and the calls share the keep-alive connection pool of
+module/http_session.py. Independent calls go through asyncio.gather.
+
+DeltaOrderPath groups the Delta order path steps that can overlap:
+
+    entry_snapshot   set_leverage, then get_usd_balance | get_market_price
+    bracket_states   get_order_status(tp) | get_order_status(sl)
+
+set_leverage is a write: it runs (and must succeed) before the reads, a
+failed one returns no balance / price so the entry is not placed. The market
+and bracket orders themselves stay sequential (the bracket needs the filled
+position, the fallback bracket the failed first one).
+
+The *_sync methods are the sync facade for the existing loops (one
+asyncio.run each); scripts that never touch asyncio keep calling the broker
+directly.
+
+Usage:
+    orders = DeltaOrderPath(delta_client)
+    leverage_set, balance, price = orders.entry_snapshot_sync(leverage)
+    if not leverage_set: ...            # do not enter
+    tp_state, sl_state = orders.bracket_states_sync(tp_id, sl_id)
+
+    bybit = AsyncClient(BybitClient())
+    df = await bybit.get_klines(symbol="ETHUSD", category="inverse")
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import HTTP_POOL_SIZE
+
+_executor = None
+_lock = threading.Lock()
+
+
+def shared_executor():
+    """Thread pool of the blocking calls, one per process (as many threads as pooled connections)"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE, thread_name_prefix="exchange")
+        return _executor
+
+
+class AsyncClient:
+    """Coroutine version of every method of a sync client; other attributes pass through"""
+
+    def __init__(self, client, executor=None):
+        self.client = client
+        self.executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor or shared_executor(),
+                                              functools.partial(attr, *args, **kwargs))
+        call.__name__ = name
+        return call
+
+
+def run_sync(coroutine):
+    """Sync facade: run a coroutine to completion from code that is not async"""
+    return asyncio.run(coroutine)
+
+
+class DeltaOrderPath:
+    """The concurrent steps of the Delta order path, broker: DeltaBroker (or AsyncClient of it)"""
+
+    def __init__(self, broker, executor=None):
+        self.broker = broker if isinstance(broker, AsyncClient) else AsyncClient(broker, executor)
+
+    async def entry_snapshot(self, leverage):
+        """
+        (set_leverage result, balance, market price) before the market order;
+        the reads only run once the leverage is set, (result, None, None) otherwise
+        """
+        leverage_set = await self.broker.set_leverage(leverage)
+        if not leverage_set:
+            return leverage_set, None, None
+        balance, price = await asyncio.gather(self.broker.get_usd_balance(), self.broker.get_market_price())
+        return leverage_set, balance, price
+
+    async def bracket_states(self, tp_order_id, sl_order_id):
+        """(tp, sl) get_order_status responses"""
+        return tuple(await asyncio.gather(self.broker.get_order_status(order_id=tp_order_id),
+                                          self.broker.get_order_status(order_id=sl_order_id)))
+
+    def entry_snapshot_sync(self, leverage):
+        return run_sync(self.entry_snapshot(leverage))
+
+    def bracket_states_sync(self, tp_order_id, sl_order_id):
+        return run_sync(self.bracket_states(tp_order_id, sl_order_id))
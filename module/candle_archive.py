@@ -0,0 +1,224 @@
+"""
+On-disk candle archive, one append-only file per (exchange, symbol, interval)
+
+    <root>/<exchange>/<symbol>/<interval>.candles
+
+Each file holds float64 rows of (time, open, high, low, close, volume) sorted
+by time (candle start in milliseconds); the time column is the index, found by
+binary search on a read-only np.memmap, so reading years of 1m bars is a
+slice copy and never touches the network.
+
+Writes take CLOSED candles only (a candle whose end is still in the future is
+dropped). Newer candles are appended to the file; candles that fill a hole
+inside the stored range are merged by rewriting the file through a temporary
+copy (os.replace), so a reader never sees a half written file.
+
+gaps() lists the missing ranges on the interval grid, backfill() asks a
+fetch_range(start, end) function only for those ranges, in pages. Exchanges
+that close (Dhan / NSE) leave gaps that a refetch cannot fill; backfill
+remembers ranges that came back empty in <interval>.empty and skips them.
+
+Usage:
+    series = CandleArchive().series('bybit', 'ETHUSD', '15')
+    series.backfill(bybit_range_fetcher(BybitClient(), 'ETHUSD', 'inverse', '15'), start, end)
+    df = series.read(start, end)      # no network
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import CANDLE_ARCHIVE_DIR
+from module.timeframes import interval_length
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+ROW_BYTES = len(FIELDS) * 8
+
+
+def candles_to_rows(df):
+    """float64 (n, 6) rows of a candle frame (any column case, time in ms or datetimes), sorted, unique times"""
+    columns = {str(col).lower(): col for col in df.columns}
+    time_column = df[columns['time'] if 'time' in columns else columns['timestamp']]
+    if pd.api.types.is_datetime64_any_dtype(time_column):
+        times = ((time_column - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy(dtype=float)
+    else:
+        times = time_column.to_numpy(dtype=float)
+    rows = np.column_stack([times] + [df[columns[field]].to_numpy(dtype=float) for field in FIELDS[1:]])
+    rows = rows[np.argsort(rows[:, 0], kind='stable')]
+    # the last copy of a repeated time wins (the most recent download)
+    keep = np.r_[rows[1:, 0] != rows[:-1, 0], True] if len(rows) else np.empty(0, dtype=bool)
+    return rows[keep]
+
+
+class CandleSeries:
+    """The archive file of one (exchange, symbol, interval)"""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.empty_path = os.path.splitext(path)[0] + '.empty'
+        self.interval = str(interval)
+        self.interval_ms = interval_length(self.interval, unit=1000)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def __len__(self):
+        return os.path.getsize(self.path) // ROW_BYTES if os.path.exists(self.path) else 0
+
+    def _rows(self):
+        """Read-only memmap of every row (empty array when there is no file yet)"""
+        n = len(self)
+        if n == 0:
+            return np.empty((0, len(FIELDS)))
+        return np.memmap(self.path, dtype=np.float64, mode='r', shape=(n, len(FIELDS)))
+
+    def bounds(self):
+        """(first, last) candle time, None when empty"""
+        rows = self._rows()
+        return (int(rows[0, 0]), int(rows[-1, 0])) if len(rows) else None
+
+    def arrays(self, start=None, end=None):
+        """{field: array} of the candles with start <= time < end (ms, None = open ended)"""
+        rows = self._rows()
+        times = rows[:, 0]
+        lo = np.searchsorted(times, start) if start is not None else 0
+        hi = np.searchsorted(times, end) if end is not None else len(times)
+        block = np.array(rows[lo:hi])
+        result = {field: block[:, j] for j, field in enumerate(FIELDS)}
+        result['time'] = result['time'].astype(np.int64)
+        return result
+
+    def read(self, start=None, end=None):
+        """Candle frame (get_klines columns plus 'Timestamp') with start <= time < end"""
+        data = self.arrays(start, end)
+        data['Timestamp'] = data['time'].astype('datetime64[ms]')
+        return pd.DataFrame(data)
+
+    def write(self, df, now=None):
+        """
+        Store the closed candles of df (time in ms), returns the number of new
+        candles. Existing candles are not changed.
+        """
+        rows = candles_to_rows(df)
+        now = time.time() * 1000 if now is None else now
+        rows = rows[rows[:, 0] + self.interval_ms <= now]
+        if len(rows) == 0:
+            return 0
+
+        stored = self._rows()
+        last = stored[-1, 0] if len(stored) else -np.inf
+        newer = rows[rows[:, 0] > last]
+        inner = rows[rows[:, 0] <= last]
+        if len(inner):
+            times = stored[:, 0]
+            k = np.minimum(np.searchsorted(times, inner[:, 0]), len(times) - 1)
+            inner = inner[times[k] != inner[:, 0]]
+
+        if len(inner):
+            merged = np.concatenate([np.array(stored), inner, newer])
+            merged = merged[np.argsort(merged[:, 0], kind='stable')]
+            del stored
+            tmp = self.path + '.tmp'
+            merged.tofile(tmp)
+            os.replace(tmp, self.path)
+        elif len(newer):
+            del stored
+            with open(self.path, 'ab') as f:
+                f.write(np.ascontiguousarray(newer).tobytes())
+        return len(inner) + len(newer)
+
+    def _empty_ranges(self):
+        if not os.path.exists(self.empty_path):
+            return []
+        with open(self.empty_path) as f:
+            return [tuple(r) for r in json.load(f)]
+
+    def _mark_empty(self, start, end):
+        ranges = self._empty_ranges() + [(int(start), int(end))]
+        with open(self.empty_path, 'w') as f:
+            json.dump(sorted(ranges), f)
+
+    def gaps(self, start, end):
+        """
+        Missing ranges [(from, to), ...] (ms, to exclusive) of the interval grid
+        between start and end, ranges known to be empty left out
+        """
+        step = self.interval_ms
+        first = start - start % step + (step if start % step else 0)
+        grid = np.arange(first, end, step, dtype=np.int64)
+        times = self.arrays(first, end)['time']
+        k = np.minimum(np.searchsorted(times, grid), max(len(times) - 1, 0))
+        missing = grid[times[k] != grid] if len(times) else grid
+        for lo, hi in self._empty_ranges():
+            missing = missing[(missing < lo) | (missing >= hi)]
+        if len(missing) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(missing) != step)
+        starts = np.r_[missing[0], missing[breaks + 1]]
+        ends = np.r_[missing[breaks], missing[-1]] + step
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def backfill(self, fetch_range, start, end=None, page_size=1000):
+        """
+        Fetch only the missing ranges between start and end (default now) with
+        fetch_range(from_ms, to_ms) -> candle frame, page_size candles a request.
+        Returns the number of candles stored.
+        """
+        end = time.time() * 1000 if end is None else end
+        end = int(end - end % self.interval_ms)   # the forming candle is not archived
+        stored = 0
+        for lo, hi in self.gaps(int(start), end):
+            for page_start in range(lo, hi, page_size * self.interval_ms):
+                page_end = min(hi, page_start + page_size * self.interval_ms)
+                df = fetch_range(page_start, page_end - 1)
+                added = self.write(df) if df is not None and len(df) else 0
+                if added == 0 and not len(self.arrays(page_start, page_end)['time']):
+                    self._mark_empty(page_start, page_end)
+                stored += added
+        return stored
+
+
+class CandleArchive:
+    """Directory of CandleSeries, one per (exchange, symbol, interval)"""
+
+    def __init__(self, root=CANDLE_ARCHIVE_DIR):
+        self.root = root
+
+    def series(self, exchange, symbol, interval):
+        path = os.path.join(self.root, str(exchange).lower(), str(symbol).upper(), f"{interval}.candles")
+        return CandleSeries(path, interval)
+
+    def load(self, exchange, symbol, interval, start, end=None, fetch_range=None):
+        """read(start, end), backfilling the gaps first when a fetch_range is given"""
+        series = self.series(exchange, symbol, interval)
+        if fetch_range is not None:
+            series.backfill(fetch_range, start, end)
+        return series.read(start, end)
+
+
+def bybit_range_fetcher(client, symbol, category="linear", interval="15"):
+    """fetch_range for BybitClient.get_klines"""
+    def fetch_range(start, end):
+        return client.get_klines(symbol=symbol, category=category, interval=interval, limit=1000,
+                                 start=start, end=end)
+    return fetch_range
+
+
+def binance_range_fetcher(client, symbol, interval="15m"):
+    """fetch_range for binance_client_.BinanceClient.get_klines (USD-M futures)"""
+    def fetch_range(start, end):
+        return client.get_klines(symbol=symbol, interval=interval, limit=1000, start_time=start, end_time=end)
+    return fetch_range
+
+
+def historical_range_fetcher(client, symbol, interval="15m"):
+    """fetch_range for utils/binance_client.BinanceClient.get_historical_klines (timestamp column)"""
+    def fetch_range(start, end):
+        return client.get_historical_klines(symbol, interval, start, end, limit=1000)
+    return fetch_range
+
+
+def records_frame(records):
+    """Candle frame from [time_ms, open, high, low, close, volume] lists (DhanClient.get_klines)"""
+    return pd.DataFrame([row[:6] for row in records], columns=list(FIELDS)).astype(float)
@@ -0,0 +1,280 @@
+"""
+Live candle store fed by the Bybit kline websocket
+
+DeltaBroker.fetch_data_binance used to download the whole kline window over
+REST on every call (and get_market_price once more for the last close).
+LiveCandleStore keeps the window in memory instead:
+
+    seed        one REST request fills the window when the store starts; with an
+                archive (module/candle_archive.py) the closed candles come from
+                disk and REST only fetches the ones missing there
+    websocket   kline.<interval>.<symbol> updates the forming candle in place;
+                a candle with a later start time rolls the window by one
+    gaps        a candle further ahead than one interval (missed messages,
+                reconnect) triggers a REST backfill of the missing candles
+    reconnect   the websocket thread reconnects with a growing delay and
+                backfills on every (re)open
+
+Reads (frame / arrays / last_close) copy the last rows of preallocated NumPy
+arrays under a lock, no network call. is_live() tells whether the stream is
+connected and recent; the callers fall back to REST when it is not.
+
+Candle times are Bybit start times in milliseconds, the frame has the same
+columns as BybitClient.get_klines plus 'Timestamp'.
+"""
+
+import json
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+BYBIT_PUBLIC_WS = "wss://stream.bybit.com/v5/public/{category}"
+
+
+class LiveCandleStore:
+    """
+    In-memory kline window of one symbol, updated by the Bybit websocket
+
+    Usage:
+        store = LiveCandleStore(symbol="ETHUSD", category="inverse", interval="15")
+        store.start()                   # REST seed + background websocket thread
+        df = store.frame(200)           # last 200 candles, forming candle last
+        price = store.last_close()
+        store.stop()
+
+    rest_fetch(limit) returns a get_klines style frame (time/open/high/low/close/
+    volume, oldest first); by default BybitClient().get_klines for the symbol.
+    archive is a CandleSeries of the symbol / interval, range_fetch(start, end)
+    its backfill source (default BybitClient().get_klines with start / end).
+    """
+
+    def __init__(self, symbol="ETHUSD", category="inverse", interval="15", capacity=1000,
+                 rest_fetch=None, max_age=None, ping_interval=20, archive=None, range_fetch=None):
+        self.symbol = symbol
+        self.category = category
+        self.interval = str(interval)
+        self.interval_ms = (86400 if self.interval == 'D' else int(self.interval) * 60) * 1000
+        self.capacity = capacity
+        self.rest_fetch = rest_fetch or self._bybit_fetch
+        self.archive = archive
+        self.range_fetch = range_fetch or self._bybit_range_fetch
+        # a forming candle gets a message at least every few seconds
+        self.max_age = max_age if max_age is not None else 30
+        self.ping_interval = ping_interval
+
+        self.lock = threading.RLock()
+        # twice the capacity so that rolling is an append; compacted when full
+        self.data = np.zeros((2 * capacity, len(FIELDS)))
+        self.count = 0
+        self.start_row = 0
+        self.connected = False
+        self.last_message = None
+        self.ws = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.messages = 0
+        self.backfills = 0
+
+    def _bybit_fetch(self, limit):
+        from bybit_client import BybitClient
+        return BybitClient().get_klines(symbol=self.symbol, category=self.category, interval=self.interval,
+                                        limit=limit)
+
+    def _bybit_range_fetch(self, start, end):
+        from bybit_client import BybitClient
+        return BybitClient().get_klines(symbol=self.symbol, category=self.category, interval=self.interval,
+                                        limit=1000, start=start, end=end)
+
+    def _rows(self):
+        return self.data[self.start_row:self.start_row + self.count]
+
+    def _append(self, row):
+        end = self.start_row + self.count
+        if end == len(self.data):
+            keep = min(self.count, self.capacity - 1)
+            self.data[:keep] = self.data[end - keep:end]
+            self.start_row, self.count, end = 0, keep, keep
+        self.data[end] = row
+        if self.count == self.capacity:
+            self.start_row += 1
+        else:
+            self.count += 1
+
+    def apply_candle(self, row, allow_gap=False):
+        """
+        Merge one candle (time, open, high, low, close, volume) into the window.
+        Returns 'update' (forming candle changed in place), 'roll' (new candle
+        appended), 'stale' (older than the forming candle) or 'gap': the candle
+        is more than one interval ahead and was NOT applied unless allow_gap.
+        """
+        with self.lock:
+            if self.count == 0:
+                self._append(row)
+                return 'roll'
+            last_time = self._rows()[-1, 0]
+            if row[0] == last_time:
+                self._rows()[-1] = row
+                return 'update'
+            if row[0] < last_time:
+                # REST backfill can hold a candle the window already moved past
+                rows = self._rows()
+                k = np.searchsorted(rows[:, 0], row[0])
+                if k < len(rows) and rows[k, 0] == row[0]:
+                    rows[k] = row
+                return 'stale'
+            if row[0] - last_time > self.interval_ms and not allow_gap:
+                return 'gap'
+            self._append(row)
+            return 'roll'
+
+    def merge_frame(self, df):
+        """Merge a get_klines style frame (oldest first) into the window"""
+        columns = {str(col).lower(): col for col in df.columns}
+        values = np.column_stack([df[columns[field]].to_numpy(dtype=float) for field in FIELDS])
+        with self.lock:
+            for row in values[np.argsort(values[:, 0], kind='stable')]:
+                # the exchange's own history may have holes (maintenance), keep them
+                self.apply_candle(row, allow_gap=True)
+
+    def seed(self):
+        """Replace the window with one REST request (closed candles from the archive when there is one)"""
+        if self.archive is not None:
+            return self._seed_from_archive()
+        df = self.rest_fetch(self.capacity)
+        with self.lock:
+            self.count = self.start_row = 0
+            self.merge_frame(df)
+
+    def _seed_from_archive(self):
+        """Last closed candles from disk (backfilling only the missing ones), the forming one from REST"""
+        recent = self.rest_fetch(2)
+        columns = {str(col).lower(): col for col in recent.columns}
+        forming = int(recent[columns['time']].max())
+        start = forming - (self.capacity - 1) * self.interval_ms
+        self.archive.backfill(self.range_fetch, start, forming)
+        history = self.archive.read(start, forming)
+        with self.lock:
+            self.count = self.start_row = 0
+            self.merge_frame(history)
+            self.merge_frame(recent)
+
+    def backfill(self):
+        """REST request for the candles since the last one in the window"""
+        with self.lock:
+            last_time = self._rows()[-1, 0] if self.count else None
+        if last_time is None:
+            return self.seed()
+        missing = int((time.time() * 1000 - last_time) // self.interval_ms) + 2
+        self.merge_frame(self.rest_fetch(min(self.capacity, max(missing, 2))))
+        self.backfills += 1
+
+    def arrays(self, n=None):
+        """{field: array} of the last n candles (all when None), copies"""
+        with self.lock:
+            rows = self._rows()[-n:] if n else self._rows()
+            rows = rows.copy()
+        result = {field: rows[:, j] for j, field in enumerate(FIELDS)}
+        result['time'] = result['time'].astype(np.int64)
+        return result
+
+    def frame(self, n=None):
+        """The last n candles as BybitClient.get_klines returns them, plus 'Timestamp'"""
+        data = self.arrays(n)
+        data['Timestamp'] = data['time'].astype('datetime64[ms]')
+        return pd.DataFrame(data)
+
+    def last_close(self):
+        with self.lock:
+            return float(self._rows()[-1, 4]) if self.count else None
+
+    def is_live(self):
+        """Connected, seeded and a message within max_age seconds"""
+        return (self.connected and self.count > 0 and self.last_message is not None
+                and time.monotonic() - self.last_message < self.max_age)
+
+    def topic(self):
+        return f"kline.{self.interval}.{self.symbol}"
+
+    def handle_message(self, message):
+        """Apply one websocket message (str or dict); backfills on gaps"""
+        data = json.loads(message) if isinstance(message, (str, bytes)) else message
+        if data.get('topic') != self.topic():
+            return
+        self.last_message = time.monotonic()
+        self.messages += 1
+        for kline in sorted(data.get('data', []), key=lambda k: int(k['start'])):
+            row = (float(kline['start']), float(kline['open']), float(kline['high']), float(kline['low']),
+                   float(kline['close']), float(kline['volume']))
+            if self.apply_candle(row) == 'gap':
+                # fill the missing candles first, then this one (usually already in the backfill)
+                self.backfill()
+                self.apply_candle(row, allow_gap=True)
+
+    def _on_open(self, ws):
+        ws.send(json.dumps({"op": "subscribe", "args": [self.topic()]}))
+        try:
+            self.backfill()
+        except Exception as e:
+            print(f"Error backfilling the klines : {e}")
+        self.connected = True
+        print("Kline websocket connection opened")
+
+    def _on_message(self, ws, message):
+        try:
+            self.handle_message(message)
+        except Exception as e:
+            print(f"Error processing kline websocket message: {e}")
+
+    def _on_error(self, ws, error):
+        print(f"Kline websocket error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.connected = False
+        print("Kline websocket connection closed")
+
+    def _heartbeat(self):
+        while not self.stopped.wait(self.ping_interval):
+            try:
+                if self.connected and self.ws is not None:
+                    self.ws.send(json.dumps({"op": "ping"}))
+            except Exception as e:
+                print(f"Error sending the websocket ping : {e}")
+
+    def _run(self):
+        import websocket
+        delay = 1
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            self.ws = websocket.WebSocketApp(BYBIT_PUBLIC_WS.format(category=self.category),
+                                             on_open=self._on_open, on_message=self._on_message,
+                                             on_error=self._on_error, on_close=self._on_close)
+            self.ws.run_forever()
+            self.connected = False
+            if self.stopped.is_set():
+                break
+            # reconnect, backing off while the connection keeps dropping right away
+            delay = 1 if time.monotonic() - started > 60 else min(delay * 2, 60)
+            self.stopped.wait(delay)
+
+    def start(self):
+        """Seed from REST and start the websocket / heartbeat threads"""
+        try:
+            self.seed()
+        except Exception as e:
+            # the websocket thread still starts: _on_open backfills, which seeds the empty window,
+            # and is_live() keeps the callers on REST until then
+            print(f"Error seeding the klines, the websocket will seed them : {e}")
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.connected = False
+        if self.ws is not None:
+            self.ws.close()
@@ -0,0 +1,122 @@
+"""
+Compact dtypes for signal frames
+
+The pipeline frames are float64 / int64 / bool / str throughout. For long per
+symbol histories compact_signal_frame stores them as:
+
+    prices          float32 when the round trip error stays within
+                    `price_tolerance` (open/high/low/close, RF_Filter, RF bands,
+                    atr, box levels); ETH prices fit, BTC sized prices stay float64
+    signal flags    RF_BuySignal, RF_SellSignal, rsi_buy, rsi_sell, GreenArrow,
+                    RedArrow packed into one uint8 'signal_flags' column (bit k
+                    = SIGNAL_FLAGS[k])
+    small ints      Signal_Final, RF_Position, RF_Trend as int8, BarIndex (NaN
+                    before the first inside bar) as float32 while exact
+    colors          gaizy_color as its Gainzy trend code (int8, GAINZY_CODES),
+                    BarColor as uint8 (0 = none, 1 = orange)
+
+expand_signal_frame restores the pipeline's columns, order and dtypes. Flags,
+colors and small ints round trip exactly; prices come back as float64 within
+`price_tolerance` of the originals (the orders round to 2 decimals).
+"""
+
+import numpy as np
+import pandas as pd
+
+SIGNAL_FLAGS = ('RF_BuySignal', 'RF_SellSignal', 'rsi_buy', 'rsi_sell', 'GreenArrow', 'RedArrow')
+FLAGS_COLUMN = 'signal_flags'
+
+# dtype of every flag in the pipeline frames (RangeFilter returns ints, the rest bools)
+FLAG_DTYPES = {'RF_BuySignal': int, 'RF_SellSignal': int, 'rsi_buy': bool, 'rsi_sell': bool,
+               'GreenArrow': bool, 'RedArrow': bool}
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'Open', 'High', 'Low', 'Close', 'RF_Filter',
+                 'RF_UpperBand', 'RF_LowerBand', 'atr', 'BoxHigh', 'BoxLow')
+SMALL_INT_COLUMNS = ('Signal_Final', 'RF_Position', 'RF_Trend')
+INDEX_COLUMNS = ('BarIndex',)
+
+# Gainzy trend code -> color (GainzyState.COLOR_MAP)
+GAINZY_COLORS = {-3: 'pink', 3: 'light_green', 2: 'blue', 1: 'green', -1: 'red', 0: 'black'}
+GAINZY_CODES = {color: code for code, color in GAINZY_COLORS.items()}
+BAR_COLORS = {0: np.nan, 1: 'orange'}
+
+
+def pack_signal_flags(df) -> np.ndarray:
+    """uint8 bitfield of the SIGNAL_FLAGS columns present in df"""
+    flags = np.zeros(len(df), dtype=np.uint8)
+    for bit, name in enumerate(SIGNAL_FLAGS):
+        if name in df.columns:
+            flags |= (np.asarray(df[name].values) == 1).astype(np.uint8) << bit
+    return flags
+
+
+def unpack_signal_flags(flags, names=SIGNAL_FLAGS) -> dict:
+    """{name: array in its FLAG_DTYPES dtype} from a pack_signal_flags bitfield"""
+    flags = np.asarray(flags, dtype=np.uint8)
+    return {name: ((flags >> SIGNAL_FLAGS.index(name)) & 1).astype(FLAG_DTYPES[name]) for name in names}
+
+
+def fits_float32(values, price_tolerance=1e-3) -> bool:
+    """True when float32 keeps every value within price_tolerance (NaN stays NaN)"""
+    values = np.asarray(values, dtype=float)
+    error = np.abs(values.astype(np.float32).astype(float) - values)
+    return bool(np.all((error <= price_tolerance) | np.isnan(values)))
+
+
+def compact_signal_frame(df, price_tolerance=1e-3):
+    """
+    Compact copy of a signal frame (see the module docstring). Columns the
+    policy does not know are kept as they are; df itself is not modified.
+    """
+    data = {}
+    for col in df.columns:
+        values = df[col].values
+        if col in SIGNAL_FLAGS:
+            # the bitfield takes the place of the first flag column
+            if FLAGS_COLUMN not in data:
+                data[FLAGS_COLUMN] = pack_signal_flags(df)
+        elif col in PRICE_COLUMNS and fits_float32(values, price_tolerance):
+            data[col] = values.astype(np.float32)
+        elif col in INDEX_COLUMNS and fits_float32(values, 0):
+            data[col] = values.astype(np.float32)
+        elif col in SMALL_INT_COLUMNS:
+            data[col] = values.astype(np.int8)
+        elif col == 'gaizy_color':
+            data[col] = np.array([GAINZY_CODES.get(color, 0) for color in values], dtype=np.int8)
+        elif col == 'BarColor':
+            data[col] = (values == 'orange').astype(np.uint8)
+        else:
+            data[col] = df[col].array
+
+    result = pd.DataFrame(data, index=df.index)
+    if FLAGS_COLUMN in data:
+        result.attrs[FLAGS_COLUMN] = [name for name in SIGNAL_FLAGS if name in df.columns]
+        result.attrs['columns'] = list(df.columns)
+    return result
+
+
+def expand_signal_frame(df):
+    """Pipeline dtypes and the separate flag columns back from compact_signal_frame"""
+    data = {}
+    for col in df.columns:
+        values = df[col].values
+        if col == FLAGS_COLUMN:
+            data.update(unpack_signal_flags(values, df.attrs.get(FLAGS_COLUMN, SIGNAL_FLAGS)))
+        elif col in PRICE_COLUMNS or col in INDEX_COLUMNS:
+            data[col] = values.astype(float)
+        elif col in SMALL_INT_COLUMNS:
+            data[col] = values.astype(int)
+        elif col == 'gaizy_color':
+            data[col] = np.array([GAINZY_COLORS[code] for code in values.tolist()], dtype=object)
+        elif col == 'BarColor':
+            data[col] = np.array([BAR_COLORS[code] for code in values.tolist()], dtype=object)
+        else:
+            data[col] = df[col].array
+    result = pd.DataFrame(data, index=df.index)
+    columns = df.attrs.get('columns')
+    return result[columns] if columns is not None and set(columns) == set(result.columns) else result
+
+
+def frame_memory(df) -> int:
+    """Bytes held by df, index and object / str payloads included"""
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,138 @@
+"""
+Heiken-Ashi candles
+
+    HA_Close = (Open + High + Low + Close) / 4
+    HA_Open  = (HA_Open[1] + HA_Close[1]) / 2, first bar (Open + Close) / 2
+    HA_High  = max(High, HA_Open, HA_Close)
+    HA_Low   = min(Low, HA_Open, HA_Close)
+
+The first bar keeps HA_High = HA_Low = 0.0 as the bot's original loop did, so
+indicators fed with these candles see exactly the same values as before.
+"""
+
+import numpy as np
+
+from module.recursion import ema_filter, ema_step
+
+
+def heiken_ashi_arrays(open_, high, low, close):
+    """
+    Vectorized Heiken-Ashi transform, returns new (ha_open, ha_high, ha_low, ha_close)
+    arrays. HA_Open is the alpha = 1/2 recursion on HA_Close[i-1] from the shared
+    filter kernel.
+    """
+    open_ = np.asarray(open_, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+
+    ha_close = (open_ + high + low + close) / 4
+    ha_open = np.empty(n)
+    ha_high = np.zeros(n)
+    ha_low = np.zeros(n)
+    if n == 0:
+        return ha_open, ha_high, ha_low, ha_close
+
+    ha_open[0] = (open_[0] + close[0]) / 2
+    ha_open[1:] = ema_filter(ha_close[:-1], 0.5, initial=ha_open[0])
+    ha_high[1:] = np.maximum.reduce([high, ha_open, ha_close])[1:]
+    ha_low[1:] = np.minimum.reduce([low, ha_open, ha_close])[1:]
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def replace_with_heiken_ashi(df):
+    """
+    Replace the 'Open'/'High'/'Low'/'Close' columns of df IN PLACE with Heiken-Ashi
+    values. The HA columns end up last in Close, Open, High, Low order like the
+    original drop / rename did. Returns df.
+    """
+    required_cols = {'Open', 'High', 'Low', 'Close'}
+    if not required_cols.issubset(df.columns):
+        raise ValueError(f"DataFrame must contain the following columns: {required_cols}")
+
+    ha_open, ha_high, ha_low, ha_close = heiken_ashi_arrays(
+        df['Open'].values, df['High'].values, df['Low'].values, df['Close'].values)
+
+    df.drop(columns=['Open', 'High', 'Low', 'Close'], inplace=True)
+    df['Close'] = ha_close
+    df['Open'] = ha_open
+    df['High'] = ha_high
+    df['Low'] = ha_low
+    return df
+
+
+class HeikinAshiState:
+    """
+    Streaming Heiken-Ashi - one candle at a time
+
+    Only the previous HA_Open / HA_Close are needed for the next bar.
+
+    Usage:
+        state = HeikinAshiState()
+        state.seed(history_df)                      # 'Open'/'High'/'Low'/'Close' (or lower case)
+        ha = state.update(closed_ohlc)              # {'Open', 'High', 'Low', 'Close'}
+        ha = state.peek(forming_ohlc)               # same output, state untouched
+
+    The outputs match heiken_ashi_arrays on the same candles exactly.
+
+    Used by module/signal_history.SignalEngine (and so MultiTimeframeEngine).
+    The main.py / main_binance.py cycles do NOT use it yet: they still run
+    calculate_signals over the whole kline window on every poll.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all history - the next candle is treated as bar 0"""
+        self.bars = 0
+        self.prev_open = np.nan
+        self.prev_close = np.nan
+        self.last = None
+
+    @staticmethod
+    def _ohlc(ohlc):
+        """(open, high, low, close) from a tuple / list or a dict / Series with upper or lower case keys"""
+        if isinstance(ohlc, (tuple, list, np.ndarray)):
+            return tuple(float(v) for v in ohlc[:4])
+        keys = ('Open', 'High', 'Low', 'Close') if 'Open' in ohlc else ('open', 'high', 'low', 'close')
+        return tuple(float(ohlc[k]) for k in keys)
+
+    def _step(self, ohlc):
+        o, h, l, c = self._ohlc(ohlc)
+        ha_close = (o + h + l + c) / 4
+        if self.bars == 0:
+            ha_open = (o + c) / 2
+            ha_high = ha_low = 0.0
+        else:
+            ha_open = ema_step(self.prev_open, self.prev_close, 0.5)
+            ha_high = max(h, ha_open, ha_close)
+            ha_low = min(l, ha_open, ha_close)
+        return {'Open': ha_open, 'High': ha_high, 'Low': ha_low, 'Close': ha_close}
+
+    def update(self, ohlc):
+        """Feed one CLOSED candle and advance the state, returns its HA candle"""
+        ha = self._step(ohlc)
+        self.prev_open, self.prev_close = ha['Open'], ha['Close']
+        self.bars += 1
+        self.last = ha
+        return ha
+
+    def peek(self, ohlc):
+        """HA candle of the FORMING candle without changing the state"""
+        return self._step(ohlc)
+
+    def seed(self, df):
+        """Replay candles from history, returns the HA candle of the last one"""
+        self.reset()
+        cols = [name if name in df.columns else name.lower() for name in ('Open', 'High', 'Low', 'Close')]
+        for row in zip(*(df[col].values for col in cols)):
+            self.update(row)
+        return self.last
+
+    @classmethod
+    def from_history(cls, df):
+        state = cls()
+        state.seed(df)
+        return state
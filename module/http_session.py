@@ -0,0 +1,130 @@
+"""
+Pooled keep-alive HTTP sessions shared by the exchange clients
+
+A bare requests.get / requests.post opens (and closes) a new TCP + TLS
+connection on every call and waits forever on a stalled exchange.
+get_session(url) returns ONE session per host instead:
+
+    keep-alive  the connection pool of the host is reused across calls, threads
+                and client objects (BybitClient() per fetch shares it too)
+    timeouts    every request gets (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+                unless it passes its own timeout (timeout=None waits forever,
+                as requests does)
+    HTTP/2      HTTP2 = True uses httpx (pip install "httpx[http2]") for the
+                session; without it installed the session stays HTTP/1.1
+
+No retries are added: a retried POST could place an order twice, the callers
+keep their own retry blocks.
+
+Usage:
+    session = get_session("https://api.bybit.com")
+    response = session.get(url, params=params)      # same calls as requests
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_SIZE, HTTP2
+
+_sessions = {}
+_lock = threading.Lock()
+# "no timeout argument": an explicit timeout=None must stay None
+DEFAULT_TIMEOUT = object()
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session with a default timeout and a pool of pool_size connections per host"""
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), pool_size=HTTP_POOL_SIZE):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        return super().request(method, url, timeout=timeout, **kwargs)
+
+
+class Http2Session:
+    """
+    httpx.Client with HTTP/2 behind the requests calls the clients use (get / post / delete);
+    httpx timeouts / connection errors are raised as the requests exceptions
+    """
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), pool_size=HTTP_POOL_SIZE):
+        import httpx
+        connect, read = timeout
+        self.client = httpx.Client(http2=True, timeout=httpx.Timeout(read, connect=connect),
+                                   limits=httpx.Limits(max_connections=pool_size,
+                                                       max_keepalive_connections=pool_size))
+
+    def request(self, method, url, data=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+        import httpx
+        if isinstance(data, (str, bytes)):
+            # requests sends a str body as is, httpx wants it as content
+            kwargs['content'] = data
+        elif data is not None:
+            kwargs['data'] = data
+        if timeout is None:
+            kwargs['timeout'] = None    # httpx: no timeout at all
+        elif isinstance(timeout, tuple):
+            connect, read = timeout
+            kwargs['timeout'] = httpx.Timeout(read, connect=connect)
+        elif timeout is not DEFAULT_TIMEOUT:
+            kwargs['timeout'] = timeout
+        # the callers catch the requests exceptions (a ReadTimeout order POST is looked up, not resent)
+        try:
+            return self.client.request(method, url, **kwargs)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(str(e)) from e
+        except httpx.ConnectError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+def new_session(http2=HTTP2, **params):
+    """A fresh session (TimeoutSession, or Http2Session when http2 and httpx are available)"""
+    if http2:
+        try:
+            return Http2Session(**params)
+        except ImportError:
+            print("httpx[http2] is not installed, using HTTP/1.1 keep-alive sessions")
+    return TimeoutSession(**params)
+
+
+def get_session(url):
+    """The shared session of url's host (scheme://host:port), created on first use"""
+    parts = urlsplit(url)
+    key = f"{parts.scheme}://{parts.netloc}"
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = new_session()
+        return session
+
+
+def close_sessions():
+    """Close every shared session (their pooled connections)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -345,6 +345,98 @@
 import pandas as pd
 import numpy as np
 
+def inside_ib_box_arrays(open_, high, low, close, high_low_buffer=0.0, mintick=0.05, show_break=True):
+    """
+    Inside bar box kernel on plain arrays - the bar loop of calculate_inside_ib_box
+    without any DataFrame access.
+    
+    Parameters:
+    -----------
+    open_, high, low, close : array-like
+        OHLC values, oldest bar first
+    high_low_buffer, mintick, show_break :
+        As in calculate_inside_ib_box
+    
+    Returns:
+    --------
+    dict of preallocated arrays, one value per bar:
+        IsIB, GreenArrow, RedArrow (bool), BoxHigh, BoxLow (float, NaN outside
+        a box) and BarIndex (float, NaN on the first bar)
+    """
+    # plain Python floats are much faster than numpy scalars in the loop below
+    open_ = np.asarray(open_, dtype=float).tolist()
+    high = np.asarray(high, dtype=float).tolist()
+    low = np.asarray(low, dtype=float).tolist()
+    close = np.asarray(close, dtype=float).tolist()
+    n = len(close)
+    
+    is_ib_arr = np.zeros(n, dtype=bool)
+    box_high_arr = np.full(n, np.nan)
+    box_low_arr = np.full(n, np.nan)
+    green_arr = np.zeros(n, dtype=bool)
+    red_arr = np.zeros(n, dtype=bool)
+    bar_index_arr = np.full(n, np.nan)
+    
+    buffer = high_low_buffer * mintick
+    box_high = np.nan
+    box_low = np.nan
+    bar_index = 1  # varip int barIndex = 1
+    f_flag = False  # varip bool f = false
+    prev_is_ib = False
+    
+    for i in range(1, n):
+        bar_index_arr[i] = bar_index
+        
+        # isInsideBar(barIndex): open and close inside the buffered range of the bar barIndex back
+        is_ib = False
+        if i >= bar_index:
+            hp = high[i - bar_index] + buffer
+            lp = low[i - bar_index] - buffer
+            c = close[i]
+            o = open_[i]
+            is_ib = c <= hp and c >= lp and o <= hp and o >= lp
+        is_ib_arr[i] = is_ib
+        
+        if is_ib and not prev_is_ib:
+            # New inside bar sequence, the box is the previous bar
+            box_high = high[i - 1]
+            box_low = low[i - 1]
+            f_flag = True
+            box_high_arr[i] = box_high
+            box_low_arr[i] = box_low
+            bar_index += 1
+        elif is_ib and prev_is_ib:
+            # Continuing inside bar sequence
+            if box_high == box_high:  # not NaN
+                box_high_arr[i] = box_high
+                box_low_arr[i] = box_low
+            bar_index += 1
+        elif prev_is_ib and not is_ib:
+            # End of inside bar sequence, f stays true for breakouts
+            bar_index = 1
+        else:
+            f_flag = False
+        
+        # crossover(close, boxHigh) / crossunder(close, boxLow)
+        if show_break and f_flag and box_high == box_high and box_low == box_low:
+            prev_close = close[i - 1]
+            curr_close = close[i]
+            if prev_close <= box_high and curr_close > box_high:
+                green_arr[i] = True
+            elif prev_close >= box_low and curr_close < box_low:
+                red_arr[i] = True
+        
+        prev_is_ib = is_ib
+    
+    return {
+        'IsIB': is_ib_arr,
+        'BoxHigh': box_high_arr,
+        'BoxLow': box_low_arr,
+        'GreenArrow': green_arr,
+        'RedArrow': red_arr,
+        'BarIndex': bar_index_arr,
+    }
+
 def calculate_inside_ib_box(df, high_low_buffer=0.0, mintick=0.05, bar_highlight=True, 
                            show_only_last_box=False, show_break=True):
     """
@@ -360,6 +452,9 @@ def calculate_inside_ib_box(df, high_low_buffer=0.0, mintick=0.05, bar_highlight
     inside bar sequences. The isInsideBar(barIndex) function checks if current bar
     is inside the bar that's barIndex positions back.
     
+    The bar loop runs in inside_ib_box_arrays on plain arrays; the result
+    columns are assigned to the DataFrame once at the end.
+    
     Parameters:
     -----------
     df : pandas.DataFrame
@@ -404,133 +499,163 @@ def calculate_inside_ib_box(df, high_low_buffer=0.0, mintick=0.05, bar_highlight
     elif not isinstance(df.index, pd.DatetimeIndex):
         df.index = pd.to_datetime(df.index)
     
-    # Initialize columns
-    df['IsIB'] = False
-    df['BoxHigh'] = np.nan
-    df['BoxLow'] = np.nan
-    df['GreenArrow'] = False
-    df['RedArrow'] = False
-    df['BarColor'] = np.nan
-    df['BarIndex'] = np.nan  # For debugging
+    result = inside_ib_box_arrays(df['open'].values, df['high'].values, df['low'].values,
+                                  df['close'].values, high_low_buffer, mintick, show_break)
     
-    # State tracking variables (equivalent to PineScript vars)
-    box_high = np.nan
-    box_low = np.nan
-    bar_index = 1  # varip int barIndex = 1
-    f_flag = False  # varip bool f = false
+    # Bar color: 'orange' on inside bars, NaN elsewhere
+    if bar_highlight and result['IsIB'].any():
+        bar_color = np.full(len(df), np.nan, dtype=object)
+        bar_color[result['IsIB']] = 'orange'
+    else:
+        bar_color = np.full(len(df), np.nan)
     
-    def is_inside_bar(current_idx, lookback_bars, buffer, mintick_size):
-        """
-        CORRECTED: Exact implementation of PineScript isInsideBar(previousBar) function.
-        
-        PineScript function:
-        isInsideBar(previousBar) =>
-            hp = high[previousBar]+highLowBuffer*syminfo.mintick
-            lp = low[previousBar]+highLowBuffer*syminfo.mintick
-            isIB = (close <= hp and close >= lp) and (open <= hp and open >= lp)
-            isIB
-            
-        This checks if CURRENT bar is inside the bar that's 'lookback_bars' positions back.
-        """
-        # Must have enough history to look back
-        if current_idx < lookback_bars:
-            return False
-            
-        # Get the reference bar (lookback_bars positions back from current)
-        reference_bar_idx = current_idx - lookback_bars
-        reference_bar = df.iloc[reference_bar_idx]
-        current_bar = df.iloc[current_idx]
-        
-        # Calculate buffered high/low of reference bar
-        hp = reference_bar['high'] + buffer * mintick_size
-        lp = reference_bar['low'] - buffer * mintick_size
-        
-        # CORRECTED: Check if current bar's open AND close are within reference bar's buffered range
-        is_ib = (current_bar['close'] <= hp and current_bar['close'] >= lp and 
-                current_bar['open'] <= hp and current_bar['open'] >= lp)
-        
-        return is_ib
+    df['IsIB'] = result['IsIB']
+    df['BoxHigh'] = result['BoxHigh']
+    df['BoxLow'] = result['BoxLow']
+    df['GreenArrow'] = result['GreenArrow']
+    df['RedArrow'] = result['RedArrow']
+    df['BarColor'] = bar_color
+    df['BarIndex'] = result['BarIndex']  # For debugging
     
-    # Process each bar starting from index 1 (need at least 1 previous bar)
-    for i in range(1, len(df)):
-        
-        # Store current barIndex for debugging
-        df.loc[df.index[i], 'BarIndex'] = bar_index
-        
-        # CORRECTED: Call isInsideBar(barIndex) exactly like PineScript
-        # This checks if current bar is inside the bar that's barIndex positions back
-        is_ib = is_inside_bar(i, bar_index, high_low_buffer, mintick)
-        
-        # Get previous IsIB status (isIB[1] in PineScript)
-        prev_is_ib = df.loc[df.index[i-1], 'IsIB'] if i > 0 else False
+    return df
+
+
+class InsideBarState:
+    """
+    Streaming inside bar tracker - one closed candle at a time
+    
+    Holds the Pine `varip` values of calculate_inside_ib_box (barIndex, box
+    high/low, f) plus the previous bar. isInsideBar(barIndex) looks barIndex bars
+    back, but barIndex only grows inside a sequence, which always started one
+    bar after the box bar. So the lookback is the previous bar when barIndex is 1
+    and the box bar (box_high / box_low) otherwise, and no longer history is needed.
+    
+    Usage:
+        state = InsideBarState.from_history(df)   # 'open'/'high'/'low'/'close'
+        row = state.update(closed_bar)            # row['GreenArrow'], row['RedArrow'], ...
+        row = state.peek(forming_bar)             # same output, state untouched
+        snap = state.snapshot(); ...; state.restore(snap)
+    
+    Each output row matches that bar's row of inside_ib_box_arrays exactly.
+    """
+    
+    def __init__(self, high_low_buffer=0.0, mintick=0.05, show_break=True):
+        self.high_low_buffer = high_low_buffer
+        self.mintick = mintick
+        self.show_break = show_break
+        self.reset()
+    
+    def reset(self):
+        """Forget all history - the next bar is treated as bar 0"""
+        self.state = {
+            'bars': 0,
+            'bar_index': 1,        # varip int barIndex = 1
+            'box_high': np.nan,
+            'box_low': np.nan,
+            'f_flag': False,       # varip bool f = false
+            'prev_is_ib': False,
+            'prev_high': np.nan,
+            'prev_low': np.nan,
+            'prev_close': np.nan,
+        }
+        self.last = None
+    
+    @property
+    def bars(self):
+        return self.state['bars']
+    
+    @staticmethod
+    def _bar_value(bar, name):
+        """Read 'close' or 'Close' from a dict / Series / namedtuple-like bar"""
+        try:
+            return float(bar[name])
+        except (KeyError, IndexError, TypeError):
+            return float(bar[name.capitalize()])
+    
+    def _step(self, bar):
+        s = self.state
+        o = self._bar_value(bar, 'open')
+        h = self._bar_value(bar, 'high')
+        l = self._bar_value(bar, 'low')
+        c = self._bar_value(bar, 'close')
         
-        # Set current IsIB status
-        df.loc[df.index[i], 'IsIB'] = is_ib
+        new = dict(s)
+        new.update(bars=s['bars'] + 1, prev_high=h, prev_low=l, prev_close=c)
+        output = {'IsIB': False, 'BoxHigh': np.nan, 'BoxLow': np.nan,
+                  'GreenArrow': False, 'RedArrow': False, 'BarIndex': np.nan}
+        if s['bars'] == 0:
+            return new, output
         
-        # Bar color logic
-        if is_ib and bar_highlight:
-            df.loc[df.index[i], 'BarColor'] = 'orange'
+        bar_index = s['bar_index']
+        box_high, box_low, f_flag = s['box_high'], s['box_low'], s['f_flag']
+        prev_is_ib = s['prev_is_ib']
+        output['BarIndex'] = float(bar_index)
         
-        # CORRECTED: Box logic matching PineScript conditions exactly
+        # isInsideBar(barIndex) against the previous bar or the box bar
+        ref_high, ref_low = (s['prev_high'], s['prev_low']) if bar_index == 1 else (box_high, box_low)
+        buffer = self.high_low_buffer * self.mintick
+        hp = ref_high + buffer
+        lp = ref_low - buffer
+        is_ib = c <= hp and c >= lp and o <= hp and o >= lp
+        output['IsIB'] = is_ib
         
-        # Condition 1: isIB and not isIB[1] and barstate.isconfirmed
-        # New inside bar sequence starts
         if is_ib and not prev_is_ib:
-            # CORRECTED: Use high[1] and low[1] - the PREVIOUS bar's high/low
-            prev_bar = df.iloc[i - 1]
-            box_high = prev_bar['high']  # high[1]
-            box_low = prev_bar['low']    # low[1]
+            box_high, box_low = s['prev_high'], s['prev_low']
             f_flag = True
-            
-            # Store box values
-            df.loc[df.index[i], 'BoxHigh'] = box_high
-            df.loc[df.index[i], 'BoxLow'] = box_low
-            
-            # CORRECTED: Increment barIndex AFTER setting up the box
-            bar_index = bar_index + 1
-            
-        # Condition 2: isIB and isIB[1] and barstate.isconfirmed
-        # Continuing inside bar sequence
+            output['BoxHigh'], output['BoxLow'] = box_high, box_low
+            bar_index += 1
         elif is_ib and prev_is_ib:
-            # Continue with existing box
-            if not np.isnan(box_high):
-                df.loc[df.index[i], 'BoxHigh'] = box_high
-                df.loc[df.index[i], 'BoxLow'] = box_low
-            
-            # CORRECTED: Increment barIndex to extend the lookback
-            bar_index = bar_index + 1
-            
-        # Condition 3: isIB[1] and not isIB and barstate.isconfirmed
-        # End of inside bar sequence
+            if box_high == box_high:  # not NaN
+                output['BoxHigh'], output['BoxLow'] = box_high, box_low
+            bar_index += 1
         elif prev_is_ib and not is_ib:
-            # CORRECTED: Reset barIndex to 1 (restart counting)
             bar_index = 1
-            # Keep f_flag true for breakout detection
-            
-        # Condition 4: not isIB[1] and not isIB
-        # No inside bar sequence active
-        elif not prev_is_ib and not is_ib:
+        else:
             f_flag = False
         
-        # CORRECTED: Breakout detection using proper crossover/crossunder logic
-        # PineScript: plotshape(showBreak and f and crossover(close, boxHigh), ...)
-        # PineScript: plotshape(showBreak and f and crossunder(close, boxLow), ...)
-        if show_break and f_flag and not np.isnan(box_high) and not np.isnan(box_low):
-            if i > 0:
-                prev_close = df.iloc[i-1]['close']
-                curr_close = df.iloc[i]['close']
-                
-                # Green arrow: crossover (close crosses above boxHigh)
-                # crossover(close, boxHigh) = prev_close <= boxHigh and curr_close > boxHigh
-                if prev_close <= box_high and curr_close > box_high:
-                    df.loc[df.index[i], 'GreenArrow'] = True
-                    
-                # Red arrow: crossunder (close crosses below boxLow)  
-                # crossunder(close, boxLow) = prev_close >= boxLow and curr_close < boxLow
-                elif prev_close >= box_low and curr_close < box_low:
-                    df.loc[df.index[i], 'RedArrow'] = True
-    
-    return df
+        if self.show_break and f_flag and box_high == box_high and box_low == box_low:
+            prev_close = s['prev_close']
+            if prev_close <= box_high and c > box_high:
+                output['GreenArrow'] = True
+            elif prev_close >= box_low and c < box_low:
+                output['RedArrow'] = True
+        
+        new.update(bar_index=bar_index, box_high=box_high, box_low=box_low,
+                   f_flag=f_flag, prev_is_ib=is_ib)
+        return new, output
+    
+    def update(self, bar):
+        """Feed one CLOSED candle and advance the state"""
+        self.state, output = self._step(bar)
+        self.last = output
+        return output
+    
+    def peek(self, bar):
+        """Evaluate the FORMING candle without changing the state"""
+        _, output = self._step(bar)
+        return output
+    
+    def snapshot(self):
+        """Copy of the state (a flat dict of scalars)"""
+        return dict(self.state)
+    
+    def restore(self, snapshot):
+        """Go back to a state taken with snapshot()"""
+        self.state = dict(snapshot)
+    
+    def seed(self, df):
+        """Replay closed candles from history, returns the output of the last one"""
+        self.reset()
+        for o, h, l, c in zip(df['open'].values, df['high'].values, df['low'].values, df['close'].values):
+            self.update({'open': o, 'high': h, 'low': l, 'close': c})
+        return self.last
+    
+    @classmethod
+    def from_history(cls, df, **params):
+        """Build a state with calculate_inside_ib_box style parameters and seed it from df"""
+        state = cls(**params)
+        state.seed(df)
+        return state
 
 
 def test_inside_bar_logic():
@@ -540,7 +665,7 @@ def test_inside_bar_logic():
     """
     # Create sample data with clear inside bar patterns
     data = {
-        'datetime': pd.date_range('2023-01-01', periods=20, freq='1H'),
+        'datetime': pd.date_range('2023-01-01', periods=20, freq='1h'),
         'open':  [100.0, 102.0, 101.5, 101.8, 101.2, 101.6, 101.4, 103.0, 102.5, 102.7, 
                   104.0, 103.8, 103.5, 103.2, 105.0, 104.2, 104.5, 106.0, 105.5, 107.0],
         'high':  [101.0, 103.0, 102.0, 102.0, 101.5, 101.9, 101.7, 104.0, 103.0, 103.2, 
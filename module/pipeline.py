@@ -0,0 +1,273 @@
+"""
+Declarative indicator pipeline
+
+Every indicator is a Node that names the arrays it reads and the arrays it
+writes. A Pipeline resolves the requested output columns back to the nodes that
+produce them, runs each needed node once on plain float arrays and builds the
+result frame in one go, so there is no Title case rename, Heiken-Ashi rewrite,
+run_filter / calculate_inside_ib_box / RSIGainzy copy or drop / tail churn.
+
+Arrays available from the kline frame (column names matched case-insensitively):
+    open, high, low, close, volume
+
+Standard nodes (signal_pipeline):
+    candles       bar_open, bar_high, bar_low, bar_close   Heiken-Ashi or the raw candles
+    change        bar_close - bar_close[1], NaN on the first bar
+    true_range    Pine tr(true) of the bar candles
+    atr           rolling mean of the true range
+    range_filter  RF_UpperBand, RF_LowerBand, RF_Filter, RF_Trend, RF_BuySignal, RF_SellSignal, RF_Position
+    rsi           Pine ta.rsi of bar_close, from change
+    rsi_signals   rsi_buy, rsi_sell
+    gainzy        gaizy_color, from the same rsi
+    inside_bar    IsIB, BoxHigh, BoxLow, GreenArrow, RedArrow, BarIndex
+    signal_final  Signal_Final (RF / IB arrow / RSI confluence, main.py rules)
+
+Shared intermediates are computed once: change feeds the range filter's
+Average Change scale and the RSI, the RSI feeds both the buy/sell signals and
+the Gainzy colors, the true range feeds the atr column and the ATR scale.
+
+Usage:
+    pipeline = signal_pipeline(heiken=True, n_candle_lookback=5)
+    df = pipeline.run(klines, MAIN_SIGNAL_COLUMNS, window=200)
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from module.heiken_ashi import heiken_ashi_arrays
+from module.ib_indicator import inside_ib_box_arrays
+from module.rf import RangeFilter
+from module.rsi_buy_sell import RSIBuySellIndicator
+from module.rsi_gaizy import RSIGainzy
+from module.signal_final import combine_signal_final
+
+SOURCES = ('open', 'high', 'low', 'close', 'volume')
+
+# Output columns of the signal functions: (column, array) pairs or array names
+OHLC_COLUMNS = [('open', 'bar_open'), ('high', 'bar_high'), ('low', 'bar_low'), ('close', 'bar_close')]
+
+# main.calculate_signals
+MAIN_SIGNAL_COLUMNS = OHLC_COLUMNS + [
+    'RF_Filter', 'RF_BuySignal', 'RF_SellSignal', 'RF_Position',
+    'rsi_buy', 'rsi_sell', 'GreenArrow', 'RedArrow', 'BarIndex', 'Signal_Final',
+]
+
+# important.calculate_signals (its own Signal_Final loop runs on this frame)
+IMPORTANT_SIGNAL_COLUMNS = OHLC_COLUMNS + [
+    'atr', 'RF_BuySignal', 'RF_SellSignal', 'RF_Position',
+    'rsi_buy', 'rsi_sell', 'gaizy_color', 'GreenArrow', 'RedArrow', 'BarIndex',
+]
+
+# utils/type1_3.calculate_signals (its own Signal_Final loop runs on this frame)
+TYPE1_3_SIGNAL_COLUMNS = OHLC_COLUMNS + [
+    'RF_BuySignal', 'RF_SellSignal', 'RF_Position',
+    'rsi_buy', 'rsi_sell', 'gaizy_color', 'GreenArrow', 'RedArrow', 'BarIndex',
+]
+
+
+class Node:
+    """
+    One indicator step: func(*input_arrays) returns a dict with (at least) every
+    name in outputs. windowed nodes only see the last `window` bars of their
+    inputs, like the Signal_Final loop that used to run after df.tail(200).
+    """
+
+    def __init__(self, name, func, inputs, outputs, windowed=False):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.windowed = windowed
+
+    def __repr__(self):
+        return f"Node({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class Pipeline:
+    """A set of Nodes, evaluated lazily for the requested arrays / columns"""
+
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self.producers = {}
+        for node in self.nodes:
+            for output in node.outputs:
+                if output in self.producers or output in SOURCES:
+                    raise ValueError(f"Array {output!r} is produced twice (node {node.name!r})")
+                self.producers[output] = node
+
+    def plan(self, targets):
+        """Nodes needed for the target arrays, in execution order"""
+        order = []
+        state = {}
+
+        def visit(name, consumer):
+            if name in SOURCES:
+                return
+            if name not in self.producers:
+                raise ValueError(f"No node produces {name!r}")
+            node = self.producers[name]
+            if consumer is not None and node.windowed and not consumer.windowed:
+                raise ValueError(f"Node {consumer.name!r} reads windowed output {name!r}")
+            if state.get(node.name) == 'done':
+                return
+            if state.get(node.name) == 'active':
+                raise ValueError(f"Cycle through node {node.name!r}")
+            state[node.name] = 'active'
+            for input_name in node.inputs:
+                visit(input_name, node)
+            state[node.name] = 'done'
+            order.append(node)
+
+        for target in targets:
+            visit(target, None)
+        return order
+
+    def compute(self, arrays, targets, window=None):
+        """
+        Evaluate the nodes the targets depend on. arrays holds the source arrays;
+        returns a new dict with every array computed along the way.
+        """
+        arrays = dict(arrays)
+        for node in self.plan(targets):
+            inputs = [arrays[name] for name in node.inputs]
+            if node.windowed and window is not None:
+                inputs = [values[-window:] for values in inputs]
+            result = node.func(*inputs)
+            for output in node.outputs:
+                arrays[output] = result[output]
+        return arrays
+
+    def run(self, df, columns, window=None):
+        """
+        Signal frame of a kline DataFrame.
+
+        columns: output columns, each an array name or a (column, array) pair.
+        The other columns of df (time, Timestamp, ...) are passed through, with
+        open/high/low/close/volume lower-cased. window keeps only the last bars,
+        like df.tail(window). df itself is not modified.
+        """
+        names = {str(col).lower(): col for col in df.columns}
+        sources = {name: np.asarray(df[names[name]].values, dtype=float) for name in SOURCES if name in names}
+
+        columns = [(col, col) if isinstance(col, str) else tuple(col) for col in columns]
+        arrays = self.compute(sources, [array for _, array in columns], window)
+
+        n = len(df)
+        start = n - min(window, n) if window is not None else 0
+        requested = dict(columns)
+
+        def tail(values):
+            return values[start:] if len(values) == n else values
+
+        data = {}
+        for col in df.columns:
+            name = str(col).lower() if str(col).lower() in SOURCES else col
+            if name in requested:
+                data[name] = tail(arrays[requested.pop(name)])
+            else:
+                data[name] = df[col].array[start:]
+        for col, array in requested.items():
+            data[col] = tail(arrays[array])
+
+        return pd.DataFrame(data, index=df.index[start:])
+
+
+def _candles(open_, high, low, close, heiken=True):
+    if heiken:
+        ha_open, ha_high, ha_low, ha_close = heiken_ashi_arrays(open_, high, low, close)
+        return {'bar_open': ha_open, 'bar_high': ha_high, 'bar_low': ha_low, 'bar_close': ha_close}
+    return {'bar_open': open_, 'bar_high': high, 'bar_low': low, 'bar_close': close}
+
+
+def _change(close):
+    change = np.full(len(close), np.nan)
+    change[1:] = np.diff(close)
+    return {'change': change}
+
+
+def _true_range(high, low, close):
+    return {'true_range': RangeFilter().true_range(high, low, close)}
+
+
+def _atr(true_range, high, low, period=14):
+    # the old pandas version has no previous close on the first bar: tr = high - low
+    true_range = true_range.copy()
+    if len(true_range):
+        true_range[0] = high[0] - low[0]
+    return {'atr': pd.Series(true_range).rolling(window=period).mean().values}
+
+
+def _range_filter(high, low, close, *shared, shared_names=(), **params):
+    cache = {}
+    for name, values in zip(shared_names, shared):
+        if name == 'change':
+            changes = np.abs(values)
+            changes[:1] = 0
+            cache['changes'] = changes
+        else:
+            cache['tr'] = values
+    return RangeFilter().filter_arrays(high, low, close, cache=cache, **params)
+
+
+def _rsi(change, rsi_length=14):
+    return {'rsi': RSIBuySellIndicator(rsi_length=rsi_length).rsi_from_changes(change)}
+
+
+def _rsi_signals(rsi, rsi_upper=70, rsi_lower=30):
+    buy, sell = RSIBuySellIndicator(rsi_upper=rsi_upper, rsi_lower=rsi_lower).signals_from_rsi(rsi)
+    return {'rsi_buy': buy, 'rsi_sell': sell}
+
+
+def _gainzy(rsi, pivot_length=10):
+    return {'gaizy_color': RSIGainzy().gainzy_colors_values(rsi, pivot_length)}
+
+
+def _inside_bar(open_, high, low, close, **params):
+    return inside_ib_box_arrays(open_, high, low, close, **params)
+
+
+def _signal_final(rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell, n_candle_lookback=5):
+    return {'Signal_Final': combine_signal_final(rf_buy, rf_sell, green_arrow, red_arrow,
+                                                 rsi_buy, rsi_sell, n_candle_lookback)}
+
+
+def signal_pipeline(heiken=True, n_candle_lookback=5, atr_period=14, rsi_length=14, rsi_upper=70,
+                    rsi_lower=30, pivot_length=10, range_filter=None, inside_bar=None):
+    """
+    The standard nodes. range_filter / inside_bar are keyword arguments for
+    RangeFilter.filter_arrays / inside_ib_box_arrays (their defaults otherwise).
+    """
+    range_filter = dict(range_filter or {})
+    inside_bar = dict(inside_bar or {})
+
+    # the range filter reuses the shared change / true range when its scale needs them
+    scale = range_filter.get('range_scale', "Average Change")
+    source = range_filter.get('movement_source', "Close")
+    shared = ()
+    if scale == "Average Change" and source == "Close":
+        shared = ('change',)
+    elif scale == "ATR":
+        shared = ('true_range',)
+
+    bars = ('bar_open', 'bar_high', 'bar_low', 'bar_close')
+    return Pipeline([
+        Node('candles', partial(_candles, heiken=heiken), ('open', 'high', 'low', 'close'), bars),
+        Node('change', _change, ('bar_close',), ('change',)),
+        Node('true_range', _true_range, ('bar_high', 'bar_low', 'bar_close'), ('true_range',)),
+        Node('atr', partial(_atr, period=atr_period), ('true_range', 'bar_high', 'bar_low'), ('atr',)),
+        Node('range_filter', partial(_range_filter, shared_names=shared, **range_filter),
+             ('bar_high', 'bar_low', 'bar_close') + shared,
+             ('RF_UpperBand', 'RF_LowerBand', 'RF_Filter', 'RF_Trend',
+              'RF_BuySignal', 'RF_SellSignal', 'RF_Position')),
+        Node('rsi', partial(_rsi, rsi_length=rsi_length), ('change',), ('rsi',)),
+        Node('rsi_signals', partial(_rsi_signals, rsi_upper=rsi_upper, rsi_lower=rsi_lower),
+             ('rsi',), ('rsi_buy', 'rsi_sell')),
+        Node('gainzy', partial(_gainzy, pivot_length=pivot_length), ('rsi',), ('gaizy_color',)),
+        Node('inside_bar', partial(_inside_bar, **inside_bar), bars,
+             ('IsIB', 'BoxHigh', 'BoxLow', 'GreenArrow', 'RedArrow', 'BarIndex')),
+        Node('signal_final', partial(_signal_final, n_candle_lookback=n_candle_lookback),
+             ('RF_BuySignal', 'RF_SellSignal', 'GreenArrow', 'RedArrow', 'rsi_buy', 'rsi_sell'),
+             ('Signal_Final',), windowed=True),
+    ])
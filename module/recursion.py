@@ -0,0 +1,139 @@
+"""
+First-order recursion kernels shared by the indicators
+
+All the smoothing recursions used in the strategy have the same shape:
+
+    y[i] = alpha * x[i] + (1 - alpha) * y[i-1]
+
+    RangeFilter.conditional_ema      alpha = 2 / (period + 1)
+    RSIGainzy.calculate_rsi          alpha = 1 / period   (Wilder smoothing)
+    RSIBuySellIndicator.pine_rma     alpha = 1 / length   (Pine rma)
+    Heiken-Ashi HA_Open              alpha = 1 / 2        (on HA_Close[i-1])
+
+Backends:
+    "numba"  - JIT compiled loop (used when numba is installed)
+    "scipy"  - scipy.signal.lfilter
+    "python" - plain loop, always available
+
+Every backend evaluates exactly alpha * x + c * y with c = 1.0 - alpha, so the
+results are identical bit for bit whichever one is active.
+"""
+
+import numpy as np
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy is optional
+    lfilter = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+_backend = None
+
+
+def _python_ema(values: np.array, alpha: float, c: float, initial: float) -> np.array:
+    out = np.empty(len(values), dtype=float)
+    y = initial
+    for i in range(len(values)):
+        y = alpha * values[i] + c * y
+        out[i] = y
+    return out
+
+
+def _scipy_ema(values: np.array, alpha: float, c: float, initial: float) -> np.array:
+    out, _ = lfilter([alpha], [1.0, -c], values, zi=[c * initial])
+    return out
+
+
+if njit is not None:
+    _numba_ema = njit(cache=True)(_python_ema)
+else:
+    _numba_ema = None
+
+
+def available_backends() -> list:
+    """Backends that can run in this environment"""
+    backends = []
+    if _numba_ema is not None:
+        backends.append('numba')
+    if lfilter is not None:
+        backends.append('scipy')
+    backends.append('python')
+    return backends
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the recursion backend, "auto" picks the fastest one installed"""
+    global _backend
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"Recursion backend {name!r} is not available, use one of {available_backends()}")
+    _backend = name
+    return _backend
+
+
+def get_backend() -> str:
+    if _backend is None:
+        set_backend("auto")
+    return _backend
+
+
+def ema_filter(values: np.array, alpha: float, initial: float = None) -> np.array:
+    """
+    y[i] = alpha * x[i] + (1 - alpha) * y[i-1]
+
+    initial is y[-1]; when it is None the recursion is seeded with the first value
+    (y[0] = x[0]) the way Pine Script seeds its ema.
+    """
+    values = np.ascontiguousarray(values, dtype=float)
+    if len(values) == 0:
+        return np.empty(0)
+
+    alpha = float(alpha)
+    c = 1.0 - alpha
+    if initial is None:
+        head = values[:1].copy()
+        if len(values) == 1:
+            return head
+        return np.concatenate([head, ema_filter(values[1:], alpha, initial=values[0])])
+
+    backend = get_backend()
+    if backend == 'numba':
+        return _numba_ema(values, alpha, c, float(initial))
+    elif backend == 'scipy':
+        return _scipy_ema(values, alpha, c, float(initial))
+    return _python_ema(values, alpha, c, float(initial))
+
+
+def ema_step(previous: float, value: float, alpha: float) -> float:
+    """One step of the recursion with the same arithmetic as ema_filter, for streaming states"""
+    return alpha * value + (1.0 - alpha) * previous
+
+
+def forward_fill(sample_idx: np.array, sample_values: np.array, n: int) -> np.array:
+    """Spread per-sample results over n bars, NaN before the first sample"""
+    result = np.full(n, np.nan)
+    pos = np.full(n, -1)
+    pos[sample_idx] = np.arange(len(sample_idx))
+    pos = np.maximum.accumulate(pos)
+    has_sample = pos >= 0
+    result[has_sample] = np.asarray(sample_values)[pos[has_sample]]
+    return result
+
+
+def conditional_ema_filter(values: np.array, condition: np.array, alpha: float) -> np.array:
+    """
+    Conditional sampling: the recursion only advances on bars where condition is
+    True and the value is not NaN; other bars carry the last value forward.
+
+    Runs as compress -> ema_filter -> forward fill.
+    """
+    values = np.asarray(values, dtype=float)
+    sample_idx = np.flatnonzero(np.asarray(condition, dtype=bool) & ~np.isnan(values))
+    smoothed = ema_filter(values[sample_idx], alpha)
+    return forward_fill(sample_idx, smoothed, len(values))
@@ -930,7 +930,76 @@
 
 import numpy as np
 import pandas as pd
+from itertools import product
 from typing import Tuple
+from module.recursion import conditional_ema_filter, ema_step, forward_fill
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer of the last `period` samples with a running mean and
+    variance (Welford updates for add / replace).
+
+    Replaces the list + pop(0) + np.mean per bar of the old conditional SMA: each
+    push is O(1). The mean and M2 are recomputed from the buffer every
+    RESYNC_INTERVAL replacements so rounding drift cannot build up over long
+    histories.
+    """
+
+    RESYNC_INTERVAL = 1024
+
+    def __init__(self, period: int):
+        self.period = max(int(period), 1)
+        self.buffer = np.zeros(self.period, dtype=float)
+        self.head = 0        # oldest slot once the window is full
+        self.count = 0
+        self.mean = np.nan
+        self.m2 = 0.0
+        self.replaced = 0
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the window (same as SMA(x^2) - SMA(x)^2)"""
+        if self.count == 0:
+            return np.nan
+        return max(self.m2, 0.0) / self.count
+
+    def _advance(self, value: float) -> Tuple[int, float, float, int]:
+        """Count, mean, M2 and replace counter after adding `value` - the window is not modified"""
+        if self.count == 0:
+            return 1, value, 0.0, self.replaced
+        if self.count < self.period:
+            count = self.count + 1
+            delta = value - self.mean
+            mean = self.mean + delta / count
+            return count, mean, self.m2 + delta * (value - mean), self.replaced
+
+        oldest = self.buffer[self.head]
+        replaced = self.replaced + 1
+        if replaced >= self.RESYNC_INTERVAL:
+            window = self.buffer.copy()
+            window[self.head] = value
+            mean = window.mean()
+            return self.count, mean, float(np.sum((window - mean)**2)), 0
+
+        mean = self.mean + (value - oldest) / self.count
+        m2 = self.m2 + (value - oldest) * (value - mean + oldest - self.mean)
+        return self.count, mean, m2, replaced
+
+    def push(self, value: float):
+        """Add a sample, evicting the oldest one when the window is full"""
+        count, mean, m2, replaced = self._advance(value)
+        if self.count < self.period:
+            self.buffer[self.count] = value
+        else:
+            self.buffer[self.head] = value
+            self.head = (self.head + 1) % self.period
+        self.count, self.mean, self.m2, self.replaced = count, mean, m2, replaced
+
+    def preview(self, value: float) -> Tuple[float, float]:
+        """Mean and variance the window would have after push(value)"""
+        count, mean, m2, _ = self._advance(value)
+        return mean, max(m2, 0.0) / count
+
 
 class RangeFilter:
     """
@@ -950,55 +1019,46 @@ class RangeFilter:
         """
         Conditional Sampling EMA - only calculates EMA when condition is True
         Fixed to maintain single EMA value across all bars like Pine Script
+        Runs on the shared recursion kernel: alpha = 2/(n+1), seeded with the
+        first valid sample, carried forward on bars that are not sampled
         """
-        ema_val = np.nan  # Single EMA value that persists
-        result = np.full_like(values, np.nan, dtype=float)
-        
-        for i in range(len(values)):
-            if condition[i] and not np.isnan(values[i]):
-                if np.isnan(ema_val):
-                    ema_val = values[i]  # Initialize with first valid value
-                else:
-                    # Pine Script EMA formula: (x - ema) * (2/(n+1)) + ema
-                    alpha = 2.0 / (period + 1)
-                    ema_val = (values[i] - ema_val) * alpha + ema_val
-            
-            result[i] = ema_val
-                
-        return result
+        return conditional_ema_filter(values, condition, 2.0 / (period + 1))
     
+    def _rolling_samples(self, values: np.array, condition: np.array, period: int) -> Tuple[np.array, np.array, np.array]:
+        """
+        Push the sampled values (condition True and not NaN) through a RollingWindow.
+        Returns the sample positions and the window mean / variance after each sample.
+        """
+        values = np.asarray(values, dtype=float)
+        sample_idx = np.flatnonzero(np.asarray(condition, dtype=bool) & ~np.isnan(values))
+        means = np.empty(len(sample_idx))
+        variances = np.empty(len(sample_idx))
+
+        window = RollingWindow(period)
+        for k, value in enumerate(values[sample_idx]):
+            window.push(value)
+            means[k] = window.mean
+            variances[k] = window.variance
+
+        return sample_idx, means, variances
+
     def conditional_sma(self, values: np.array, condition: np.array, period: int) -> np.array:
         """
         Conditional Sampling SMA - only includes values when condition is True
-        Fixed to maintain running array like Pine Script
+        Keeps the last `period` samples in a ring buffer with a running mean,
+        bars without a sample carry the previous average like Pine Script
         """
-        result = np.full_like(values, np.nan, dtype=float)
-        vals_array = []  # Maintains the rolling window
-        
-        for i in range(len(values)):
-            if condition[i] and not np.isnan(values[i]):
-                vals_array.append(values[i])
-                if len(vals_array) > period:
-                    vals_array.pop(0)  # Remove oldest value
-            
-            # Calculate average of current array
-            if len(vals_array) > 0:
-                result[i] = np.mean(vals_array)
-                
-        return result
-    
+        sample_idx, means, _ = self._rolling_samples(values, condition, period)
+        return forward_fill(sample_idx, means, len(values))
+
     def standard_deviation(self, values: np.array, period: int) -> np.array:
         """
         Calculate standard deviation using conditional sampling
-        Formula: sqrt(SMA(x^2, n) - SMA(x, n)^2)
+        Formula: sqrt(SMA(x^2, n) - SMA(x, n)^2), evaluated as the population
+        variance of the window (Welford) to avoid cancellation on large prices
         """
-        condition = np.ones_like(values, dtype=bool)
-        mean_sq = self.conditional_sma(values**2, condition, period)
-        mean_val = self.conditional_sma(values, condition, period)
-        
-        # Calculate variance and handle potential negative values
-        variance = mean_sq - mean_val**2
-        std_dev = np.sqrt(np.maximum(variance, 0))
+        sample_idx, _, variances = self._rolling_samples(values, np.ones(len(values), dtype=bool), period)
+        std_dev = np.sqrt(forward_fill(sample_idx, variances, len(values)))
         return np.where(np.isnan(std_dev), 0, std_dev)
     
     def true_range(self, high: np.array, low: np.array, close: np.array) -> np.array:
@@ -1023,22 +1083,29 @@ class RangeFilter:
                            quantity: float, 
                            period: int,
                            point_value: float = 1.0,
-                           tick_size: float = 0.01) -> np.array:
+                           tick_size: float = 0.01,
+                           cache: dict = None) -> np.array:
         """
         Calculate range size based on different scaling methods
         Fixed to match Pine Script logic exactly
+        cache: optional dict with an already computed 'tr' (true_range) or
+        'changes' (abs change of values, 0 on the first bar) input
         """
         condition = np.ones_like(values, dtype=bool)
+        cache = cache if cache is not None else {}
         
         if scale == "ATR":
-            tr = self.true_range(high, low, close)
+            tr = cache['tr'] if 'tr' in cache else self.true_range(high, low, close)
             atr = self.conditional_ema(tr, condition, period)
             return quantity * atr
             
         elif scale == "Average Change":
-            # Calculate absolute change from previous bar
-            changes = np.abs(values - np.roll(values, 1))
-            changes[0] = 0  # First bar has no previous value
+            if 'changes' in cache:
+                changes = cache['changes']
+            else:
+                # Calculate absolute change from previous bar
+                changes = np.abs(values - np.roll(values, 1))
+                changes[0] = 0  # First bar has no previous value
             ac = self.conditional_ema(changes, condition, period)
             return quantity * ac
             
@@ -1246,10 +1313,41 @@ class RangeFilter:
         # Create a copy to avoid modifying original
         result_df = df.copy()
         
+        columns = self.filter_arrays(
+            df['High'].values, df['Low'].values, df['Close'].values,
+            filter_type, movement_source, range_quantity, range_scale, range_period,
+            smooth_range, smooth_period, average_filter, average_samples, point_value, tick_size
+        )
+        for name, values in columns.items():
+            result_df[name] = values
+        self.results['df'] = result_df
+        
+        return result_df
+
+    def filter_arrays(self,
+                high: np.array,
+                low: np.array,
+                close: np.array,
+                filter_type: str = "Type 1",
+                movement_source: str = "Close",
+                range_quantity: float = 2.618,
+                range_scale: str = "Average Change",
+                range_period: int = 14,
+                smooth_range: bool = True,
+                smooth_period: int = 27,
+                average_filter: bool = True,
+                average_samples: int = 2,
+                point_value: float = 1.0,
+                tick_size: float = 0.01,
+                cache: dict = None) -> dict:
+        """
+        run_filter on plain arrays, returns the RF_* columns as a dict of arrays.
+        cache may hold precomputed 'tr' / 'changes' inputs (see calculate_range_size).
+        """
         # Extract OHLC data
-        high = df['High'].values.astype(float)
-        low = df['Low'].values.astype(float)
-        close = df['Close'].values.astype(float)
+        high = np.asarray(high, dtype=float)
+        low = np.asarray(low, dtype=float)
+        close = np.asarray(close, dtype=float)
         
         # Determine high/low values based on movement source
         if movement_source == "Wicks":
@@ -1265,7 +1363,7 @@ class RangeFilter:
         # Calculate range size using the average price
         range_size = self.calculate_range_size(
             avg_price, high, low, close, range_scale, 
-            range_quantity, range_period, point_value, tick_size
+            range_quantity, range_period, point_value, tick_size, cache
         )
         
         # Smooth the range if requested
@@ -1322,14 +1420,6 @@ class RangeFilter:
         # Calculate signals using the close price
         buy_signals, sell_signals, trend_direction = self.calculate_signals(close, rfilt_final)
         
-        # Add results to DataFrame
-        result_df['RF_UpperBand'] = hi_band_final
-        result_df['RF_LowerBand'] = lo_band_final
-        result_df['RF_Filter'] = rfilt_final
-        result_df['RF_Trend'] = trend_direction
-        result_df['RF_BuySignal'] = buy_signals.astype(int)
-        result_df['RF_SellSignal'] = sell_signals.astype(int)
-        
         # Add current position state for easier tracking
         # Calculate CondIni to show current position
         position_state = np.zeros(len(close))
@@ -1353,11 +1443,8 @@ class RangeFilter:
                 pos_value = -1
             position_state[i] = pos_value
         
-        result_df['RF_Position'] = position_state.astype(int)
-        
         # Store results for potential plotting
         self.results = {
-            'df': result_df,
             'filter_line': rfilt_final,
             'upper_band': hi_band_final,
             'lower_band': lo_band_final,
@@ -1366,7 +1453,207 @@ class RangeFilter:
             'trend_direction': trend_direction
         }
         
-        return result_df
+        return {
+            'RF_UpperBand': hi_band_final,
+            'RF_LowerBand': lo_band_final,
+            'RF_Filter': rfilt_final,
+            'RF_Trend': trend_direction,
+            'RF_BuySignal': buy_signals.astype(int),
+            'RF_SellSignal': sell_signals.astype(int),
+            'RF_Position': position_state.astype(int),
+        }
+
+    def _grid_range_base(self, avg_price: np.array, high: np.array, low: np.array, close: np.array,
+                         scale: str, period: int, cache: dict) -> np.array:
+        """
+        Range size for quantity 1, cached per period. The abs change / true range
+        input is computed once for the whole grid.
+        """
+        if period not in cache:
+            condition = np.ones_like(avg_price, dtype=bool)
+            if scale == "ATR":
+                if 'tr' not in cache:
+                    cache['tr'] = self.true_range(high, low, close)
+                cache[period] = self.conditional_ema(cache['tr'], condition, period)
+            elif scale == "Average Change":
+                if 'changes' not in cache:
+                    changes = np.abs(avg_price - np.roll(avg_price, 1))
+                    changes[0] = 0
+                    cache['changes'] = changes
+                cache[period] = self.conditional_ema(cache['changes'], condition, period)
+            else:  # Standard Deviation
+                cache[period] = self.standard_deviation(avg_price, period)
+        return cache[period]
+
+    @staticmethod
+    def _grid_filter(h_val: np.array, l_val: np.array, r: np.array, filter_type: str) -> np.array:
+        """
+        Raw filter for every row of r (rows x bars) at once. The loop runs over bars,
+        each step updates all rows with the same arithmetic as run_filter.
+        """
+        rfilt = np.empty(r.shape, dtype=float)
+        rfilt[:, 0] = (h_val[0] + l_val[0]) / 2
+        prev = rfilt[:, 0].copy()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i in range(1, len(h_val)):
+                ri = r[:, i]
+                if filter_type == "Type 1":
+                    up = h_val[i] - ri
+                    down = l_val[i] + ri
+                    move_up = up > prev
+                    move_down = ~move_up & (down < prev)
+                    prev = np.where(move_up, up, np.where(move_down, down, prev))
+                elif filter_type == "Type 2":
+                    move_up = h_val[i] >= prev + ri
+                    move_down = ~move_up & (l_val[i] <= prev - ri)
+                    steps_up = np.floor(np.abs(h_val[i] - prev) / ri)
+                    steps_down = np.floor(np.abs(l_val[i] - prev) / ri)
+                    prev = np.where(move_up, prev + steps_up * ri,
+                                    np.where(move_down, prev - steps_down * ri, prev))
+                rfilt[:, i] = prev
+
+        return rfilt
+
+    @staticmethod
+    def _carry_nonzero(values: np.array) -> np.array:
+        """Row-wise: carry the last non-zero value forward (0 before the first one)"""
+        cols = np.arange(values.shape[1])
+        last = np.maximum.accumulate(np.where(values != 0, cols, 0), axis=1)
+        return np.take_along_axis(values, last, axis=1)
+
+    def grid_signals(self, close: np.array, filter_lines: np.array) -> Tuple[np.array, np.array, np.array, np.array]:
+        """
+        calculate_signals for a matrix of filter lines (rows x bars) without the
+        per-bar loops. Returns buy_signals, sell_signals, fdir and the CondIni position.
+        """
+        filter_lines = np.atleast_2d(filter_lines)
+        step = np.zeros(filter_lines.shape)
+        step[:, 1:] = np.where(filter_lines[:, 1:] > filter_lines[:, :-1], 1.0,
+                               np.where(filter_lines[:, 1:] < filter_lines[:, :-1], -1.0, 0.0))
+        fdir = self._carry_nonzero(step)
+
+        prev_close = np.roll(close, 1)
+        prev_close[0] = close[0]
+        upward = fdir == 1
+        downward = fdir == -1
+
+        long_cond = ((close > filter_lines) & (close > prev_close) & upward) | \
+                ((close > filter_lines) & (close < prev_close) & upward)
+        short_cond = ((close < filter_lines) & (close < prev_close) & downward) | \
+                    ((close < filter_lines) & (close > prev_close) & downward)
+
+        cond_ini = self._carry_nonzero(np.where(long_cond, 1, np.where(short_cond, -1, 0)))
+
+        buy_signals = np.zeros(filter_lines.shape, dtype=bool)
+        sell_signals = np.zeros(filter_lines.shape, dtype=bool)
+        buy_signals[:, 1:] = (cond_ini[:, 1:] == 1) & (cond_ini[:, :-1] != 1)
+        sell_signals[:, 1:] = (cond_ini[:, 1:] == -1) & (cond_ini[:, :-1] != -1)
+
+        return buy_signals, sell_signals, fdir, cond_ini
+
+    def run_filter_grid(self,
+                df: pd.DataFrame,
+                range_quantity=2.618,
+                range_period=14,
+                smooth_period=27,
+                average_samples=2,
+                filter_type: str = "Type 1",
+                movement_source: str = "Close",
+                range_scale: str = "Average Change",
+                smooth_range: bool = True,
+                average_filter: bool = True,
+                point_value: float = 1.0,
+                tick_size: float = 0.01) -> dict:
+        """
+        Evaluate run_filter for every combination of range_quantity, range_period,
+        smooth_period and average_samples in one batched pass
+
+        Each of the four tuned parameters takes a single value or a list; the grid is
+        their cartesian product. Shared work is done once: the abs change / true
+        range input, the range EMA per range_period, the smoothed range per
+        (quantity, period, smooth_period) and the raw filter for each distinct range.
+        The filter recursion steps all rows together and the signals are computed
+        on the whole matrix.
+
+        Returns:
+        --------
+        dict
+            'params': DataFrame with one row per combination, and for each of
+            RF_UpperBand, RF_LowerBand, RF_Filter, RF_Trend, RF_BuySignal,
+            RF_SellSignal, RF_Position a (combinations x bars) array whose row k
+            equals that column of run_filter with the parameters in params row k
+        """
+        required_cols = ['Open', 'High', 'Low', 'Close']
+        if not all(col in df.columns for col in required_cols):
+            raise ValueError(f"DataFrame must contain columns: {required_cols}")
+
+        high = df['High'].values.astype(float)
+        low = df['Low'].values.astype(float)
+        close = df['Close'].values.astype(float)
+
+        if movement_source == "Wicks":
+            h_val, l_val = high, low
+        else:  # Close
+            h_val, l_val = close, close
+        avg_price = (h_val + l_val) / 2
+
+        params = pd.DataFrame(
+            list(product(np.atleast_1d(range_quantity), np.atleast_1d(range_period),
+                         np.atleast_1d(smooth_period), np.atleast_1d(average_samples))),
+            columns=['range_quantity', 'range_period', 'smooth_period', 'average_samples'])
+        params = params.astype({'range_quantity': float, 'range_period': int,
+                                'smooth_period': int, 'average_samples': int})
+
+        # Smoothed range, one row per distinct (quantity, period, smooth_period)
+        # (period / smooth_period only matter for some settings, drop them from the key otherwise)
+        period_used = range_scale in ("ATR", "Average Change", "Standard Deviation")
+        range_keys = list(zip(params['range_quantity'],
+                              params['range_period'] if period_used else [0] * len(params),
+                              params['smooth_period'] if smooth_range else [0] * len(params)))
+        unique_keys = list(dict.fromkeys(range_keys))
+        base_cache = {}
+        r_rows = []
+        for quantity, period, smooth in unique_keys:
+            if period_used:
+                range_size = quantity * self._grid_range_base(avg_price, high, low, close,
+                                                              range_scale, period, base_cache)
+            else:
+                range_size = self.calculate_range_size(avg_price, high, low, close, range_scale,
+                                                       quantity, 0, point_value, tick_size)
+            if smooth_range:
+                range_size = self.conditional_ema(range_size, np.ones_like(range_size, dtype=bool), smooth)
+            r_rows.append(range_size)
+        r_unique = np.vstack(r_rows)
+        rfilt_unique = self._grid_filter(h_val, l_val, r_unique, filter_type)
+
+        row_of = np.array([unique_keys.index(key) for key in range_keys])
+        r = r_unique[row_of]
+        rfilt = rfilt_unique[row_of]
+        hi_band = rfilt + r
+        lo_band = rfilt - r
+
+        if average_filter:
+            filter_changes = np.ones(rfilt.shape, dtype=bool)
+            filter_changes[:, 1:] = rfilt[:, 1:] != rfilt[:, :-1]
+            for k, samples in enumerate(params['average_samples']):
+                alpha = 2.0 / (samples + 1)
+                rfilt[k] = conditional_ema_filter(rfilt[k], filter_changes[k], alpha)
+                hi_band[k] = conditional_ema_filter(hi_band[k], filter_changes[k], alpha)
+                lo_band[k] = conditional_ema_filter(lo_band[k], filter_changes[k], alpha)
+
+        buy_signals, sell_signals, trend_direction, position = self.grid_signals(close, rfilt)
+
+        return {
+            'params': params,
+            'RF_UpperBand': hi_band,
+            'RF_LowerBand': lo_band,
+            'RF_Filter': rfilt,
+            'RF_Trend': trend_direction,
+            'RF_BuySignal': buy_signals.astype(int),
+            'RF_SellSignal': sell_signals.astype(int),
+            'RF_Position': position.astype(int),
+        }
     
     # def calculate_signals(self, 
     #                      close: np.array, 
@@ -1728,4 +2015,249 @@ plt.scatter(sell_points.index, sell_points['Close'], color='red', marker='v', s=
 plt.legend()
 plt.title('Range Filter with Buy/Sell Signals')
 plt.show()
-"""
\ No newline at end of file
+"""
+
+class RangeFilterState:
+    """
+    Streaming Range Filter - keeps the Pine Script `var` state between bars
+
+    RangeFilter.run_filter rebuilds every array from scratch on each call. This
+    class holds the persistent values instead (range EMAs, raw filter, averaged
+    filter/bands, fdir and CondIni) so that one closed candle costs O(1).
+
+    Usage:
+        state = RangeFilterState(range_quantity=2.618, range_period=14)
+        state.seed(history_df)          # closed candles, 'High'/'Low'/'Close'
+        state.update(closed_bar)        # advances the state
+        state.peek(forming_bar)         # same output, state left untouched
+
+    The outputs match the last row of run_filter on the same candles exactly.
+    """
+
+    def __init__(self,
+                 filter_type: str = "Type 1",
+                 movement_source: str = "Close",
+                 range_quantity: float = 2.618,
+                 range_scale: str = "Average Change",
+                 range_period: int = 14,
+                 smooth_range: bool = True,
+                 smooth_period: int = 27,
+                 average_filter: bool = True,
+                 average_samples: int = 2,
+                 point_value: float = 1.0,
+                 tick_size: float = 0.01):
+        self.filter_type = filter_type
+        self.movement_source = movement_source
+        self.range_quantity = range_quantity
+        self.range_scale = range_scale
+        self.range_period = range_period
+        self.smooth_range = smooth_range
+        self.smooth_period = smooth_period
+        self.average_filter = average_filter
+        self.average_samples = average_samples
+        self.point_value = point_value
+        self.tick_size = tick_size
+        self.reset()
+
+    def reset(self):
+        """Forget all history - the next bar is treated as bar 0"""
+        self.bars = 0
+        self.state = {
+            'prev_close': np.nan,
+            'prev_avg': np.nan,
+            'range_ema': np.nan,         # ATR / Average Change EMA
+            'sd_window': RollingWindow(self.range_period),  # Standard Deviation samples
+            'smooth_ema': np.nan,        # smoothed range
+            'rfilt': np.nan,             # raw filter value
+            'av_filter': np.nan,         # averaged filter / bands
+            'av_upper': np.nan,
+            'av_lower': np.nan,
+            'prev_filter': np.nan,       # final filter of the previous bar (fdir)
+            'fdir': 0.0,
+            'cond_ini': 0,
+        }
+        self.last = None
+
+    @staticmethod
+    def _ema_step(ema_val: float, value: float, period: int) -> float:
+        """One step of RangeFilter.conditional_ema for a sampled bar"""
+        if np.isnan(value):
+            return ema_val
+        if np.isnan(ema_val):
+            return value
+        return ema_step(ema_val, value, 2.0 / (period + 1))
+
+    @staticmethod
+    def _bar_value(bar, name: str) -> float:
+        """Read 'High' or 'high' style keys from a dict / pandas Series"""
+        try:
+            return float(bar[name])
+        except (KeyError, IndexError):
+            return float(bar[name.lower()])
+
+    def _range_size(self, s: dict, new: dict, avg: float, high: float, low: float, close: float,
+                    commit: bool) -> float:
+        """Range size of the current bar, mirrors RangeFilter.calculate_range_size"""
+        scale = self.range_scale
+        if scale == "ATR":
+            prev_close = close if self.bars == 0 else s['prev_close']
+            tr = max(high - low, max(abs(high - prev_close), abs(low - prev_close)))
+            new['range_ema'] = self._ema_step(s['range_ema'], tr, self.range_period)
+            return self.range_quantity * new['range_ema']
+        elif scale == "Average Change":
+            change = 0.0 if self.bars == 0 else abs(avg - s['prev_avg'])
+            new['range_ema'] = self._ema_step(s['range_ema'], change, self.range_period)
+            return self.range_quantity * new['range_ema']
+        elif scale == "Standard Deviation":
+            window = s['sd_window']
+            if np.isnan(avg):
+                variance = window.variance
+            elif commit:
+                window.push(avg)
+                variance = window.variance
+            else:
+                _, variance = window.preview(avg)
+            if np.isnan(variance):
+                return self.range_quantity * 0.0
+            return self.range_quantity * np.sqrt(variance)
+        elif scale == "% of Price":
+            return close * self.range_quantity / 100
+        elif scale == "Points":
+            return self.range_quantity * self.point_value
+        elif scale == "Pips":
+            return self.range_quantity * 0.0001
+        elif scale == "Ticks":
+            return self.range_quantity * self.tick_size
+        else:  # Absolute
+            return float(self.range_quantity)
+
+    def _step(self, bar, commit: bool = False) -> Tuple[dict, dict]:
+        """
+        Compute the output for `bar` and the state after it. The scalar state is
+        returned as a new dict; only the Standard Deviation window is pushed in
+        place, and only when commit is True.
+        """
+        s = self.state
+        new = dict(s)
+        first = self.bars == 0
+
+        high = self._bar_value(bar, 'High')
+        low = self._bar_value(bar, 'Low')
+        close = self._bar_value(bar, 'Close')
+
+        if self.movement_source == "Wicks":
+            h_val, l_val = high, low
+        else:  # Close
+            h_val, l_val = close, close
+        avg_price = (h_val + l_val) / 2
+
+        # Range size and smoothing
+        range_size = self._range_size(s, new, avg_price, high, low, close, commit)
+        if self.smooth_range:
+            new['smooth_ema'] = self._ema_step(s['smooth_ema'], range_size, self.smooth_period)
+            r = new['smooth_ema']
+        else:
+            r = range_size
+
+        # Raw filter (Type 1 / Type 2)
+        prev_rfilt = s['rfilt']
+        if first:
+            rfilt = (h_val + l_val) / 2
+        else:
+            rfilt = prev_rfilt
+            if self.filter_type == "Type 1":
+                if h_val - r > prev_rfilt:
+                    rfilt = h_val - r
+                elif l_val + r < prev_rfilt:
+                    rfilt = l_val + r
+            elif self.filter_type == "Type 2":
+                if h_val >= prev_rfilt + r:
+                    steps = np.floor(np.abs(h_val - prev_rfilt) / r)
+                    rfilt = prev_rfilt + steps * r
+                elif l_val <= prev_rfilt - r:
+                    steps = np.floor(np.abs(l_val - prev_rfilt) / r)
+                    rfilt = prev_rfilt - steps * r
+        new['rfilt'] = rfilt
+
+        hi_band = rfilt + r
+        lo_band = rfilt - r
+
+        # Average the filter only when it changes
+        if self.average_filter:
+            if first or rfilt != prev_rfilt:
+                new['av_filter'] = self._ema_step(s['av_filter'], rfilt, self.average_samples)
+                new['av_upper'] = self._ema_step(s['av_upper'], hi_band, self.average_samples)
+                new['av_lower'] = self._ema_step(s['av_lower'], lo_band, self.average_samples)
+            filt, upper, lower = new['av_filter'], new['av_upper'], new['av_lower']
+        else:
+            filt, upper, lower = rfilt, hi_band, lo_band
+
+        # Filter direction
+        fdir = s['fdir']
+        if not first:
+            if filt > s['prev_filter']:
+                fdir = 1.0
+            elif filt < s['prev_filter']:
+                fdir = -1.0
+        new['fdir'] = fdir
+        new['prev_filter'] = filt
+
+        # CondIni and the buy/sell transitions
+        prev_close = close if first else s['prev_close']
+        moved = close > prev_close or close < prev_close
+        long_cond = close > filt and moved and fdir == 1
+        short_cond = close < filt and moved and fdir == -1
+
+        cond_ini = s['cond_ini']
+        if long_cond:
+            cond_ini = 1
+        elif short_cond:
+            cond_ini = -1
+        new['cond_ini'] = cond_ini
+
+        buy = not first and cond_ini == 1 and s['cond_ini'] != 1
+        sell = not first and not buy and cond_ini == -1 and s['cond_ini'] != -1
+
+        new['prev_close'] = close
+        new['prev_avg'] = avg_price
+
+        output = {
+            'RF_UpperBand': upper,
+            'RF_LowerBand': lower,
+            'RF_Filter': filt,
+            'RF_Trend': fdir,
+            'RF_BuySignal': int(buy),
+            'RF_SellSignal': int(sell),
+            'RF_Position': int(cond_ini),
+        }
+        return new, output
+
+    def update(self, bar) -> dict:
+        """Feed one CLOSED candle and advance the state"""
+        self.state, output = self._step(bar, commit=True)
+        self.bars += 1
+        self.last = output
+        return output
+
+    def peek(self, bar) -> dict:
+        """Evaluate the FORMING candle without changing the state"""
+        _, output = self._step(bar)
+        return output
+
+    def seed(self, df: pd.DataFrame) -> dict:
+        """Replay closed candles from history, returns the output of the last one"""
+        self.reset()
+        cols = {name: (name if name in df.columns else name.lower()) for name in ('High', 'Low', 'Close')}
+        highs = df[cols['High']].values.astype(float)
+        lows = df[cols['Low']].values.astype(float)
+        closes = df[cols['Close']].values.astype(float)
+        for high, low, close in zip(highs, lows, closes):
+            self.update({'High': high, 'Low': low, 'Close': close})
+        return self.last
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, **params) -> "RangeFilterState":
+        """Build a state with run_filter style parameters and seed it from df"""
+        state = cls(**params)
+        state.seed(df)
+        return state
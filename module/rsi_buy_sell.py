@@ -279,6 +279,8 @@ import pandas as pd
 import numpy as np
 import yfinance as yf
 from datetime import datetime, timedelta
+from collections import deque
+from module.recursion import ema_filter, ema_step
 
 class RSIBuySellIndicator:
     """
@@ -302,6 +304,42 @@ class RSIBuySellIndicator:
         self.rsi_upper = rsi_upper
         self.rsi_lower = rsi_lower
     
+    @staticmethod
+    def rma_values(values, length):
+        """
+        Pine Script rma on a float ndarray
+        
+        Seeded with the SMA of the first `length` values, then
+        rma = (src + (length - 1) * rma[1]) / length on the shared recursion kernel
+        (alpha = 1/length). A NaN in src makes the rma NaN and it is re-seeded
+        with the SMA once `length` valid values follow.
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        result = np.full(n, np.nan)
+        
+        # window_ok[i]: the `length` values ending at i are all valid (sma(src, length) exists)
+        nan_count = np.concatenate([[0], np.cumsum(np.isnan(values))])
+        window_ok = np.zeros(n, dtype=bool)
+        if n >= length:
+            window_ok[length - 1:] = (nan_count[length:] - nan_count[:n - length + 1]) == 0
+        
+        i = length - 1
+        while i < n:
+            valid = np.flatnonzero(window_ok[i:])
+            if len(valid) == 0:
+                break
+            seed = i + valid[0]
+            result[seed] = values[seed - length + 1:seed + 1].mean()
+            
+            # Run the recursion until the next NaN in src
+            gaps = np.flatnonzero(np.isnan(values[seed + 1:]))
+            end = seed + 1 + gaps[0] if len(gaps) else n
+            result[seed + 1:end] = ema_filter(values[seed + 1:end], 1.0 / length, initial=result[seed])
+            i = end + 1
+        
+        return result
+    
     def pine_rma(self, src, length):
         """
         Calculate RMA exactly as Pine Script does
@@ -309,27 +347,37 @@ class RSIBuySellIndicator:
         alpha = length
         sum = na(sum[1]) ? sma(src, length) : (src + (alpha - 1) * nz(sum[1])) / alpha
         """
-        alpha = length
-        result = pd.Series(index=src.index, dtype=float)
-        
-        # Initialize with SMA for the first 'length' values
-        sma_initial = src.rolling(window=length).mean()
-        
-        for i in range(len(src)):
-            if i < length - 1:
-                result.iloc[i] = np.nan
-            elif i == length - 1:
-                # First valid value is SMA
-                result.iloc[i] = sma_initial.iloc[i]
-            else:
-                # Subsequent values use RMA formula
-                prev_rma = result.iloc[i-1]
-                if pd.isna(prev_rma):
-                    result.iloc[i] = sma_initial.iloc[i]
-                else:
-                    result.iloc[i] = (src.iloc[i] + (alpha - 1) * prev_rma) / alpha
+        return pd.Series(self.rma_values(src.values, length), index=src.index)
+    
+    @staticmethod
+    def rsi_from_rma(up, down):
+        """rsi = down == 0 ? 100 : up == 0 ? 0 : 100 - (100 / (1 + up / down)), NaN while either rma is NaN"""
+        up = np.asarray(up, dtype=float)
+        down = np.asarray(down, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + up / down))
+        rsi = np.where(up == 0, 0.0, rsi)
+        rsi = np.where(down == 0, 100.0, rsi)
+        return np.where(np.isnan(up) | np.isnan(down), np.nan, rsi)
+    
+    def calculate_rsi_values(self, close):
+        """calculate_rsi on a float ndarray of closes, returns an ndarray"""
+        close = np.asarray(close, dtype=float)
+        changes = np.full(len(close), np.nan)
+        changes[1:] = np.diff(close)
+        return self.rsi_from_changes(changes)
+    
+    def rsi_from_changes(self, changes):
+        """RSI from change(src) (NaN on the first bar), for callers that already have the changes"""
+        changes = np.asarray(changes, dtype=float)
         
-        return result
+        # up = max(change(src), 0), down = -min(change(src), 0), NaN stays NaN
+        up_moves = np.where(np.isnan(changes), np.nan, np.maximum(changes, 0))
+        down_moves = np.where(np.isnan(changes), np.nan, -np.minimum(changes, 0))
+        
+        up_rma = self.rma_values(up_moves, self.rsi_length)
+        down_rma = self.rma_values(down_moves, self.rsi_length)
+        return self.rsi_from_rma(up_rma, down_rma)
     
     def calculate_rsi(self, prices):
         """
@@ -346,36 +394,28 @@ class RSIBuySellIndicator:
         Returns:
         pd.Series: RSI values
         """
-        # Calculate price changes (equivalent to change(src) in Pine Script)
-        changes = prices.diff()
-        
-        # Calculate up and down movements
-        # up = max(change(src), 0)
-        up_moves = np.maximum(changes, 0)
-        # down = -min(change(src), 0)  
-        down_moves = -np.minimum(changes, 0)
-        
-        # Calculate RMA of up and down movements
-        up_rma = self.pine_rma(up_moves, self.rsi_length)
-        down_rma = self.pine_rma(down_moves, self.rsi_length)
-        
-        # Calculate RSI using Pine Script logic
-        rsi = pd.Series(index=prices.index, dtype=float)
-        
-        for i in range(len(prices)):
-            down_val = down_rma.iloc[i]
-            up_val = up_rma.iloc[i]
-            
-            if pd.isna(down_val) or pd.isna(up_val):
-                rsi.iloc[i] = np.nan
-            elif down_val == 0:
-                rsi.iloc[i] = 100
-            elif up_val == 0:
-                rsi.iloc[i] = 0
-            else:
-                rsi.iloc[i] = 100 - (100 / (1 + up_val / down_val))
+        return pd.Series(self.calculate_rsi_values(prices.values), index=prices.index)
+    
+    def generate_signals_values(self, close):
+        """
+        generate_signals on a float ndarray of closes
         
-        return rsi
+        Returns:
+        tuple: (rsi, buy_signals, sell_signals) as ndarrays
+        """
+        rsi = self.calculate_rsi_values(close)
+        buy_signals, sell_signals = self.signals_from_rsi(rsi)
+        return rsi, buy_signals, sell_signals
+    
+    def signals_from_rsi(self, rsi):
+        """(buy_signals, sell_signals) ndarrays from an RSI array"""
+        rsi = np.asarray(rsi, dtype=float)
+        prev_rsi = np.concatenate([[np.nan], rsi[:-1]])
+        
+        # NaN compares False, like rsi.shift(1) in pandas
+        sell_signals = (prev_rsi > self.rsi_upper) & (rsi <= self.rsi_upper)
+        buy_signals = (prev_rsi < self.rsi_lower) & (rsi >= self.rsi_lower)
+        return buy_signals, sell_signals
     
     def generate_signals(self, prices):
         """
@@ -391,17 +431,10 @@ class RSIBuySellIndicator:
         Returns:
         tuple: (rsi, buy_signals, sell_signals)
         """
-        # Calculate RSI
-        rsi = self.calculate_rsi(prices)
-        
-        # Generate signals based on Pine Script logic
-        # Sell signal: rsi[1] > rsi_upper and rsi <= rsi_upper (RSI was above threshold and now crosses down to threshold)
-        sell_signals = (rsi.shift(1) > self.rsi_upper) & (rsi <= self.rsi_upper)
-        
-        # Buy signal: rsi[1] < rsi_lower and rsi >= rsi_lower (RSI was below threshold and now crosses up to threshold)
-        buy_signals = (rsi.shift(1) < self.rsi_lower) & (rsi >= self.rsi_lower)
-        
-        return rsi, buy_signals, sell_signals
+        rsi, buy_signals, sell_signals = self.generate_signals_values(prices.values)
+        return (pd.Series(rsi, index=prices.index),
+                pd.Series(buy_signals, index=prices.index),
+                pd.Series(sell_signals, index=prices.index))
     
     def analyze_data(self, data):
         """
@@ -462,6 +495,104 @@ class RSIBuySellIndicator:
         return summary
 
 
+class RSIState:
+    """
+    Streaming RSI Buy/Sell - one close at a time
+    
+    Keeps the previous close, the last `rsi_length` changes (for the SMA seed),
+    the up/down rma and the previous RSI, so each closed candle costs O(1).
+    
+    Usage:
+        state = RSIState(rsi_length=14)
+        state.seed(history_closes)
+        rsi, buy, sell = state.update(close)   # closed candle
+        rsi, buy, sell = state.peek(close)     # forming candle, state untouched
+    
+    The outputs match the last row of RSIBuySellIndicator.generate_signals exactly.
+    """
+    
+    def __init__(self, rsi_length=14, rsi_upper=70, rsi_lower=30):
+        self.rsi_length = rsi_length
+        self.rsi_upper = rsi_upper
+        self.rsi_lower = rsi_lower
+        self.reset()
+    
+    def reset(self):
+        """Forget all history - the next close is treated as bar 0"""
+        self.bars = 0
+        self.state = {
+            'prev_close': np.nan,
+            'up_window': deque(maxlen=self.rsi_length),    # changes since the last NaN, for the SMA seed
+            'down_window': deque(maxlen=self.rsi_length),
+            'up_rma': np.nan,
+            'down_rma': np.nan,
+            'prev_rsi': np.nan,
+        }
+        self.last = None
+    
+    def _rma_step(self, rma, window, value):
+        """One bar of RSIBuySellIndicator.rma_values; window already holds value"""
+        if np.isnan(value):
+            return np.nan
+        if np.isnan(rma):
+            if len(window) < self.rsi_length:
+                return np.nan
+            return np.array(window).mean()
+        return ema_step(rma, value, 1.0 / self.rsi_length)
+    
+    def _step(self, close, commit=False):
+        s = self.state
+        close = float(close)
+        change = close - s['prev_close']
+        
+        if np.isnan(change):
+            up = down = np.nan
+            up_window, down_window = deque(maxlen=self.rsi_length), deque(maxlen=self.rsi_length)
+        else:
+            up, down = max(change, 0.0), -min(change, 0.0)
+            up_window, down_window = s['up_window'], s['down_window']
+            if not commit:
+                up_window, down_window = up_window.copy(), down_window.copy()
+            up_window.append(up)
+            down_window.append(down)
+        
+        up_rma = self._rma_step(s['up_rma'], up_window, up)
+        down_rma = self._rma_step(s['down_rma'], down_window, down)
+        rsi = float(RSIBuySellIndicator.rsi_from_rma(up_rma, down_rma))
+        
+        sell = bool(s['prev_rsi'] > self.rsi_upper and rsi <= self.rsi_upper)
+        buy = bool(s['prev_rsi'] < self.rsi_lower and rsi >= self.rsi_lower)
+        
+        new = {
+            'prev_close': close,
+            'up_window': up_window,
+            'down_window': down_window,
+            'up_rma': up_rma,
+            'down_rma': down_rma,
+            'prev_rsi': rsi,
+        }
+        return new, (rsi, buy, sell)
+    
+    def update(self, close):
+        """Feed one CLOSED candle's close and advance the state, returns (rsi, buy, sell)"""
+        self.state, output = self._step(close, commit=True)
+        self.bars += 1
+        self.last = output
+        return output
+    
+    def peek(self, close):
+        """Evaluate the FORMING candle's close without changing the state"""
+        _, output = self._step(close)
+        return output
+    
+    def seed(self, closes):
+        """Replay closed candles from history, returns the output of the last one"""
+        self.reset()
+        for close in np.asarray(closes, dtype=float):
+            self.update(close)
+        return self.last
+
+
 # Example Usage
 def example_usage():
     """
@@ -1151,6 +1151,8 @@
 
 import pandas as pd
 import numpy as np
+from collections import deque
+from module.recursion import ema_filter, ema_step
 
 class RSIGainzy:
     """
@@ -1179,95 +1181,76 @@ class RSIGainzy:
         if len(close_prices) < period + 1:
             return rsi
         
-        # Calculate initial SMA for gains and losses
-        avg_gain = np.mean(gains[1:period+1])
-        avg_loss = np.mean(losses[1:period+1])
+        # Initial SMA for gains and losses, then Wilder's smoothing (alpha = 1/period)
+        # on the shared recursion kernel
+        avg_gain = np.concatenate([[np.mean(gains[1:period+1])],
+                                   ema_filter(gains[period+1:], 1.0 / period, initial=np.mean(gains[1:period+1]))])
+        avg_loss = np.concatenate([[np.mean(losses[1:period+1])],
+                                   ema_filter(losses[period+1:], 1.0 / period, initial=np.mean(losses[1:period+1]))])
         
-        # Calculate first RSI value
-        if avg_loss == 0:
-            rsi[period] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi[period] = 100.0 - (100.0 / (1.0 + rs))
-        
-        # Calculate subsequent RSI values using Wilder's smoothing
-        for i in range(period + 1, len(close_prices)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-            
-            if avg_loss == 0:
-                rsi[i] = 100.0
-            else:
-                rs = avg_gain / avg_loss
-                rsi[i] = 100.0 - (100.0 / (1.0 + rs))
+        # RSI, 100 when there are no losses in the window
+        rs = np.divide(avg_gain, avg_loss, out=np.zeros_like(avg_gain), where=avg_loss != 0)
+        rsi[period:] = np.where(avg_loss == 0, 100.0, 100.0 - (100.0 / (1.0 + rs)))
         
         return rsi
     
-    def find_pivot_highs(self, values: np.array, left: int, right: int) -> np.array:
-        """Find pivot highs - matches Pine Script ta.pivothigh logic"""
+    @staticmethod
+    def sliding_max(values: np.array, window: int) -> np.array:
+        """
+        Max of every window of `window` consecutive values (n - window + 1 results)
+        in O(n): van Herk / Gil-Werman block prefix and suffix maxima, so the
+        cost does not grow with the window. values must not contain NaN.
+        """
+        n = len(values)
+        pad = (-n) % window
+        blocks = np.concatenate([values, np.full(pad, -np.inf)]).reshape(-1, window)
+        prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+        suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+        start = np.arange(n - window + 1)
+        return np.maximum(suffix[start], prefix[start + window - 1])
+
+    def _find_pivots(self, values: np.array, left: int, right: int, highs: bool) -> np.array:
+        """
+        Bar i is a pivot when it is not NaN and every non-NaN bar in [i-left, i+right]
+        is strictly below (highs) / above (lows) it; ties are not pivots. NaN
+        neighbours are skipped by filling them with -inf. Lows are found as highs
+        of the negated series. The pivot is reported on bar i + right, when Pine
+        confirms it.
+        """
+        values = np.asarray(values, dtype=float)
         n = len(values)
         pivots = np.full(n, np.nan)
-        
-        for i in range(left, n - right):
-            if np.isnan(values[i]):
-                continue
-                
-            is_pivot = True
-            pivot_value = values[i]
-            
-            # Check left side
-            for j in range(i - left, i):
-                if not np.isnan(values[j]) and values[j] >= pivot_value:
-                    is_pivot = False
-                    break
-            
-            # Check right side if left side passed
-            if is_pivot:
-                for j in range(i + 1, i + right + 1):
-                    if j < n and not np.isnan(values[j]) and values[j] >= pivot_value:
-                        is_pivot = False
-                        break
-            
-            if is_pivot:
-                # Pine Script returns the pivot at the current bar when detected
-                # but it refers to the bar that was left periods ago
-                if i + right < n:
-                    pivots[i + right] = pivot_value
-                
+        if n - right <= left:
+            return pivots
+
+        nan = np.isnan(values)
+        signed = values if highs else -values
+        filled = np.where(nan, -np.inf, signed)
+
+        # max of the `left` bars before / `right` bars after every bar
+        left_max = np.full(n, -np.inf)
+        right_max = np.full(n, -np.inf)
+        if left > 0:
+            left_max[left:] = self.sliding_max(filled, left)[:n - left]
+        if right > 0:
+            right_max[:n - right] = self.sliding_max(filled, right)[1:]
+
+        is_pivot = ~nan & (left_max < signed) & (right_max < signed)
+        # only bars with a full window on both sides
+        is_pivot[:left] = False
+        is_pivot[n - right:] = False
+
+        idx = np.flatnonzero(is_pivot)
+        pivots[idx + right] = values[idx]
         return pivots
+
+    def find_pivot_highs(self, values: np.array, left: int, right: int) -> np.array:
+        """Find pivot highs - matches Pine Script ta.pivothigh logic"""
+        return self._find_pivots(values, left, right, highs=True)
     
     def find_pivot_lows(self, values: np.array, left: int, right: int) -> np.array:
         """Find pivot lows - matches Pine Script ta.pivotlow logic"""
-        n = len(values)
-        pivots = np.full(n, np.nan)
-        
-        for i in range(left, n - right):
-            if np.isnan(values[i]):
-                continue
-                
-            is_pivot = True
-            pivot_value = values[i]
-            
-            # Check left side
-            for j in range(i - left, i):
-                if not np.isnan(values[j]) and values[j] <= pivot_value:
-                    is_pivot = False
-                    break
-            
-            # Check right side if left side passed
-            if is_pivot:
-                for j in range(i + 1, i + right + 1):
-                    if j < n and not np.isnan(values[j]) and values[j] <= pivot_value:
-                        is_pivot = False
-                        break
-            
-            if is_pivot:
-                # Pine Script returns the pivot at the current bar when detected
-                # but it refers to the bar that was left periods ago
-                if i + right < n:
-                    pivots[i + right] = pivot_value
-                
-        return pivots
+        return self._find_pivots(values, left, right, highs=False)
 
     def calculate_gainzy_colors(self, df, close_col='close', rsi_length=14, pivot_length=10):
         """
@@ -1282,19 +1265,19 @@ class RSIGainzy:
         Returns:
         df: DataFrame with added 'gainzy_color' column
         """
-        
-        # Make a copy to avoid modifying original
-        df = df.copy()
-        
-        # Get close prices
-        close_prices = df[close_col].values
-        n = len(close_prices)
-        
-        # Initialize gainzy_color column
-        df.loc[:, 'gainzy_color'] = 'black'
-        
-        # Calculate RSI
-        rsi = self.calculate_rsi(close_prices, rsi_length)
+        rsi = self.calculate_rsi(df[close_col].values, rsi_length)
+        colors = self.gainzy_colors_values(rsi, pivot_length)
+        return pd.Series(colors, index=df.index, name='gainzy_color')
+
+    def gainzy_colors_values(self, rsi: np.array, pivot_length: int = 10) -> np.array:
+        """
+        Gainzy color of every bar from an already computed RSI array, returns an
+        object ndarray of color names. The RSI may come from calculate_rsi or any
+        Pine ta.rsi equivalent (on closes without NaN, RSIBuySellIndicator's
+        calculate_rsi_values gives the same values bit for bit).
+        """
+        rsi = np.asarray(rsi, dtype=float)
+        n = len(rsi)
         
         # Find pivot points
         rsi_pivot_high = self.find_pivot_highs(rsi, pivot_length, pivot_length)
@@ -1480,11 +1463,229 @@ class RSIGainzy:
             0: 'black'                # Black - default
         }
         
+        colors = np.empty(n, dtype=object)
         for i in range(n):
-            color = color_map.get(trend_results[i], 'black')
-            df.loc[df.index[i], 'gainzy_color'] = color
+            colors[i] = color_map.get(trend_results[i], 'black')
         
-        return df['gainzy_color']
+        return colors
+
+class GainzyState:
+    """
+    Streaming RSI Gainzy colors - one closed candle at a time
+
+    calculate_gainzy_colors recomputes RSI, all pivots and replays the trend
+    state machine from bar 0 on every call. This class keeps the Pine `var`
+    values instead: Wilder averages, the last 2 * pivot_length + 1 RSI values
+    (a pivot is confirmed pivot_length bars after it happened), the two pivot
+    high / low points of each line, how far each line has been extended and
+    the trend.
+
+    Usage:
+        state = GainzyState(rsi_length=14, pivot_length=10)
+        state.seed(history_closes)
+        color = state.update(close)     # closed candle
+        color = state.peek(close)       # forming candle, state untouched
+
+    The colors match calculate_gainzy_colors on the same closes exactly.
+    """
+
+    COLOR_MAP = {-3: 'pink', 3: 'light_green', 2: 'blue', 1: 'green', -1: 'red', 0: 'black'}
+
+    def __init__(self, rsi_length: int = 14, pivot_length: int = 10):
+        if pivot_length < 1:
+            raise ValueError("pivot_length must be at least 1 to stream pivots")
+        self.rsi_length = rsi_length
+        self.pivot_length = pivot_length
+        self.reset()
+
+    def reset(self):
+        """Forget all history - the next close is treated as bar 0"""
+        self.bars = 0
+        self.state = {
+            'prev_close': np.nan,
+            'seed_gains': [],           # first rsi_length changes, for the SMA seed
+            'seed_losses': [],
+            'avg_gain': np.nan,
+            'avg_loss': np.nan,
+            'rsi_window': deque(maxlen=2 * self.pivot_length + 1),
+            'high': self._empty_line(),
+            'low': self._empty_line(),
+            'trend': 0,
+        }
+        self.last = None
+
+    @staticmethod
+    def _empty_line() -> dict:
+        return {'prev_val': np.nan, 'last_val': np.nan, 'prev_bar': np.nan, 'last_bar': np.nan,
+                'j': None, 'point': np.nan}
+
+    def _rsi_step(self, s: dict, new: dict, close: float, i: int) -> float:
+        """One bar of RSIGainzy.calculate_rsi"""
+        p = self.rsi_length
+        delta = close - s['prev_close'] if i > 0 else 0.0
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if 1 <= i <= p:
+            new['seed_gains'] = s['seed_gains'] + [gain]
+            new['seed_losses'] = s['seed_losses'] + [loss]
+        if i == p:
+            new['avg_gain'] = np.mean(new['seed_gains'])
+            new['avg_loss'] = np.mean(new['seed_losses'])
+        elif i > p:
+            new['avg_gain'] = ema_step(s['avg_gain'], gain, 1.0 / p)
+            new['avg_loss'] = ema_step(s['avg_loss'], loss, 1.0 / p)
+        if i < p:
+            return np.nan
+
+        avg_gain, avg_loss = new['avg_gain'], new['avg_loss']
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+    def _confirmed_pivot(self, window: deque, highs: bool) -> float:
+        """Pivot pivot_length bars back, if the window around it confirms one"""
+        L = self.pivot_length
+        if len(window) < 2 * L + 1:
+            return np.nan
+        center = window[L]
+        if np.isnan(center):
+            return np.nan
+        for k, value in enumerate(window):
+            if k == L or np.isnan(value):
+                continue
+            if (value >= center) if highs else (value <= center):
+                return np.nan
+        # Pine condition rsi[pivotLen] != rsi[pivotLen + 1]
+        if window[L] == window[L + 1]:
+            return np.nan
+        return center
+
+    @staticmethod
+    def _line_step(line: dict, pivot: float, pivot_bar: int, i: int, offset: int) -> dict:
+        """
+        Pivot tracking and current line point of one line. The extension loop
+        resumes from where the previous bar stopped instead of from the last
+        pivot, which gives the same j. offset is 1 for the high line and 0 for
+        the low line (the batch loops differ there).
+        """
+        line = dict(line)
+        if not np.isnan(pivot):
+            line['prev_val'], line['prev_bar'] = line['last_val'], line['last_bar']
+            line['last_val'], line['last_bar'] = pivot, pivot_bar
+            line['j'] = None
+
+        prev_val, last_val = line['prev_val'], line['last_val']
+        prev_bar, last_bar = line['prev_bar'], line['last_bar']
+        line['point'] = prev_val
+        if (not np.isnan(prev_val) and not np.isnan(last_val) and
+            not np.isnan(prev_bar) and not np.isnan(last_bar) and
+            last_bar != prev_bar):
+
+            j = int(last_bar) if line['j'] is None else line['j']
+            while j < i:
+                next_point = prev_val + (last_val - prev_val) * (j + offset - prev_bar) / (last_bar - prev_bar)
+                if next_point >= 100 or next_point <= 0:
+                    break
+                j += 1
+            line['j'] = j
+            line['point'] = prev_val + (last_val - prev_val) * (j - prev_bar) / (last_bar - prev_bar)
+        return line
+
+    def _step(self, close: float, commit: bool = False):
+        s = self.state
+        i = self.bars
+        close = float(close)
+        new = dict(s)
+        new['prev_close'] = close
+
+        rsi = self._rsi_step(s, new, close, i)
+
+        window = s['rsi_window'] if commit else s['rsi_window'].copy()
+        window.append(rsi)
+        new['rsi_window'] = window
+
+        pivot_high = self._confirmed_pivot(window, highs=True)
+        pivot_low = self._confirmed_pivot(window, highs=False)
+        new['high'] = self._line_step(s['high'], pivot_high, i - self.pivot_length, i, 1)
+        new['low'] = self._line_step(s['low'], pivot_low, i - self.pivot_length, i, 0)
+
+        trend = s['trend']
+        if np.isnan(rsi):
+            return new, self.COLOR_MAP.get(trend, 'black')
+
+        curr_rsi = rsi
+        curr_high_line = new['high']['point'] if not np.isnan(new['high']['point']) else 0
+        curr_low_line = new['low']['point'] if not np.isnan(new['low']['point']) else 0
+        prev_high_line = s['high']['point'] if i > 0 and not np.isnan(s['high']['point']) else 0
+        prev_low_line = s['low']['point'] if i > 0 and not np.isnan(s['low']['point']) else 0
+
+        # Bullish trend conditions
+        if (curr_rsi > curr_high_line and curr_high_line > curr_low_line and
+            np.isnan(pivot_high) and curr_high_line > prev_high_line and trend <= 0):
+            trend = 3
+        elif (curr_rsi > curr_low_line and curr_high_line < curr_low_line and
+            np.isnan(pivot_high) and curr_low_line > prev_low_line and trend <= 0):
+            trend = 3
+        elif (curr_rsi > curr_high_line and curr_high_line > curr_low_line and
+            np.isnan(pivot_high) and trend < 3):
+            trend = 1
+        elif (curr_rsi > curr_low_line and curr_high_line < curr_low_line and
+            np.isnan(pivot_high) and trend < 3):
+            trend = 1
+        elif (curr_rsi > curr_high_line and curr_rsi < curr_low_line and
+            curr_high_line < curr_low_line):
+            trend = 2
+
+        # Reset bullish trend
+        if curr_rsi < curr_high_line and trend > 0:
+            trend = 0
+
+        # Bearish trend conditions
+        if (curr_rsi < curr_low_line and curr_high_line > curr_low_line and
+            np.isnan(pivot_low) and curr_low_line < prev_low_line and
+            trend >= 0 and trend != 2):
+            trend = -3
+        elif (curr_rsi < curr_high_line and curr_high_line < curr_low_line and
+            np.isnan(pivot_low) and curr_low_line < prev_low_line and
+            trend >= 0 and trend != 2):
+            trend = -3
+        elif (curr_rsi < curr_low_line and curr_high_line > curr_low_line and
+            np.isnan(pivot_low) and trend > -3):
+            trend = -1
+        elif (curr_rsi < curr_high_line and curr_high_line < curr_low_line and
+            np.isnan(pivot_low) and trend > -3):
+            trend = -1
+        elif (curr_rsi < curr_low_line and curr_rsi > curr_high_line and
+            curr_high_line < curr_low_line):
+            trend = 2
+
+        # Reset bearish trend
+        if curr_rsi > curr_low_line and trend < 0:
+            trend = 0
+
+        new['trend'] = trend
+        return new, self.COLOR_MAP.get(trend, 'black')
+
+    def update(self, close: float) -> str:
+        """Feed one CLOSED candle's close and advance the state, returns its gainzy_color"""
+        self.state, color = self._step(close, commit=True)
+        self.bars += 1
+        self.last = color
+        return color
+
+    def peek(self, close: float) -> str:
+        """Color of the FORMING candle without changing the state"""
+        _, color = self._step(close)
+        return color
+
+    def seed(self, closes) -> str:
+        """Replay closed candles from history, returns the color of the last one"""
+        self.reset()
+        for close in np.asarray(closes, dtype=float):
+            self.update(close)
+        return self.last
+
 
 # Example usage
 def test_rsi_gainzy():
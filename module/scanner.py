@@ -0,0 +1,198 @@
+"""
+Multi-symbol signal scanner
+
+The bots trade one symbol; scan_symbols runs the same main.calculate_signals
+chain (module/pipeline.py, MAIN_SIGNAL_COLUMNS, 200 candle Signal_Final window)
+over many symbols at once:
+
+    1. the candles of every symbol are copied ONCE into a single
+       multiprocessing.shared_memory block (SharedCandles), rows of
+       time/open/high/low/close/volume as float64, one row range per symbol
+    2. a process pool attaches to the block in its initializer and builds the
+       pipeline once per worker; a task is just a list of symbol indices, so no
+       candle data is pickled per task
+    3. every worker returns one summary row per symbol, the parent ranks them
+
+Summary columns:
+    symbol              symbol name
+    time, close         last (forming) candle
+    Signal_Final        live signal of the last candle (what main.py trades on)
+    prev_signal         Signal_Final of the last closed candle
+    last_signal         most recent non-zero Signal_Final in the window (0 if none)
+    bars_since_signal   bars since last_signal (NaN if none)
+    RF_Position         range filter position of the last candle
+
+Ranking: firing symbols (Signal_Final != 0) first, then the most recent signal,
+then the symbol name.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool, shared_memory
+import os
+
+import numpy as np
+import pandas as pd
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+SUMMARY_COLUMNS = ['symbol', 'time', 'close', 'Signal_Final', 'prev_signal', 'last_signal',
+                   'bars_since_signal', 'RF_Position']
+
+
+class SharedCandles:
+    """
+    Candles of many symbols in one shared memory block
+
+    Usage:
+        with SharedCandles({'ETHUSDT': df_eth, 'BTCUSDT': df_btc}) as candles:
+            spec = candles.spec          # picklable, pass to the workers
+            ...
+        # in a worker:
+        shm, rows = SharedCandles.attach(spec)
+
+    Timestamps in milliseconds are exact in float64 (below 2**53).
+    """
+
+    def __init__(self, frames):
+        self.symbols = list(frames)
+        lengths = [len(frames[symbol]) for symbol in self.symbols]
+        self.offsets = np.r_[0, np.cumsum(lengths)].astype(int)
+        shape = (int(self.offsets[-1]), len(FIELDS))
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+        self.rows = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf)
+        for k, symbol in enumerate(self.symbols):
+            df = frames[symbol]
+            columns = {str(col).lower(): col for col in df.columns}
+            block = self.rows[self.offsets[k]:self.offsets[k + 1]]
+            for j, field in enumerate(FIELDS):
+                block[:, j] = df[columns[field]].to_numpy(dtype=float) if field in columns else np.nan
+        self.spec = (self.shm.name, shape, self.symbols, self.offsets.tolist())
+
+    @staticmethod
+    def attach(spec):
+        """(SharedMemory, rows array) of an existing block, the caller closes the SharedMemory"""
+        name, shape, _, _ = spec
+        # pool workers share the creator's resource tracker, the block is unlinked once by close()
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    def frame(self, k):
+        """Candles of the k-th symbol as a DataFrame (copy)"""
+        return candles_frame(self.rows, self.offsets[k], self.offsets[k + 1])
+
+    def close(self):
+        self.rows = None
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def candles_frame(rows, start, end):
+    block = rows[start:end]
+    df = pd.DataFrame({field: block[:, j].copy() for j, field in enumerate(FIELDS)})
+    df['time'] = df['time'].astype(np.int64)
+    return df
+
+
+def summarize_signals(symbol, df):
+    """Summary row (SUMMARY_COLUMNS) of one symbol's signal frame"""
+    signal = df['Signal_Final'].values
+    fired = np.flatnonzero(signal != 0)
+    last = df.iloc[-1]
+    return {
+        'symbol': symbol,
+        'time': int(last['time']),
+        'close': float(last['close']),
+        'Signal_Final': int(signal[-1]),
+        'prev_signal': int(signal[-2]) if len(signal) > 1 else 0,
+        'last_signal': int(signal[fired[-1]]) if len(fired) else 0,
+        'bars_since_signal': len(signal) - 1 - fired[-1] if len(fired) else np.nan,
+        'RF_Position': int(last['RF_Position']),
+    }
+
+
+def rank_signals(rows):
+    table = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    table['firing'] = table['Signal_Final'] != 0
+    table = table.sort_values(['firing', 'bars_since_signal', 'symbol'], ascending=[False, True, True],
+                              na_position='last')
+    return table.drop(columns='firing').reset_index(drop=True)
+
+
+# Worker side: one attachment and one pipeline per process
+_worker = {}
+
+
+def _init_worker(spec, pipeline_params, window):
+    shm, rows = SharedCandles.attach(spec)
+    _worker.update(shm=shm, rows=rows, symbols=spec[2], offsets=spec[3], window=window,
+                   pipeline=signal_pipeline(**pipeline_params))
+
+
+def _scan_indices(indices):
+    rows, offsets = _worker['rows'], _worker['offsets']
+    summaries = []
+    for k in indices:
+        symbol = _worker['symbols'][k]
+        if offsets[k + 1] == offsets[k]:
+            continue
+        try:
+            df = _worker['pipeline'].run(candles_frame(rows, offsets[k], offsets[k + 1]), MAIN_SIGNAL_COLUMNS,
+                                         window=_worker['window'])
+            summaries.append(summarize_signals(symbol, df))
+        except Exception as e:
+            print(f"Error calculating the signals of {symbol} : {e}")
+    return summaries
+
+
+def scan_symbols(frames, processes=None, heiken=True, n_candle_lookback=5, window=200, chunksize=None,
+                 **pipeline_params):
+    """
+    Ranked summary table (see the module docstring) of the kline frames in
+    `frames` ({symbol: DataFrame with time/open/high/low/close/volume}).
+
+    processes: pool size, default os.cpu_count(); 0 runs in this process.
+    chunksize: symbols per task, default an even split into 4 tasks per process.
+    """
+    pipeline_params = dict(pipeline_params, heiken=heiken, n_candle_lookback=n_candle_lookback)
+    processes = (os.cpu_count() or 1) if processes is None else processes
+    indices = list(range(len(frames)))
+
+    with SharedCandles(frames) as candles:
+        if processes == 0:
+            _init_worker(candles.spec, pipeline_params, window)
+            try:
+                return rank_signals(_scan_indices(indices))
+            finally:
+                _worker.pop('rows', None)
+                _worker.pop('shm').close()
+
+        chunksize = chunksize or max(1, -(-len(indices) // (processes * 4)))
+        chunks = [indices[i:i + chunksize] for i in range(0, len(indices), chunksize)]
+        with Pool(processes, initializer=_init_worker, initargs=(candles.spec, pipeline_params, window)) as pool:
+            summaries = [row for rows in pool.imap_unordered(_scan_indices, chunks) for row in rows]
+    return rank_signals(summaries)
+
+
+def fetch_candles(symbols, fetch, workers=8):
+    """
+    {symbol: fetch(symbol)} with the REST requests overlapped in threads.
+    Symbols whose fetch fails or returns no candles are left out.
+    """
+    def safe_fetch(symbol):
+        try:
+            return symbol, fetch(symbol)
+        except Exception as e:
+            print(f"Error fetching the klines of {symbol} : {e}")
+            return symbol, None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(safe_fetch, symbols))
+    return {symbol: df for symbol, df in results if df is not None and len(df)}
@@ -0,0 +1,100 @@
+"""
+Per-candle memoization of the signal pipeline
+
+One bot cycle asks for the signals of the same kline window several times (top
+of the loop, check_opposite_signal, right after it, and every 2 seconds inside
+fake_trade_loss_checker). The window only changes when a new candle opens or
+the forming candle's price / volume moves, so the result is cached under
+
+    (start time of the last candle, hash of the window's time + OHLCV values)
+
+and recomputed only when that key changes.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+KEY_COLUMNS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+
+def kline_window_key(df):
+    """
+    Cache key of a kline frame. Column names are matched case-insensitively so
+    'close' and 'Close' frames with the same values share a key.
+    """
+    columns = {str(col).lower(): col for col in df.columns}
+    digest = hashlib.blake2b(digest_size=16)
+    for name in KEY_COLUMNS:
+        if name in columns:
+            values = np.ascontiguousarray(df[columns[name]].to_numpy(dtype=float))
+            digest.update(name.encode())
+            digest.update(values.tobytes())
+    last_time = df[columns['time']].iloc[-1] if 'time' in columns and len(df) else None
+    return last_time, len(df), digest.hexdigest()
+
+
+class SignalCache:
+    """
+    Memoizes compute(df) on the kline window key
+
+    Usage:
+        cache = SignalCache()
+        df = cache.get_or_compute(df, calculate_signals_uncached)
+
+    Every hit returns a copy of the cached frame, callers may rename / modify it
+    freely. Results that are None (the pipeline failed) are not cached.
+    """
+
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.entries.clear()
+
+    def get_or_compute(self, df, compute):
+        if df is None or len(df) == 0:
+            return compute(df)
+
+        key = kline_window_key(df)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached.copy()
+
+        self.misses += 1
+        result = compute(df)
+        if result is not None:
+            self.entries[key] = result.copy()
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return result
+
+
+class KlineCache:
+    """
+    Reuses the last fetched kline frame for max_age seconds
+
+    The back to back fetches of one cycle (a few milliseconds apart) then cost a
+    single REST request. max_age = 0 disables it.
+    """
+
+    def __init__(self, max_age=1.0):
+        self.max_age = max_age
+        self.fetched_at = None
+        self.df = None
+
+    def get(self, fetch):
+        now = time.monotonic()
+        if self.df is not None and self.max_age > 0 and now - self.fetched_at < self.max_age:
+            return self.df.copy()
+        df = fetch()
+        if df is not None:
+            self.df, self.fetched_at = df.copy(), now
+        return df
@@ -0,0 +1,169 @@
+"""
+Signal_Final combiner for main.calculate_signals
+
+Signals (same priority order as the original per-row loop):
+     2 / -2   RF + IB box arrow, same candle or arrow within the RF lookback,
+              or arrow one candle before the RF signal
+     4 / -4   RSI + IB box arrow, same candle or arrow one candle after RSI
+
+Every branch needs a NEW signal (0 -> 1 edge) on the bar, so the state machine
+only has to run on bars where at least one edge occurs. Signal expiry is checked
+lazily on those bars. That is equivalent to checking every bar, because the
+expiry test only gets truer as bars pass and the flags it clears are only read
+on event bars.
+"""
+
+import numpy as np
+
+
+def new_signal_edges(values):
+    """values == 1 on a bar where the previous bar was not 1 (the first bar counts as new)"""
+    active = np.asarray(values) == 1
+    edges = active.copy()
+    edges[1:] &= ~active[:-1]
+    return edges
+
+
+def new_combiner_state():
+    """Tracking flags of the combiner before the first bar"""
+    return {
+        'last_rf_buy': False, 'last_rf_sell': False, 'rf_candle': -1, 'rf_used': False,
+        'last_green': False, 'last_red': False, 'arrow_candle': -1, 'arrow_used': False,
+        'last_rsi_buy': False, 'last_rsi_sell': False, 'rsi_candle': -1, 'rsi_used': False,
+    }
+
+
+def signal_step(s, i, rf_b, rf_s, green, red, rsi_b, rsi_s, n_candle_lookback=5):
+    """
+    One bar of the combiner. The flags are NEW signals (edges) on bar i, s is
+    the tracking state from new_combiner_state(), updated in place. Returns
+    Signal_Final of the bar. Only needs to be called on bars with an edge.
+    """
+    # Register new signals
+    if rf_b:
+        s['last_rf_buy'], s['last_rf_sell'], s['rf_candle'], s['rf_used'] = True, False, i, False
+    elif rf_s:
+        s['last_rf_sell'], s['last_rf_buy'], s['rf_candle'], s['rf_used'] = True, False, i, False
+    if green:
+        s['last_green'], s['last_red'], s['arrow_candle'], s['arrow_used'] = True, False, i, False
+    elif red:
+        s['last_red'], s['last_green'], s['arrow_candle'], s['arrow_used'] = True, False, i, False
+    if rsi_b:
+        s['last_rsi_buy'], s['last_rsi_sell'], s['rsi_candle'], s['rsi_used'] = True, False, i, False
+    elif rsi_s:
+        s['last_rsi_sell'], s['last_rsi_buy'], s['rsi_candle'], s['rsi_used'] = True, False, i, False
+
+    # Expire unused signals
+    if (i - s['rf_candle']) > n_candle_lookback and (s['last_rf_buy'] or s['last_rf_sell']) and not s['rf_used']:
+        s['last_rf_buy'] = s['last_rf_sell'] = False
+    if (i - s['arrow_candle']) > 1 and (s['last_green'] or s['last_red']) and not s['arrow_used']:
+        s['last_green'] = s['last_red'] = False
+    if (i - s['rsi_candle']) > 1 and (s['last_rsi_buy'] or s['last_rsi_sell']) and not s['rsi_used']:
+        s['last_rsi_buy'] = s['last_rsi_sell'] = False
+
+    rf_used, arrow_used, rsi_used = s['rf_used'], s['arrow_used'], s['rsi_used']
+    if rf_b and green and not rf_used and not arrow_used:
+        s['rf_used'] = s['arrow_used'] = True
+        s['last_rf_buy'] = s['last_green'] = False
+        return 2
+    if rf_s and red and not rf_used and not arrow_used:
+        s['rf_used'] = s['arrow_used'] = True
+        s['last_rf_sell'] = s['last_red'] = False
+        return -2
+    if s['last_rf_buy'] and not rf_used and green:
+        s['rf_used'] = s['arrow_used'] = True
+        s['last_rf_buy'] = s['last_green'] = False
+        return 2
+    if s['last_rf_sell'] and not rf_used and red:
+        s['rf_used'] = s['arrow_used'] = True
+        s['last_rf_sell'] = s['last_red'] = False
+        return -2
+    if s['last_green'] and not arrow_used and rf_b and (i - s['arrow_candle']) == 1:
+        s['arrow_used'] = s['rf_used'] = True
+        s['last_green'] = s['last_rf_buy'] = False
+        return 2
+    if s['last_red'] and not arrow_used and rf_s and (i - s['arrow_candle']) == 1:
+        s['arrow_used'] = s['rf_used'] = True
+        s['last_red'] = s['last_rf_sell'] = False
+        return -2
+    if rsi_b and green and not rsi_used:
+        s['rsi_used'] = True
+        s['last_rsi_buy'] = False
+        return 4
+    if rsi_s and red and not rsi_used:
+        s['rsi_used'] = True
+        s['last_rsi_sell'] = False
+        return -4
+    if s['last_rsi_buy'] and not rsi_used and green and (i - s['rsi_candle']) == 1:
+        s['rsi_used'] = True
+        s['last_rsi_buy'] = False
+        return 4
+    if s['last_rsi_sell'] and not rsi_used and red and (i - s['rsi_candle']) == 1:
+        s['rsi_used'] = True
+        s['last_rsi_sell'] = False
+        return -4
+    return 0
+
+
+def combine_signal_final(rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell,
+                         n_candle_lookback=5):
+    """
+    Signal_Final for every bar from the six per-bar signal columns
+    (RF_BuySignal, RF_SellSignal, GreenArrow, RedArrow, rsi_buy, rsi_sell).
+
+    Returns an int array: 0, +-2 or +-4.
+    """
+    edges = [new_signal_edges(values) for values in (rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell)]
+    signals = np.zeros(len(edges[0]), dtype=int)
+    events = np.flatnonzero(np.logical_or.reduce(edges)) if len(edges[0]) else []
+
+    state = new_combiner_state()
+    for i in np.asarray(events).tolist():
+        signals[i] = signal_step(state, i, *(bool(e[i]) for e in edges), n_candle_lookback=n_candle_lookback)
+
+    return signals
+
+
+class SignalFinalState:
+    """
+    Streaming combiner - one bar of RF / arrow / RSI signals at a time
+
+    Keeps the previous bar's raw signals (for the edges) and the tracking flags.
+
+    Usage:
+        state = SignalFinalState(n_candle_lookback=5)
+        signal = state.update(rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell)   # closed bar
+        signal = state.peek(rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell)     # forming bar
+
+    Matches combine_signal_final on the same bars exactly.
+    """
+
+    def __init__(self, n_candle_lookback=5):
+        self.n_candle_lookback = n_candle_lookback
+        self.reset()
+
+    def reset(self):
+        """Forget all history - the next bar is treated as bar 0"""
+        self.bars = 0
+        self.prev = (False,) * 6
+        self.state = new_combiner_state()
+        self.last = None
+
+    def _step(self, values, commit):
+        values = tuple(bool(v == 1) for v in values)
+        edges = [v and not p for v, p in zip(values, self.prev)]
+        if not any(edges):
+            return values, 0
+        state = self.state if commit else dict(self.state)
+        return values, signal_step(state, self.bars, *edges, n_candle_lookback=self.n_candle_lookback)
+
+    def update(self, rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell):
+        """Feed one CLOSED bar's signals and advance the state, returns its Signal_Final"""
+        self.prev, signal = self._step((rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell), commit=True)
+        self.bars += 1
+        self.last = signal
+        return signal
+
+    def peek(self, rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell):
+        """Signal_Final of the FORMING bar without changing the state"""
+        return self._step((rf_buy, rf_sell, green_arrow, red_arrow, rsi_buy, rsi_sell), commit=False)[1]
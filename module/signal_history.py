@@ -0,0 +1,233 @@
+"""
+Point-in-time (as-of) signal history
+
+Signal_Final of the forming candle can change while the candle is still open
+(every poll recomputes the indicators with the latest price), which is what the
+fake trade checks in main.py / main_binance.py guard against. replay_signal_history
+answers "what did the signal look like at time t" for every update of a candle
+history in ONE forward pass: the streaming indicator states are advanced once
+per closed candle and only peeked for the intermediate updates, so n updates
+cost O(n) instead of recomputing the whole frame n times.
+
+Updates are snapshots of the forming candle, oldest first:
+    time                    candle start (the same value for every update of a candle)
+    open/high/low/close     the candle as seen at that moment (any column case)
+    asof                    optional observation time, defaults to the row position
+
+intrabar_updates builds them from lower timeframe candles (e.g. 5m -> 15m).
+
+Indicator chain (main.calculate_signals): Heiken-Ashi (optional) -> Range Filter,
+RSI buy/sell, inside bar box -> Signal_Final. The states run over the whole
+replayed history, so the first bars follow the states' warmup rather than the
+bot's 200 candle fetch window.
+"""
+
+import numpy as np
+import pandas as pd
+
+from module.heiken_ashi import HeikinAshiState
+from module.ib_indicator import InsideBarState
+from module.rf import RangeFilterState
+from module.rsi_buy_sell import RSIState
+from module.signal_final import SignalFinalState
+
+COMPONENTS = ('RF_BuySignal', 'RF_SellSignal', 'GreenArrow', 'RedArrow', 'rsi_buy', 'rsi_sell')
+
+
+class SignalEngine:
+    """
+    Streaming main.calculate_signals - one candle at a time, O(1) per update
+
+    Usage:
+        engine = SignalEngine(heiken=True)
+        row = engine.update(closed_candle)     # {'Signal_Final', 'RF_BuySignal', ..., 'RF_Position'}
+        row = engine.peek(forming_candle)      # same output, state untouched
+
+    Candles are dicts / Series with open/high/low/close keys (any case). Rows
+    hold the six COMPONENTS, Signal_Final and the Range Filter's RF_Filter /
+    RF_Trend / RF_Position; the rows of closed candles match the pipeline's
+    MAIN_SIGNAL_COLUMNS run over the same candles without a window.
+    """
+
+    def __init__(self, heiken=True, n_candle_lookback=5, range_filter=None, rsi=None, inside_bar=None):
+        self.heiken = heiken
+        self.ha = HeikinAshiState()
+        self.rf = RangeFilterState(**(range_filter or {}))
+        self.rsi = RSIState(**(rsi or {}))
+        self.ib = InsideBarState(**(inside_bar or {}))
+        self.combiner = SignalFinalState(n_candle_lookback)
+        self.last = None
+
+    def reset(self):
+        """Forget all history"""
+        for state in (self.ha, self.rf, self.rsi, self.ib, self.combiner):
+            state.reset()
+        self.last = None
+
+    @staticmethod
+    def _candle(candle):
+        o, h, l, c = HeikinAshiState._ohlc(candle)
+        return {'Open': o, 'High': h, 'Low': l, 'Close': c}
+
+    def _evaluate(self, candle, commit):
+        bar = self._candle(candle)
+        if self.heiken:
+            bar = self.ha.update(bar) if commit else self.ha.peek(bar)
+
+        rf = self.rf.update(bar) if commit else self.rf.peek(bar)
+        _, rsi_buy, rsi_sell = self.rsi.update(bar['Close']) if commit else self.rsi.peek(bar['Close'])
+        ib = self.ib.update(bar) if commit else self.ib.peek(bar)
+
+        row = {
+            'RF_BuySignal': rf['RF_BuySignal'], 'RF_SellSignal': rf['RF_SellSignal'],
+            'GreenArrow': ib['GreenArrow'], 'RedArrow': ib['RedArrow'],
+            'rsi_buy': rsi_buy, 'rsi_sell': rsi_sell,
+            'RF_Filter': rf['RF_Filter'], 'RF_Trend': rf['RF_Trend'], 'RF_Position': rf['RF_Position'],
+        }
+        combine = self.combiner.update if commit else self.combiner.peek
+        row['Signal_Final'] = combine(*(row[name] for name in COMPONENTS))
+        return row
+
+    def update(self, candle):
+        """Feed one CLOSED candle and advance every state, returns its row"""
+        self.last = self._evaluate(candle, commit=True)
+        return self.last
+
+    def peek(self, candle):
+        """Row of the FORMING candle without changing any state"""
+        return self._evaluate(candle, commit=False)
+
+
+class RepaintLog:
+    """
+    Columnar as-of log, one entry per update, grouped by candle
+
+    columns: asof, time, close, final (the candle's last update), Signal_Final
+    (int8) and the six component flags (bool). Candle lookups are a binary
+    search on the distinct candle times.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        time = columns['time']
+        starts = np.flatnonzero(np.r_[True, time[1:] != time[:-1]]) if len(time) else np.empty(0, dtype=int)
+        self.candle_times = time[starts]
+        self.starts = np.r_[starts, len(time)]
+
+    def __len__(self):
+        return len(self.columns['time'])
+
+    def to_frame(self):
+        return pd.DataFrame(self.columns)
+
+    def candle(self, time):
+        """Every update of the candle starting at `time`, oldest first"""
+        k = np.searchsorted(self.candle_times, time)
+        if k == len(self.candle_times) or self.candle_times[k] != time:
+            raise KeyError(f"No updates for candle {time}")
+        rows = slice(self.starts[k], self.starts[k + 1])
+        return pd.DataFrame({name: values[rows] for name, values in self.columns.items()})
+
+    def final(self):
+        """The closing update of every candle (the signal the history shows afterwards)"""
+        mask = self.columns['final']
+        return pd.DataFrame({name: values[mask] for name, values in self.columns.items()})
+
+    def repaints(self):
+        """
+        Per candle summary:
+            updates        number of updates
+            first_signal   first non-zero Signal_Final seen while forming (0 if none)
+            first_asof     when it was seen (NaN if never)
+            final_signal   Signal_Final at the close
+            flips          how often Signal_Final changed between consecutive updates
+            repainted      a signal was shown that the closed candle does not have
+        """
+        summary_columns = ['time', 'updates', 'first_signal', 'first_asof', 'final_signal', 'flips', 'repainted']
+        if len(self) == 0:
+            return pd.DataFrame(columns=summary_columns)
+
+        signal = self.columns['Signal_Final']
+        starts, ends = self.starts[:-1], self.starts[1:]
+
+        changed = np.r_[False, signal[1:] != signal[:-1]]
+        changed[starts] = False
+        flips = np.add.reduceat(changed.astype(int), starts)
+
+        # first non-zero update at or after every position, read at the candle starts
+        positions = np.where(signal != 0, np.arange(len(signal)), len(signal))
+        first_idx = np.minimum.accumulate(positions[::-1])[::-1][starts]
+        has_first = first_idx < ends
+        first_idx = np.where(has_first, first_idx, 0)
+        first_signal = np.where(has_first, signal[first_idx], 0)
+        first_asof = np.where(has_first, self.columns['asof'][first_idx], np.nan)
+
+        final_signal = signal[ends - 1]
+        shown = (signal != 0) & (signal != np.repeat(final_signal, ends - starts))
+        repainted = np.logical_or.reduceat(shown, starts)
+
+        return pd.DataFrame({
+            'time': self.candle_times,
+            'updates': ends - starts,
+            'first_signal': first_signal.astype(np.int8),
+            'first_asof': first_asof,
+            'final_signal': final_signal,
+            'flips': flips,
+            'repainted': repainted,
+        })
+
+
+def intrabar_updates(candles, bar_length, step=None):
+    """
+    Forming-candle snapshots of `bar_length` candles from lower timeframe candles
+    (same time unit, e.g. 5m candles with bar_length=900 for 15m). asof is the
+    close time of the lower timeframe candle; step defaults to the smallest gap.
+    """
+    df = candles.rename(columns=lambda col: str(col).lower()).sort_values('time').reset_index(drop=True)
+    time = df['time'].values
+    if step is None:
+        step = np.diff(time).min() if len(time) > 1 else bar_length
+    bar_time = time - time % bar_length
+
+    groups = df.groupby(bar_time, sort=False)
+    updates = pd.DataFrame({
+        'asof': time + step,
+        'time': bar_time,
+        'open': groups['open'].transform('first').values,
+        'high': groups['high'].cummax().values,
+        'low': groups['low'].cummin().values,
+        'close': df['close'].values,
+    })
+    if 'volume' in df.columns:
+        updates['volume'] = groups['volume'].cumsum().values
+    return updates
+
+
+def replay_signal_history(updates, heiken=True, n_candle_lookback=5, range_filter=None, rsi=None,
+                          inside_bar=None):
+    """
+    Replay the updates through a SignalEngine and log the signal as of every update.
+    The last update of each candle closes it (advances the states); the others
+    only peek. Returns a RepaintLog.
+    """
+    df = updates.rename(columns=lambda col: str(col).lower())
+    n = len(df)
+    time = df['time'].values
+    asof = df['asof'].values if 'asof' in df.columns else np.arange(n)
+    is_final = np.r_[time[1:] != time[:-1], True] if n else np.empty(0, dtype=bool)
+
+    engine = SignalEngine(heiken, n_candle_lookback, range_filter, rsi, inside_bar)
+    signal = np.zeros(n, dtype=np.int8)
+    flags = {name: np.zeros(n, dtype=bool) for name in COMPONENTS}
+
+    ohlc = zip(df['open'].values, df['high'].values, df['low'].values, df['close'].values)
+    for k, candle in enumerate(ohlc):
+        row = engine.update(candle) if is_final[k] else engine.peek(candle)
+        signal[k] = row['Signal_Final']
+        for name in COMPONENTS:
+            flags[name][k] = row[name]
+
+    columns = {'asof': asof, 'time': time, 'close': df['close'].values.astype(float), 'final': is_final,
+               'Signal_Final': signal}
+    columns.update(flags)
+    return RepaintLog(columns)
@@ -1,4 +1,5 @@
 from config import *
+from module.strategy_masks import STRATEGY_COLUMNS
 
 class SignalManager:
     def __init__(self):
@@ -75,6 +76,13 @@ class SignalManager:
             
         return False
         
+    def take_trade_from_strategies(self, strategies, k_value=K):
+        """should_take_trade from a row of module/strategy_masks.evaluate_strategies"""
+        if self.waiting_for_fail and self.last_trade_result != 'loss':
+            return False
+        column = STRATEGY_COLUMNS.get(k_value)
+        return bool(strategies[column]) if column is not None else False
+
     def update_trade_result(self, result):
         """Update last trade result"""
         self.last_trade_result = result
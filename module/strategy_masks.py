@@ -0,0 +1,136 @@
+"""
+Bitmask evaluator for the SignalManager K-modes
+
+SignalManager.should_take_trade checks one candle at a time from a dict of
+booleans. Here every bar's inputs are packed into one uint16 (SIGNAL_BITS) and
+a 4096 entry table maps each possible mask to the strategies it satisfies, so
+all K-modes of a whole history are one table lookup:
+
+    K   column            rule (same as SignalManager)
+    0   strategy_all      any of the three below
+    1   strategy_rsi_ib   IB arrow allowed by the Gainzy color (long colors:
+                          buy only, short colors: sell only, others: either)
+    2   strategy_rf_ib    RF signal this bar or the previous one + IB arrow, same side
+    3   strategy_rf_rsi   RSI signal this bar or the previous one + RF signal, same side
+
+The SignalManager gate (A == 0: wait for one losing trade) depends on trade
+results, not on the candles, and stays in SignalManager.take_trade_from_strategies.
+
+Usage:
+    strategies = evaluate_strategies(df)           # df: pipeline frame with gaizy_color
+    df[STRATEGY_COLUMNS[K]]                        # the active K-mode
+"""
+
+import numpy as np
+import pandas as pd
+
+# Per-bar input bits (keys of the SignalManager signals dict)
+SIGNAL_BITS = {
+    'rf_buy': 1 << 0,
+    'rf_sell': 1 << 1,
+    'rf_buy_prev': 1 << 2,
+    'rf_sell_prev': 1 << 3,
+    'rsi_buy': 1 << 4,
+    'rsi_sell': 1 << 5,
+    'rsi_buy_prev': 1 << 6,
+    'rsi_sell_prev': 1 << 7,
+    'ib_buy': 1 << 8,
+    'ib_sell': 1 << 9,
+    'gaizy_long': 1 << 10,
+    'gaizy_short': 1 << 11,
+}
+MASK_SIZE = 1 << len(SIGNAL_BITS)
+
+# Gainzy colors SignalManager._check_rsi_ib_strategy restricts to one side
+GAIZY_LONG_COLORS = ('bright_green', 'dark_green')
+GAIZY_SHORT_COLORS = ('red', 'pink')
+
+
+def _bits(*names):
+    return sum(SIGNAL_BITS[name] for name in names)
+
+
+# Strategy -> terms (required bits, forbidden bits); a bar satisfies the
+# strategy when it satisfies any term
+STRATEGY_TERMS = {
+    'rsi_ib': [(_bits('ib_buy'), _bits('gaizy_short')), (_bits('ib_sell'), _bits('gaizy_long'))],
+    'rf_ib': [(_bits('rf_buy', 'ib_buy'), 0), (_bits('rf_sell', 'ib_sell'), 0),
+              (_bits('rf_buy_prev', 'ib_buy'), 0), (_bits('rf_sell_prev', 'ib_sell'), 0)],
+    'rf_rsi': [(_bits('rsi_buy_prev', 'rf_buy'), 0), (_bits('rsi_sell_prev', 'rf_sell'), 0),
+               (_bits('rsi_buy', 'rf_buy'), 0), (_bits('rsi_sell', 'rf_sell'), 0)],
+}
+STRATEGY_TERMS['all'] = STRATEGY_TERMS['rsi_ib'] + STRATEGY_TERMS['rf_ib'] + STRATEGY_TERMS['rf_rsi']
+
+STRATEGY_COLUMNS = {0: 'strategy_all', 1: 'strategy_rsi_ib', 2: 'strategy_rf_ib', 3: 'strategy_rf_rsi'}
+K_STRATEGIES = {0: 'all', 1: 'rsi_ib', 2: 'rf_ib', 3: 'rf_rsi'}
+
+
+def _strategy_table():
+    """uint8 per mask, bit k set when K-mode k takes the trade"""
+    masks = np.arange(MASK_SIZE)
+    table = np.zeros(MASK_SIZE, dtype=np.uint8)
+    for k, strategy in K_STRATEGIES.items():
+        hit = np.zeros(MASK_SIZE, dtype=bool)
+        for need, forbid in STRATEGY_TERMS[strategy]:
+            hit |= ((masks & need) == need) & ((masks & forbid) == 0)
+        table[hit] |= np.uint8(1 << k)
+    return table
+
+
+STRATEGY_TABLE = _strategy_table()
+
+
+def encode_signals(signals) -> int:
+    """Mask of one SignalManager signals dict (missing keys count as False)"""
+    mask = 0
+    for name, bit in SIGNAL_BITS.items():
+        if name not in ('gaizy_long', 'gaizy_short') and signals.get(name):
+            mask |= bit
+    color = signals.get('rsi_gaizy')
+    if color in GAIZY_LONG_COLORS:
+        mask |= SIGNAL_BITS['gaizy_long']
+    elif color in GAIZY_SHORT_COLORS:
+        mask |= SIGNAL_BITS['gaizy_short']
+    return mask
+
+
+def encode_signal_frame(df) -> np.ndarray:
+    """
+    uint16 masks of a signal frame: RF_BuySignal / RF_SellSignal, rsi_buy /
+    rsi_sell, GreenArrow / RedArrow (ib_buy / ib_sell) and gaizy_color; the
+    _prev bits are the previous bar's RF / RSI signals (none before the first bar).
+    """
+    def flag(column):
+        return np.asarray(df[column].values) == 1 if column in df.columns else np.zeros(len(df), dtype=bool)
+
+    def previous(values):
+        return np.r_[False, values[:-1]] if len(values) else values
+
+    flags = {
+        'rf_buy': flag('RF_BuySignal'), 'rf_sell': flag('RF_SellSignal'),
+        'rsi_buy': flag('rsi_buy'), 'rsi_sell': flag('rsi_sell'),
+        'ib_buy': flag('GreenArrow'), 'ib_sell': flag('RedArrow'),
+    }
+    for name in ('rf_buy', 'rf_sell', 'rsi_buy', 'rsi_sell'):
+        flags[name + '_prev'] = previous(flags[name])
+    if 'gaizy_color' in df.columns:
+        colors = df['gaizy_color'].values
+        flags['gaizy_long'] = np.isin(colors, GAIZY_LONG_COLORS)
+        flags['gaizy_short'] = np.isin(colors, GAIZY_SHORT_COLORS)
+
+    masks = np.zeros(len(df), dtype=np.uint16)
+    for name, values in flags.items():
+        masks |= values.astype(np.uint16) * np.uint16(SIGNAL_BITS[name])
+    return masks
+
+
+def strategy_bits(masks) -> np.ndarray:
+    """uint8 strategy bitfield (bit k = K-mode k) of every mask"""
+    return STRATEGY_TABLE[np.asarray(masks, dtype=np.intp)]
+
+
+def evaluate_strategies(df) -> pd.DataFrame:
+    """One bool column per K-mode (STRATEGY_COLUMNS) for every bar of a signal frame, same index"""
+    bits = strategy_bits(encode_signal_frame(df))
+    return pd.DataFrame({column: (bits >> k) & 1 == 1 for k, column in STRATEGY_COLUMNS.items()},
+                        index=df.index)
@@ -0,0 +1,219 @@
+"""
+Multi-timeframe candles and signals from one lower timeframe stream
+
+Every bot process polls its own interval (BYBIT_INTERVAL 15 / 60, BINANCE_INTERVAL
+15m). MultiTimeframeEngine takes ONE stream of closed 1m candles instead and
+derives any higher timeframe from it:
+
+    CandleAggregator    incremental OHLCV of one timeframe, bars aligned to the
+                        exchange boundaries (time - time % bar_length, the epoch
+                        is a boundary of every interval up to 1d)
+    SignalEngine        the streaming main.calculate_signals chain per timeframe
+                        (module/signal_history.py), advanced only when that
+                        timeframe's bar closes
+
+A bar closes when its last source candle arrives, or when the first candle of
+a later bar does (a missing minute does not hold the bar open). Candle times and
+lengths share one unit: seconds for data/*.csv, milliseconds for the exchanges
+(interval_length(..., unit=1000)).
+
+Usage:
+    engine = MultiTimeframeEngine({'15m': interval_length('15m', 1000),
+                                   '1h': interval_length('1h', 1000)}, source_length=60_000)
+    closed = engine.update(candle_1m)            # {'15m': row, ...} for the bars that closed
+    gated = engine.confirm('15m', '1h')          # 15m arrows / signal gated by the 1h RF trend
+"""
+
+import numpy as np
+import pandas as pd
+
+from module.signal_history import SignalEngine
+
+CANDLE_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+
+def interval_length(interval, unit=1):
+    """
+    Length of an interval in `unit`s of a second per time step (1 for seconds,
+    1000 for milliseconds). Accepts Binance style '1m' / '15m' / '1h' / '1d' and
+    Bybit style '1' / '15' / '60' (minutes) / 'D'.
+    """
+    interval = str(interval).strip()
+    if interval.upper() == 'D':
+        seconds = 86400
+    elif interval[-1] in 'mhd':
+        seconds = int(interval[:-1]) * {'m': 60, 'h': 3600, 'd': 86400}[interval[-1]]
+    else:
+        seconds = int(interval) * 60
+    return seconds * unit
+
+
+def _candle_values(candle):
+    """(time, open, high, low, close, volume) from a tuple / list or a dict / Series (any key case)"""
+    if isinstance(candle, (tuple, list, np.ndarray)):
+        values = [float(v) for v in candle[:6]]
+        values += [0.0] * (6 - len(values))
+        return values
+    keys = {str(key).lower(): key for key in candle.keys()}
+    return [float(candle[keys[field]]) if field in keys else 0.0 for field in CANDLE_FIELDS]
+
+
+class CandleAggregator:
+    """
+    Incremental OHLCV bars of bar_length from closed source candles
+
+    Usage:
+        agg = CandleAggregator(bar_length=900, source_length=60)
+        for bar in agg.update(candle_1m):   # bars closed by this candle (usually 0 or 1)
+            ...
+        agg.forming                          # the bar being built, None between bars
+
+    Candles older than the last one fed are ignored (REST polls overlap).
+    """
+
+    def __init__(self, bar_length, source_length=60):
+        if bar_length % source_length:
+            raise ValueError(f"bar_length {bar_length} is not a multiple of source_length {source_length}")
+        self.bar_length = bar_length
+        self.source_length = source_length
+        self.reset()
+
+    def reset(self):
+        self.forming = None
+        self.last_time = None
+
+    def _close(self):
+        bar, self.forming = self.forming, None
+        return bar
+
+    def update(self, candle):
+        """Feed one CLOSED source candle, returns the list of bars it closed"""
+        t, o, h, l, c, v = _candle_values(candle)
+        if self.last_time is not None and t <= self.last_time:
+            return []
+        self.last_time = t
+
+        closed = []
+        start = t - t % self.bar_length
+        if self.forming is not None and self.forming['time'] != start:
+            closed.append(self._close())
+        if self.forming is None:
+            self.forming = {'time': start, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v}
+        else:
+            bar = self.forming
+            bar['high'] = max(bar['high'], h)
+            bar['low'] = min(bar['low'], l)
+            bar['close'] = c
+            bar['volume'] += v
+        if t + self.source_length >= start + self.bar_length:
+            closed.append(self._close())
+        return closed
+
+
+def aggregate_candles(df, bar_length, complete_only=False, source_length=None):
+    """
+    Batch CandleAggregator: OHLCV bars of bar_length from a candle frame (any
+    column case), oldest first. complete_only drops bars whose last source
+    candle (source_length, default the smallest time step) is missing.
+    """
+    df = df.rename(columns=lambda col: str(col).lower()).sort_values('time')
+    df = df[~df['time'].duplicated()]
+    time = df['time'].values
+    start = time - time % bar_length
+    groups = df.groupby(start, sort=True)
+    bars = pd.DataFrame({
+        'time': groups['time'].first().index.values,
+        'open': groups['open'].first().values,
+        'high': groups['high'].max().values,
+        'low': groups['low'].min().values,
+        'close': groups['close'].last().values,
+    })
+    if 'volume' in df.columns:
+        bars['volume'] = groups['volume'].sum().values
+    if complete_only:
+        if source_length is None:
+            source_length = np.diff(time).min() if len(time) > 1 else bar_length
+        last = groups['time'].last().values
+        bars = bars[last + source_length >= bars['time'].values + bar_length].reset_index(drop=True)
+    return bars
+
+
+class MultiTimeframeEngine:
+    """
+    One CandleAggregator + SignalEngine per timeframe, fed by one source stream
+
+    timeframes: {name: bar_length}, engine_params: SignalEngine keyword arguments
+    (heiken, n_candle_lookback, range_filter, rsi, inside_bar), shared by all
+    timeframes.
+
+    last[name] is the signal row of the last CLOSED bar of that timeframe (the
+    SignalEngine row: Signal_Final, RF_BuySignal, ..., RF_Position, RF_Trend),
+    bars[name] the closed bars themselves (kept up to `history` per timeframe).
+    """
+
+    def __init__(self, timeframes, source_length=60, history=1000, **engine_params):
+        self.timeframes = dict(timeframes)
+        self.source_length = source_length
+        self.history = history
+        self.engine_params = engine_params
+        self.reset()
+
+    def reset(self):
+        self.aggregators = {name: CandleAggregator(length, self.source_length)
+                            for name, length in self.timeframes.items()}
+        self.engines = {name: SignalEngine(**self.engine_params) for name in self.timeframes}
+        self.last = {name: None for name in self.timeframes}
+        self.bars = {name: [] for name in self.timeframes}
+
+    def update(self, candle):
+        """Feed one CLOSED source candle, returns {name: row} of the timeframes whose bar closed"""
+        closed = {}
+        for name, aggregator in self.aggregators.items():
+            for bar in aggregator.update(candle):
+                row = self.engines[name].update(bar)
+                self.last[name] = closed[name] = dict(row, time=bar['time'])
+                bars = self.bars[name]
+                bars.append(bar)
+                if len(bars) > self.history:
+                    del bars[:len(bars) - self.history]
+        return closed
+
+    def seed(self, df):
+        """Replay a frame of closed source candles (any column case), returns self"""
+        columns = {str(col).lower(): col for col in df.columns}
+        values = [df[columns[field]].to_numpy(dtype=float) if field in columns else np.zeros(len(df))
+                  for field in CANDLE_FIELDS]
+        for candle in zip(*values):
+            self.update(candle)
+        return self
+
+    def peek(self, name):
+        """Signal row of the FORMING bar of a timeframe (None between bars), no state change"""
+        bar = self.aggregators[name].forming
+        if bar is None:
+            return None
+        return dict(self.engines[name].peek(bar), time=bar['time'])
+
+    def frame(self, name):
+        """Closed bars of a timeframe as a DataFrame"""
+        return pd.DataFrame(self.bars[name], columns=list(CANDLE_FIELDS))
+
+    def confirm(self, signal_tf, trend_tf):
+        """
+        Last closed signal_tf row gated by the trend_tf Range Filter position:
+        long side (GreenArrow, positive Signal_Final) only while trend_tf is
+        long (RF_Position 1), short side only while it is short (-1).
+        None until both timeframes have a closed bar.
+        """
+        row, trend = self.last[signal_tf], self.last[trend_tf]
+        if row is None or trend is None:
+            return None
+        position = trend['RF_Position']
+        signal = row['Signal_Final']
+        return {
+            'time': row['time'],
+            'trend': position,
+            'GreenArrow': bool(row['GreenArrow']) and position == 1,
+            'RedArrow': bool(row['RedArrow']) and position == -1,
+            'Signal_Final': signal if (signal > 0 and position == 1) or (signal < 0 and position == -1) else 0,
+        }
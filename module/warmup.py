@@ -0,0 +1,153 @@
+"""
+Minimum lookback (warmup) of the signal pipeline
+
+The recursive filters forget their starting point geometrically: after k bars
+an EMA with smoothing factor alpha keeps (1 - alpha)^k of its initial state. For
+a tolerance tol the bars needed are
+
+    k = ceil(log(tol) / log(1 - alpha))
+
+and filters in series add up (the second one starts forgetting once the first
+one is within tol). The components of main.calculate_signals:
+
+    Heiken-Ashi HA_Open       alpha = 1/2
+    Range Filter              range EMA alpha = 2/(range_period+1), smoothing EMA
+                              alpha = 2/(smooth_period+1), averaged filter alpha =
+                              2/(average_samples+1) (per filter change, counted as bars)
+    RSI buy/sell (Wilder)     rsi_length bars of SMA seed + alpha = 1/rsi_length, +1 bar for rsi[1]
+    Inside bar box            path dependent, INSIDE_BAR_WARMUP measured on the repo candles
+    Gainzy colors (optional)  two confirmed pivots each side: 2 * (2 * pivot_length + 1)
+    Signal_Final              n_candle_lookback + 1 bars of RF / arrow / RSI edges
+
+The inside bar box has no decay to bound: its barIndex counter keeps growing
+through an inside bar sequence, so the box (and GreenArrow / RedArrow) depends
+on where the window starts for as long as the sequence lasts (one sequence of
+data/ETHUSD.csv runs for over a thousand Heiken-Ashi bars). Its term is
+therefore measured, not derived: calibrate_warmup finds the smallest window
+whose signals match the live (200 candle) window on every candle of a data
+set, and INSIDE_BAR_WARMUP is the term that makes warmup_bars() equal that
+window on data/ETHUSD.csv (197 bars at the defaults, 167 from the filters
+alone). Other symbols / intervals may need more, run calibrate_warmup on
+their candles. The Range Filter's raw filter and CondIni are path dependent
+too (a ratchet and a carried position); verify_warmup measures how often a
+window of a given size gives the live signal.
+"""
+
+import math
+
+import numpy as np
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+
+# inside bar box term, calibrate_warmup(data/ETHUSD.csv) = 197 = 10 (Heiken-Ashi) + 180 + 6 + 1
+INSIDE_BAR_WARMUP = 180
+SIGNAL_COLUMNS = ['Signal_Final', 'RF_BuySignal', 'RF_SellSignal', 'GreenArrow', 'RedArrow', 'rsi_buy', 'rsi_sell']
+
+
+def ema_warmup(alpha: float, tolerance: float = 1e-3) -> int:
+    """Bars after which an EMA keeps less than `tolerance` of its initial state"""
+    if alpha >= 1:
+        return 0
+    return int(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)))
+
+
+def warmup_components(tolerance: float = 1e-3, heiken: bool = True, range_period: int = 14,
+                      smooth_range: bool = True, smooth_period: int = 27, average_filter: bool = True,
+                      average_samples: int = 2, rsi_length: int = 14, pivot_length: int = None,
+                      n_candle_lookback: int = 5, inside_bar_bars: int = INSIDE_BAR_WARMUP) -> dict:
+    """Warmup bars of every component, see the module docstring"""
+    range_filter = ema_warmup(2.0 / (range_period + 1), tolerance)
+    if smooth_range:
+        range_filter += ema_warmup(2.0 / (smooth_period + 1), tolerance)
+    if average_filter:
+        range_filter += ema_warmup(2.0 / (average_samples + 1), tolerance)
+
+    components = {
+        'heiken_ashi': ema_warmup(0.5, tolerance) if heiken else 0,
+        'range_filter': range_filter,
+        'rsi': rsi_length + ema_warmup(1.0 / rsi_length, tolerance) + 1,
+        'inside_bar': inside_bar_bars,
+        'signal_final': n_candle_lookback + 1,
+    }
+    if pivot_length is not None:
+        components['gainzy'] = 2 * (2 * pivot_length + 1)
+    return components
+
+
+def warmup_bars(tolerance: float = 1e-3, output_bars: int = 2, **params) -> int:
+    """
+    Smallest number of candles to compute so that the last `output_bars` rows
+    are within tolerance of an unlimited history. params: warmup_components.
+    """
+    c = warmup_components(tolerance, **params)
+    indicators = max(value for name, value in c.items() if name not in ('heiken_ashi', 'signal_final'))
+    return c['heiken_ashi'] + indicators + c['signal_final'] + output_bars - 1
+
+
+def _compare_columns(columns):
+    """SIGNAL_COLUMNS produced by a pipeline column list"""
+    return [col for col in SIGNAL_COLUMNS if col in [c if isinstance(c, str) else c[0] for c in columns]]
+
+
+def verify_warmup(df, bars: int, reference_bars: int = 200, output_bars: int = 2, step: int = 1,
+                  columns=None, heiken: bool = True, **pipeline_params) -> dict:
+    """
+    Slide over df and compare the last `output_bars` rows of a `bars` window with
+    those of a `reference_bars` window ending on the same candle.
+
+    Returns {'windows', 'mismatches', 'match_rate', 'max_filter_error'}; a window
+    mismatches when any of the signal columns differs, max_filter_error is the
+    largest RF_Filter difference relative to the close.
+    """
+    columns = columns if columns is not None else MAIN_SIGNAL_COLUMNS
+    pipeline = signal_pipeline(heiken=heiken, **pipeline_params)
+    compare = _compare_columns(columns)
+
+    windows = mismatches = 0
+    max_filter_error = 0.0
+    for end in range(max(bars, reference_bars), len(df) + 1, step):
+        reference = pipeline.run(df.iloc[end - reference_bars:end], columns).iloc[-output_bars:]
+        candidate = pipeline.run(df.iloc[end - bars:end], columns).iloc[-output_bars:]
+        windows += 1
+        mismatches += int((reference[compare].values != candidate[compare].values).any())
+        if 'RF_Filter' in reference.columns:
+            error = np.abs(reference['RF_Filter'].values - candidate['RF_Filter'].values) / reference['close'].values
+            max_filter_error = max(max_filter_error, float(error.max()))
+
+    return {
+        'windows': windows,
+        'mismatches': mismatches,
+        'match_rate': 1.0 - mismatches / windows if windows else float('nan'),
+        'max_filter_error': max_filter_error,
+    }
+
+
+def calibrate_warmup(df, reference_bars: int = 200, output_bars: int = 2, step: int = 1, start: int = None,
+                     columns=None, heiken: bool = True, **pipeline_params) -> int:
+    """
+    Smallest window (>= start, default the filter-only warmup_bars) whose last
+    `output_bars` signal rows match the `reference_bars` window at every
+    sampled candle of df, i.e. verify_warmup(df, bars) has no mismatch.
+
+    The reference rows are computed once and the candles that failed at the
+    previous size are retried first, so the scan costs about two passes over df.
+    """
+    columns = columns if columns is not None else MAIN_SIGNAL_COLUMNS
+    pipeline = signal_pipeline(heiken=heiken, **pipeline_params)
+    compare = _compare_columns(columns)
+    ends = range(reference_bars, len(df) + 1, step)
+    reference = {end: pipeline.run(df.iloc[end - reference_bars:end], columns)[compare].values[-output_bars:]
+                 for end in ends}
+
+    def mismatching(bars, candidates):
+        return [end for end in candidates
+                if (pipeline.run(df.iloc[end - bars:end], columns)[compare].values[-output_bars:]
+                    != reference[end]).any()]
+
+    bars = start if start is not None else warmup_bars(output_bars=output_bars, heiken=heiken, inside_bar_bars=1)
+    failing = mismatching(bars, ends)
+    while failing:
+        # the reference window itself always matches, so this stops at reference_bars at the latest
+        bars += 1
+        failing = mismatching(bars, failing) or mismatching(bars, ends)
+    return bars
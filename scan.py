@@ -0,0 +1,65 @@
+"""
+Multi-symbol scanner: main.calculate_signals over SCAN_SYMBOLS at every candle close
+
+    python scan.py            # scan after every BYBIT_INTERVAL candle close
+    python scan.py once       # one scan now
+
+Candles come from Bybit (SCAN_CATEGORY, BYBIT_INTERVAL), the signals are computed
+across SCAN_PROCESSES worker processes (module/scanner.py). The ranked table is
+printed and written to Scan_Final.csv; the firing symbols are on top.
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from config import *
+from bybit_client import BybitClient
+from module.scanner import scan_symbols, fetch_candles
+from module.warmup import warmup_bars
+from module.timeframes import interval_length
+from my_logger import get_logger
+
+logger = get_logger("scan")
+
+N_CANDLE_LOOKBACK = 5
+SCAN_KLINE_LIMIT = 200 if KLINE_FETCH_MODE == "fixed" else warmup_bars(
+    SIGNAL_WARMUP_TOLERANCE, output_bars=2, heiken=int(MASTER_HEIKEN_CHOICE)==1, n_candle_lookback=N_CANDLE_LOOKBACK)
+
+
+def scan_once(client):
+    start = time.time()
+    frames = fetch_candles(SCAN_SYMBOLS, lambda symbol: client.get_klines(
+        symbol=symbol, category=SCAN_CATEGORY, interval=BYBIT_INTERVAL, limit=SCAN_KLINE_LIMIT))
+    fetched = time.time()
+    table = scan_symbols(frames, processes=SCAN_PROCESSES, heiken=int(MASTER_HEIKEN_CHOICE)==1,
+                         n_candle_lookback=N_CANDLE_LOOKBACK)
+    table['Timestamp'] = pd.to_datetime(table['time'], unit='ms')
+    table.to_csv('Scan_Final.csv', index=False)
+
+    firing = table[table['Signal_Final'] != 0]
+    logger.info(f"Scanned {len(table)}/{len(SCAN_SYMBOLS)} symbols: fetch {fetched - start:.2f}s, "
+                f"signals {time.time() - fetched:.2f}s, firing {list(firing['symbol'])}")
+    print(table.to_string(index=False))
+    return table
+
+
+def seconds_to_next_close(interval_seconds):
+    return interval_seconds - time.time() % interval_seconds
+
+
+if __name__ == "__main__":
+    client = BybitClient()
+    if len(sys.argv) > 1 and sys.argv[1] == "once":
+        scan_once(client)
+        sys.exit(0)
+
+    interval_seconds = interval_length(BYBIT_INTERVAL)
+    while True:
+        # a couple of seconds after the close so the exchange has the new candle
+        time.sleep(seconds_to_next_close(interval_seconds) + 2)
+        try:
+            scan_once(client)
+        except Exception as e:
+            print(f"Error occured in the scan : {e}")
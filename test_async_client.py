@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Asyncio client layer (module/async_client.py): the DeltaOrderPath reads run
+concurrently, results keep their order, errors and signing are the sync
+methods' own, and the sync facade works from plain code
+"""
+
+import sys
+import os
+import asyncio
+import hashlib
+import hmac
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.async_client import AsyncClient, DeltaOrderPath, run_sync
+
+DELAY = 0.2
+
+
+class FakeBroker:
+    """DeltaBroker's order path methods, each one a DELAY long blocking call"""
+
+    def __init__(self):
+        self.api_secret = "secret"
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _call(self, name, result):
+        with self.lock:
+            self.calls.append(name)
+        time.sleep(DELAY)
+        return result
+
+    def generate_signature(self, secret, message):
+        return hmac.new(bytes(secret, 'utf-8'), bytes(message, 'utf-8'), hashlib.sha256).hexdigest()
+
+    def set_leverage(self, leverage):
+        return self._call('set_leverage', True)
+
+    def get_usd_balance(self):
+        return self._call('get_usd_balance', '1000.5')
+
+    def get_market_price(self):
+        return self._call('get_market_price', 2500.0)
+
+    def get_order_status(self, order_id):
+        if order_id is None:
+            raise KeyError('order_id')
+        return self._call('get_order_status', {'result': {'id': order_id, 'state': 'open'}})
+
+
+def test_entry_snapshot_concurrent():
+    broker = FakeBroker()
+    orders = DeltaOrderPath(broker)
+    start = time.perf_counter()
+    assert orders.entry_snapshot_sync(10) == (True, '1000.5', 2500.0)
+    elapsed = time.perf_counter() - start
+    # leverage first, then the two reads together
+    assert broker.calls[0] == 'set_leverage'
+    assert sorted(broker.calls[1:]) == ['get_market_price', 'get_usd_balance']
+    assert elapsed < 3 * DELAY, elapsed
+    print(f"  entry snapshot in {elapsed:.2f}s (sequential {3 * DELAY:.1f}s) OK")
+
+
+def test_entry_snapshot_failed_leverage():
+    broker = FakeBroker()
+    broker.set_leverage = lambda leverage: broker._call('set_leverage', False)
+    orders = DeltaOrderPath(broker)
+    assert orders.entry_snapshot_sync(10) == (False, None, None)
+    assert broker.calls == ['set_leverage']
+    print("  failed leverage skips the reads OK")
+
+
+def test_bracket_states():
+    broker = FakeBroker()
+    orders = DeltaOrderPath(broker)
+    start = time.perf_counter()
+    tp, sl = orders.bracket_states_sync(11, 22)
+    assert time.perf_counter() - start < 2 * DELAY
+    assert tp['result']['id'] == 11 and sl['result']['id'] == 22
+    try:
+        orders.bracket_states_sync(11, None)
+        raise AssertionError("the sync method's error was swallowed")
+    except KeyError:
+        pass
+    print("  bracket states OK")
+
+
+def test_async_client_passthrough():
+    broker = FakeBroker()
+    client = AsyncClient(broker)
+    assert client.api_secret == "secret"
+    message = "GET" + "1700000000" + "/v2/positions" + "?product_id=3136"
+
+    async def sign_and_read():
+        signature, price = await asyncio.gather(client.generate_signature("secret", message),
+                                                client.get_market_price())
+        return signature, price
+
+    signature, price = run_sync(sign_and_read())
+    assert signature == broker.generate_signature("secret", message)
+    assert price == 2500.0
+    print("  attribute / signature passthrough OK")
+
+
+if __name__ == "__main__":
+    test_entry_snapshot_concurrent()
+    test_entry_snapshot_failed_leverage()
+    test_bracket_states()
+    test_async_client_passthrough()
+    print("ALL ASYNC CLIENT TESTS PASSED")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+On-disk candle archive (module/candle_archive.py) against a replayed exchange:
+round trip, append / merge writes, gap detection and a backfill that fetches
+only the missing ranges
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.candle_archive import CandleArchive, records_frame
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+FIELDS = ['time', 'open', 'high', 'low', 'close', 'volume']
+STEP = 300_000
+
+
+class FakeExchange:
+    """data/ETHUSD.csv (5m) as a range fetch_range(start, end), times in ms, max 1000 candles a request"""
+
+    def __init__(self):
+        df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+        df['time'] = df['time'] * 1000
+        self.candles = df[FIELDS].astype({'volume': float})
+        self.requests = []
+
+    def fetch_range(self, start, end):
+        self.requests.append((start, end))
+        times = self.candles['time']
+        return self.candles[(times >= start) & (times <= end)].head(1000).reset_index(drop=True)
+
+
+def assert_same(df, expected):
+    np.testing.assert_array_equal(df['time'].values, expected['time'].values)
+    for field in FIELDS[1:]:
+        np.testing.assert_array_equal(df[field].values, expected[field].values.astype(float))
+
+
+def test_write_and_read():
+    exchange = FakeExchange()
+    candles = exchange.candles
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSD', '5')
+        assert series.write(candles.iloc[:1000]) == 1000
+        # overlapping download: only the newer candles are appended
+        assert series.write(candles.iloc[900:1500]) == 500
+        assert series.write(candles.iloc[:1500]) == 0
+        assert len(series) == 1500
+        assert_same(series.read(), candles.iloc[:1500])
+
+        start, end = candles['time'].iloc[100], candles['time'].iloc[200]
+        df = series.read(start, end)
+        assert_same(df, candles.iloc[100:200])
+        assert df['Timestamp'].iloc[0] == pd.Timestamp(int(start), unit='ms')
+        assert series.bounds() == (candles['time'].iloc[0], candles['time'].iloc[1499])
+
+        # a reopened archive sees the same file
+        assert_same(CandleArchive(root).series('bybit', 'ETHUSD', '5').read(start, end), candles.iloc[100:200])
+    print("  write / read round trip OK")
+
+
+def test_forming_candle_not_archived():
+    exchange = FakeExchange()
+    candles = exchange.candles.iloc[:100]
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSD', '5')
+        now = candles['time'].iloc[-1] + STEP // 2
+        assert series.write(candles, now=now) == 99
+        assert series.read()['time'].iloc[-1] == candles['time'].iloc[-2]
+    print("  forming candle not archived OK")
+
+
+def test_gaps_and_merge():
+    exchange = FakeExchange()
+    candles = exchange.candles
+    holes = candles.drop(index=list(range(300, 350)) + [700])
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSD', '5')
+        series.write(holes.iloc[:900])
+        start, end = candles['time'].iloc[0], candles['time'].iloc[1000]
+        assert series.gaps(start, end) == [
+            (candles['time'].iloc[300], candles['time'].iloc[350]),
+            (candles['time'].iloc[700], candles['time'].iloc[701]),
+            (candles['time'].iloc[951], candles['time'].iloc[1000]),
+        ]
+        # filling a hole inside the stored range rewrites the file in order
+        assert series.write(candles.iloc[300:350]) == 50
+        assert series.write(candles.iloc[695:705]) == 1
+        assert_same(series.read(), candles.iloc[:951])
+        assert series.gaps(start, candles['time'].iloc[951]) == []
+    print("  gap detection / merge OK")
+
+
+def test_backfill_only_missing():
+    exchange = FakeExchange()
+    candles = exchange.candles
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSD', '5')
+        series.write(candles.iloc[1000:1200])
+        start, end = candles['time'].iloc[0], candles['time'].iloc[2500]
+        stored = series.backfill(exchange.fetch_range, start, end)
+        assert stored == 2300
+        assert_same(series.read(start, end), candles.iloc[:2500])
+        # 1000 before in one request, 1300 after in two pages
+        assert exchange.requests == [
+            (candles['time'].iloc[0], candles['time'].iloc[1000] - 1),
+            (candles['time'].iloc[1200], candles['time'].iloc[2200] - 1),
+            (candles['time'].iloc[2200], candles['time'].iloc[2500] - 1),
+        ]
+        exchange.requests.clear()
+        assert series.backfill(exchange.fetch_range, start, end) == 0
+        assert exchange.requests == []
+
+        # a range the exchange has no candles for is fetched once
+        before = candles['time'].iloc[0] - 100 * STEP
+        assert series.backfill(exchange.fetch_range, before, start) == 0
+        assert len(exchange.requests) == 1
+        assert series.backfill(exchange.fetch_range, before, start) == 0
+        assert len(exchange.requests) == 1
+    print("  backfill of the missing ranges only OK")
+
+
+def test_load_and_records():
+    exchange = FakeExchange()
+    candles = exchange.candles
+    records = candles.iloc[:50].values.tolist()
+    with tempfile.TemporaryDirectory() as root:
+        archive = CandleArchive(root)
+        archive.series('dhan', 'nifty', '5').write(records_frame(records))
+        assert len(archive.series('dhan', 'NIFTY', '5')) == 50
+
+        start, end = candles['time'].iloc[10], candles['time'].iloc[60]
+        df = archive.load('bybit', 'ETHUSD', '5', start, end, fetch_range=exchange.fetch_range)
+        assert_same(df, candles.iloc[10:60])
+        assert os.path.exists(os.path.join(root, 'bybit', 'ETHUSD', '5.candles'))
+    print("  load / records_frame OK")
+
+
+if __name__ == "__main__":
+    test_write_and_read()
+    test_forming_candle_not_archived()
+    test_gaps_and_merge()
+    test_backfill_only_missing()
+    test_load_and_records()
+    print("ALL CANDLE ARCHIVE TESTS PASSED")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Live candle store (module/candle_store.py) driven by a replayed exchange: the
+window served from memory equals the REST klines, through forming updates,
+rolls, gaps and a reconnect
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.candle_store import LiveCandleStore
+from module.candle_archive import CandleArchive
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+FIELDS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+
+class FakeExchange:
+    """data/ETHUSD.csv (5m) as a Bybit exchange whose last `cursor` candles are out, times in ms"""
+
+    def __init__(self, cursor=400):
+        df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+        df['time'] = df['time'] * 1000
+        self.candles = df[FIELDS].astype({'volume': float})
+        self.cursor = cursor
+        self.requests = 0
+        self.range_requests = []
+
+    def get_klines(self, limit):
+        self.requests += 1
+        return self.candles.iloc[max(0, self.cursor - limit):self.cursor].reset_index(drop=True)
+
+    def get_range(self, start, end):
+        self.range_requests.append((start, end))
+        candles = self.candles.iloc[:self.cursor]
+        return candles[(candles['time'] >= start) & (candles['time'] <= end)].reset_index(drop=True)
+
+    def message(self, k, close=None, confirm=False):
+        candle = self.candles.iloc[k]
+        return json.dumps({'topic': 'kline.5.ETHUSD', 'type': 'snapshot', 'data': [{
+            'start': int(candle['time']), 'end': int(candle['time']) + 299999, 'interval': '5',
+            'open': str(candle['open']), 'high': str(candle['high']), 'low': str(candle['low']),
+            'close': str(candle['close'] if close is None else close), 'volume': str(candle['volume']),
+            'turnover': '0', 'confirm': confirm, 'timestamp': int(candle['time']) + 1000}]})
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def new_store(exchange, capacity=200):
+    store = LiveCandleStore(symbol='ETHUSD', interval='5', capacity=capacity, rest_fetch=exchange.get_klines)
+    store.seed()
+    return store
+
+
+def assert_window(store, exchange, n=None):
+    expected = exchange.get_klines(n or store.capacity)
+    got = store.frame(n)
+    assert np.array_equal(got['time'].values, expected['time'].values.astype(np.int64))
+    for col in FIELDS[1:]:
+        assert np.array_equal(got[col].values, expected[col].values), col
+
+
+def test_seed_serves_rest_window():
+    exchange = FakeExchange()
+    store = new_store(exchange)
+    assert_window(store, exchange)
+    assert_window(store, exchange, 50)
+    assert store.last_close() == exchange.candles['close'].iloc[exchange.cursor - 1]
+    assert list(store.frame(3).columns) == FIELDS + ['Timestamp']
+    assert not store.is_live()
+
+
+def test_forming_updates_and_rolls():
+    exchange = FakeExchange()
+    store = new_store(exchange)
+    requests = exchange.requests
+    for k in range(exchange.cursor, exchange.cursor + 700):
+        # a couple of intrabar updates of the next candle, then the confirmed one
+        store.handle_message(exchange.message(k, close=exchange.candles['close'].iloc[k] - 1.5))
+        assert store.last_close() == exchange.candles['close'].iloc[k] - 1.5
+        store.handle_message(exchange.message(k, confirm=True))
+        exchange.cursor = k + 1
+        assert store.count == store.capacity
+    assert exchange.requests == requests   # no REST after the seed
+    assert_window(store, exchange)
+    store.connected = True
+    assert store.is_live()
+
+
+def test_gap_is_backfilled():
+    exchange = FakeExchange()
+    store = new_store(exchange)
+    exchange.cursor += 5
+    # messages for the 4 candles in between were lost
+    store.handle_message(exchange.message(exchange.cursor - 1))
+    assert store.backfills == 1
+    assert_window(store, exchange)
+    assert np.all(np.diff(store.arrays()['time']) == 300_000)
+
+
+def test_reconnect_resubscribes_and_backfills():
+    exchange = FakeExchange()
+    store = new_store(exchange)
+    socket = FakeSocket()
+    store._on_open(socket)
+    assert socket.sent == [{'op': 'subscribe', 'args': ['kline.5.ETHUSD']}]
+    store._on_close(socket, None, None)
+    assert not store.is_live()
+    exchange.cursor += 30
+    store._on_open(socket)
+    assert store.connected
+    assert_window(store, exchange)
+    store.handle_message({'topic': 'kline.15.ETHUSD', 'data': []})   # other topics are ignored
+    assert_window(store, exchange)
+
+
+def test_seed_from_archive():
+    exchange = FakeExchange()
+    with tempfile.TemporaryDirectory() as root:
+        series = CandleArchive(root).series('bybit', 'ETHUSD', '5')
+
+        def archived_store():
+            store = LiveCandleStore(symbol='ETHUSD', interval='5', capacity=200, rest_fetch=exchange.get_klines,
+                                    archive=series, range_fetch=exchange.get_range)
+            store.seed()
+            return store
+
+        # first start: the whole window is downloaded once and archived
+        assert_window(archived_store(), exchange)
+        assert len(exchange.range_requests) == 1 and len(series) == 199
+
+        # restart 3 candles later: only those come from the exchange
+        exchange.cursor += 3
+        exchange.range_requests.clear()
+        store = archived_store()
+        assert_window(store, exchange)
+        assert exchange.range_requests == [(exchange.candles['time'].iloc[exchange.cursor - 4],
+                                            exchange.candles['time'].iloc[exchange.cursor - 1] - 1)]
+        assert len(series) == 202
+    print("  seed from the candle archive OK")
+
+
+def test_start_survives_failed_seed():
+    exchange = FakeExchange()
+    down = {'rest': True}
+
+    def rest_fetch(limit):
+        if down['rest']:
+            raise ConnectionError("exchange unreachable")
+        return exchange.get_klines(limit)
+
+    store = LiveCandleStore(symbol='ETHUSD', interval='5', capacity=200, rest_fetch=rest_fetch)
+    opened = []
+    store._run = lambda: opened.append(True)   # no real websocket
+    store.start()
+    store.thread.join()
+    store.stop()
+    assert opened and store.count == 0 and not store.is_live()
+
+    # the first (re)open seeds the empty window
+    down['rest'] = False
+    store._on_open(FakeSocket())
+    assert store.connected
+    assert_window(store, exchange)
+
+
+if __name__ == "__main__":
+    test_seed_serves_rest_window()
+    test_forming_updates_and_rolls()
+    test_gap_is_backfilled()
+    test_reconnect_resubscribes_and_backfills()
+    test_seed_from_archive()
+    test_start_survives_failed_seed()
+    print("ALL CANDLE STORE TESTS PASSED")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compact signal frames (module/compact.py): the packed / narrowed frame expands
+back to the pipeline frame and takes a fraction of its memory
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.compact import (compact_signal_frame, expand_signal_frame, pack_signal_flags,
+                            unpack_signal_flags, fits_float32, frame_memory, SIGNAL_FLAGS,
+                            FLAGS_COLUMN)
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS, IMPORTANT_SIGNAL_COLUMNS
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def signal_frame(columns, n=1000):
+    klines = pd.read_csv(DATA_FILE).sort_values('time').tail(n).reset_index(drop=True)
+    return signal_pipeline(heiken=True).run(klines, columns)
+
+
+def assert_round_trip(frame, tolerance=1e-3):
+    compact = compact_signal_frame(frame)
+    expanded = expand_signal_frame(compact)
+    assert list(expanded.columns) == list(frame.columns)
+    for col in frame.columns:
+        expected, actual = frame[col].values, expanded[col].values
+        if expected.dtype.kind == 'f':
+            assert np.allclose(actual, expected, rtol=0, atol=tolerance, equal_nan=True), col
+        else:
+            assert pd.Series(actual).equals(pd.Series(expected)), col
+            assert actual.dtype.kind == expected.dtype.kind, col
+    return compact
+
+
+def test_flag_bits_round_trip():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({name: rng.integers(0, 2, 500).astype(bool) for name in SIGNAL_FLAGS})
+    flags = pack_signal_flags(df)
+    assert flags.dtype == np.uint8 and flags.max() < 64
+    for name, values in unpack_signal_flags(flags).items():
+        assert np.array_equal(values == 1, df[name].values), name
+
+
+def test_main_frame_round_trip():
+    frame = signal_frame(MAIN_SIGNAL_COLUMNS)
+    compact = assert_round_trip(frame)
+    assert FLAGS_COLUMN in compact.columns and not set(SIGNAL_FLAGS) & set(compact.columns)
+    assert compact['close'].dtype == np.float32 and compact['Signal_Final'].dtype == np.int8
+    assert (compact['Signal_Final'] != 0).any()
+    assert frame_memory(compact) < frame_memory(frame) / 2
+
+
+def test_gainzy_and_bar_colors():
+    frame = signal_frame(IMPORTANT_SIGNAL_COLUMNS)
+    frame['BarColor'] = np.array(['orange' if arrow else np.nan for arrow in frame['GreenArrow']], dtype=object)
+    compact = assert_round_trip(frame)
+    assert compact['gaizy_color'].dtype == np.int8 and compact['BarColor'].dtype == np.uint8
+    assert frame['gaizy_color'].nunique() == compact['gaizy_color'].nunique() > 1
+
+
+def test_prices_stay_float64_without_precision():
+    assert fits_float32(np.array([3012.35, 2999.05, np.nan]))
+    assert not fits_float32(np.array([104321.37]))
+    frame = pd.DataFrame({'close': [104321.37, 104322.41], 'Signal_Final': [0, 2]})
+    compact = compact_signal_frame(frame)
+    assert compact['close'].dtype == np.float64
+    assert np.array_equal(compact['close'].values, frame['close'].values)
+
+
+if __name__ == "__main__":
+    test_flag_bits_round_trip()
+    test_main_frame_round_trip()
+    test_gainzy_and_bar_colors()
+    test_prices_stay_float64_without_precision()
+    print("ALL COMPACT FRAME TESTS PASSED")
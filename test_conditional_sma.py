@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Parity of the ring-buffer conditional SMA / standard deviation with the old
+list + pop(0) + np.mean implementation on data/ETHUSD_Indicator_main.csv
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rf import RangeFilter, RollingWindow
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD_Indicator_main.csv')
+
+
+def old_conditional_sma(values, condition, period):
+    """RangeFilter.conditional_sma before the ring buffer"""
+    result = np.full_like(values, np.nan, dtype=float)
+    vals_array = []
+    for i in range(len(values)):
+        if condition[i] and not np.isnan(values[i]):
+            vals_array.append(values[i])
+            if len(vals_array) > period:
+                vals_array.pop(0)
+        if len(vals_array) > 0:
+            result[i] = np.mean(vals_array)
+    return result
+
+
+def old_standard_deviation(values, period):
+    """RangeFilter.standard_deviation before the ring buffer"""
+    condition = np.ones_like(values, dtype=bool)
+    mean_sq = old_conditional_sma(values**2, condition, period)
+    mean_val = old_conditional_sma(values, condition, period)
+    variance = mean_sq - mean_val**2
+    std_dev = np.sqrt(np.maximum(variance, 0))
+    return np.where(np.isnan(std_dev), 0, std_dev)
+
+
+def load_close():
+    df = pd.read_csv(DATA_FILE, index_col=0)
+    return df['close'].values.astype(float)
+
+
+def test_conditional_sma_matches_old():
+    rf = RangeFilter()
+    close = load_close()
+    close[[5, 6, 400, 2500]] = np.nan
+    condition = np.ones(len(close), dtype=bool)
+    condition[::3] = False
+    condition[:10] = False
+
+    for period in (1, 2, 14, 27, 100):
+        expected = old_conditional_sma(close, condition, period)
+        actual = rf.conditional_sma(close, condition, period)
+        assert np.array_equal(np.isnan(expected), np.isnan(actual))
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_standard_deviation_matches_old():
+    rf = RangeFilter()
+    close = load_close()
+    for period in (2, 14, 50):
+        expected = old_standard_deviation(close, period)
+        actual = rf.standard_deviation(close, period)
+        # the old SMA(x^2) - SMA(x)^2 leaves ~1e-9 of cancellation noise in the variance at
+        # ETH prices, which shows up as ~1e-5 after the sqrt on flat windows
+        np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-4)
+
+
+def test_run_filter_standard_deviation_signals_unchanged():
+    df = pd.read_csv(DATA_FILE, index_col=0)
+    df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+
+    new = RangeFilter().run_filter(df, range_scale="Standard Deviation")
+
+    old_rf = RangeFilter()
+    old_rf.conditional_sma = old_conditional_sma
+    old_rf.standard_deviation = old_standard_deviation
+    old = old_rf.run_filter(df, range_scale="Standard Deviation")
+
+    for col in ('RF_BuySignal', 'RF_SellSignal', 'RF_Trend', 'RF_Position'):
+        assert np.array_equal(new[col].values, old[col].values), col
+    np.testing.assert_allclose(new['RF_Filter'].values, old['RF_Filter'].values, rtol=1e-10)
+
+
+def test_rolling_window_stays_exact_on_long_history():
+    rng = np.random.default_rng(7)
+    values = 3000 + np.cumsum(rng.normal(0, 2, 20000))
+    window = RollingWindow(14)
+    for i, value in enumerate(values):
+        window.push(value)
+        if i % 997 == 0 or i == len(values) - 1:
+            exact = values[max(0, i - 13):i + 1]
+            assert abs(window.mean - exact.mean()) < 1e-9
+            assert abs(window.variance - exact.var()) < 1e-7
+
+
+if __name__ == "__main__":
+    test_conditional_sma_matches_old()
+    test_standard_deviation_matches_old()
+    test_run_filter_standard_deviation_signals_unchanged()
+    test_rolling_window_stays_exact_on_long_history()
+    print("ALL CONDITIONAL SMA TESTS PASSED")
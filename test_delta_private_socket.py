@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Delta private websocket book (utils/websocket_data_delta.DeltaPrivateSocket)
+driven by replayed messages: auth / subscribe handshake, snapshots, order and
+position pushes, liveness and the early wake-up of wait_for_event
+"""
+
+import sys
+import os
+import hashlib
+import hmac
+import json
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.websocket_data_delta import DeltaPrivateSocket
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def bracket_order(order_id, state='pending', stop_order_type='stop_loss_order'):
+    return {'id': order_id, 'product_symbol': 'ETHUSD', 'state': state, 'size': 1, 'unfilled_size': 1,
+            'side': 'sell', 'stop_order_type': stop_order_type}
+
+
+def live_socket():
+    socket = DeltaPrivateSocket("key", "secret", symbols=["ETHUSD"])
+    socket.ws = FakeSocket()
+    socket._on_open(socket.ws)
+    socket.handle_message(json.dumps({'type': 'key-auth', 'success': True, 'status': 'authenticated'}))
+    socket.handle_message({'type': 'orders', 'action': 'snapshot',
+                           'result': [bracket_order(11, stop_order_type='take_profit_order'), bracket_order(22)]})
+    socket.handle_message({'type': 'positions', 'action': 'snapshot',
+                           'result': [{'product_symbol': 'ETHUSD', 'size': 1, 'entry_price': '2500'}]})
+    return socket
+
+
+def test_handshake():
+    socket = DeltaPrivateSocket("key", "secret", symbols=["ETHUSD"])
+    socket.ws = FakeSocket()
+    socket._on_open(socket.ws)
+    auth = socket.ws.sent[0]
+    assert auth['type'] == 'key-auth'
+    timestamp = auth['payload']['timestamp']
+    # DeltaBroker.generate_signature of GET + timestamp + /live
+    expected = hmac.new(b"secret", bytes("GET" + timestamp + "/live", 'utf-8'), hashlib.sha256).hexdigest()
+    assert auth['payload'] == {'api-key': 'key', 'signature': expected, 'timestamp': timestamp}
+    assert socket.ws.sent[1] == {'type': 'enable_heartbeat'}
+
+    assert not socket.is_live()
+    socket.handle_message({'type': 'key-auth', 'success': True})
+    channels = socket.ws.sent[2]['payload']['channels']
+    assert [c['name'] for c in channels] == ['orders', 'positions']
+    assert all(c['symbols'] == ['ETHUSD'] for c in channels)
+    # not live until both snapshots arrived
+    socket.handle_message({'type': 'orders', 'action': 'snapshot', 'result': []})
+    assert not socket.is_live()
+    socket.handle_message({'type': 'positions', 'action': 'snapshot', 'result': []})
+    assert socket.is_live()
+    # no position in the snapshot: unknown, the broker asks REST
+    assert socket.position_size('ETHUSD') is None
+    print("  auth / subscribe / snapshots OK")
+
+
+def test_order_and_position_pushes():
+    socket = live_socket()
+    assert socket.order_status(11)['result']['state'] == 'pending'
+    assert socket.order_status(33) is None
+    assert socket.position_size('ETHUSD') == 1
+
+    # take profit triggers and fills: update, then delete with the final state
+    socket.handle_message({'type': 'orders', 'action': 'update', **bracket_order(11, state='open')})
+    assert socket.order_status(11)['result']['state'] == 'open'
+    socket.handle_message({'type': 'orders', 'action': 'delete', 'reason': 'fill',
+                           **bracket_order(11, state='closed', stop_order_type='take_profit_order'),
+                           'unfilled_size': 0})
+    status = socket.order_status(11)
+    assert status == {'success': True, 'result': dict(status['result'])}
+    assert status['result']['state'] == 'closed' and status['result']['unfilled_size'] == 0
+    socket.handle_message({'type': 'orders', 'action': 'delete', 'reason': 'cancel', **bracket_order(22, 'cancelled')})
+    assert socket.order_status(22)['result']['state'] == 'cancelled'
+
+    socket.handle_message({'type': 'positions', 'action': 'delete', 'product_symbol': 'ETHUSD', 'size': 1})
+    assert socket.position_size('ETHUSD') == 0
+    socket.handle_message({'type': 'positions', 'action': 'create', 'product_symbol': 'ETHUSD', 'size': -2})
+    assert socket.position_size('ETHUSD') == -2
+    # a copy, not the book itself
+    socket.order_status(11)['result']['state'] = 'edited'
+    assert socket.order_status(11)['result']['state'] == 'closed'
+    print("  order / position pushes OK")
+
+
+def test_update_shaped_pushes():
+    # updates after empty snapshots, keyed by 'symbol' / 'order_id' instead of 'product_symbol' / 'id'
+    socket = DeltaPrivateSocket("key", "secret", symbols=["ETHUSD"])
+    socket.ws = FakeSocket()
+    socket._on_open(socket.ws)
+    socket.handle_message({'type': 'key-auth', 'success': True})
+    socket.handle_message({'type': 'orders', 'action': 'snapshot', 'result': []})
+    socket.handle_message({'type': 'positions', 'action': 'snapshot', 'result': []})
+    assert socket.is_live() and socket.position_size('ETHUSD') is None
+
+    socket.handle_message({'type': 'positions', 'action': 'create', 'symbol': 'ETHUSD', 'size': 5})
+    assert socket.position_size('ETHUSD') == 5
+    socket.handle_message({'type': 'positions', 'action': 'update', 'symbol': 'ETHUSD', 'size': 3})
+    assert socket.position_size('ETHUSD') == 3
+    socket.handle_message({'type': 'positions', 'action': 'delete', 'symbol': 'ETHUSD', 'size': 3})
+    assert socket.position_size('ETHUSD') == 0
+    assert socket.position_size('BTCUSD') is None
+
+    socket.handle_message({'type': 'orders', 'action': 'create', 'order_id': 55, 'symbol': 'ETHUSD',
+                           'state': 'open', 'unfilled_size': 1})
+    assert socket.order_status(55)['result']['state'] == 'open'
+    assert socket.order_status(55)['result']['id'] == 55
+    socket.handle_message({'type': 'orders', 'action': 'delete', 'order_id': 55, 'state': 'closed',
+                           'unfilled_size': 0})
+    assert socket.order_status(55)['result']['state'] == 'closed'
+    assert len(socket.orders) == 1
+    print("  symbol / order_id keyed pushes OK")
+
+
+def test_liveness():
+    socket = live_socket()
+    assert socket.is_live()
+    socket.max_age = 0.05
+    time.sleep(0.1)
+    assert not socket.is_live()
+    assert socket.position_size('ETHUSD') is None
+    socket.handle_message({'type': 'heartbeat'})
+    assert socket.is_live()
+
+    socket._on_close(socket.ws, None, None)
+    assert not socket.is_live()
+    # reconnect: the old book is dropped until the new snapshots arrive
+    socket._on_open(socket.ws)
+    assert socket.order_status(11) is None and not socket.is_live()
+    socket.handle_message({'type': 'auth', 'success': True})
+    socket.handle_message({'type': 'orders', 'action': 'snapshot', 'result': [bracket_order(44)]})
+    socket.handle_message({'type': 'positions', 'action': 'snapshot', 'result': []})
+    assert socket.is_live() and socket.order_status(44) is not None
+    print("  liveness / reconnect OK")
+
+
+def test_wait_for_event():
+    socket = live_socket()
+    socket.wait_for_event(0)   # the snapshots' event
+
+    def push():
+        time.sleep(0.05)
+        socket.handle_message({'type': 'orders', 'action': 'update', **bracket_order(11, state='closed')})
+
+    threading.Thread(target=push).start()
+    start = time.perf_counter()
+    assert socket.wait_for_event(2)
+    assert time.perf_counter() - start < 1
+    assert not socket.wait_for_event(0.05)
+
+    socket.connected = False
+    start = time.perf_counter()
+    assert not socket.wait_for_event(0.1)
+    assert time.perf_counter() - start >= 0.1
+    print("  wait_for_event wakes on pushes OK")
+
+
+if __name__ == "__main__":
+    test_handshake()
+    test_order_and_position_pushes()
+    test_update_shaped_pushes()
+    test_liveness()
+    test_wait_for_event()
+    print("ALL DELTA PRIVATE SOCKET TESTS PASSED")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+O(n) RSIGainzy pivot detection against the old nested-loop ta.pivothigh/pivotlow port
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rsi_gaizy import RSIGainzy
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def old_find_pivots(values, left, right, highs):
+    """find_pivot_highs / find_pivot_lows before the sliding max"""
+    n = len(values)
+    pivots = np.full(n, np.nan)
+    beaten = (lambda a, b: a >= b) if highs else (lambda a, b: a <= b)
+    for i in range(left, n - right):
+        if np.isnan(values[i]):
+            continue
+        is_pivot = True
+        for j in range(i - left, i):
+            if not np.isnan(values[j]) and beaten(values[j], values[i]):
+                is_pivot = False
+                break
+        if is_pivot:
+            for j in range(i + 1, i + right + 1):
+                if j < n and not np.isnan(values[j]) and beaten(values[j], values[i]):
+                    is_pivot = False
+                    break
+        if is_pivot and i + right < n:
+            pivots[i + right] = values[i]
+    return pivots
+
+
+def test_pivots_match_old_with_ties_and_nans():
+    rng = np.random.default_rng(11)
+    gainzy = RSIGainzy()
+    for trial in range(40):
+        n = int(rng.integers(1, 300))
+        values = rng.integers(0, 8, n).astype(float)  # small range -> plenty of ties
+        values[rng.random(n) < 0.15] = np.nan
+        left = int(rng.integers(0, 12))
+        right = int(rng.integers(0, 12))
+        for highs, func in ((True, gainzy.find_pivot_highs), (False, gainzy.find_pivot_lows)):
+            expected = old_find_pivots(values, left, right, highs)
+            actual = func(values, left, right)
+            assert np.array_equal(expected, actual, equal_nan=True), (trial, n, left, right, highs)
+
+
+def test_sliding_max():
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=101)
+    for window in (1, 2, 7, 10, 101):
+        expected = [values[j:j + window].max() for j in range(len(values) - window + 1)]
+        assert np.array_equal(RSIGainzy.sliding_max(values, window), expected)
+
+
+def test_rsi_pivots_and_colors_unchanged():
+    df = pd.read_csv(DATA_FILE)
+    gainzy = RSIGainzy()
+    rsi = gainzy.calculate_rsi(df['close'].values)
+    for highs, func in ((True, gainzy.find_pivot_highs), (False, gainzy.find_pivot_lows)):
+        assert np.array_equal(old_find_pivots(rsi, 10, 10, highs), func(rsi, 10, 10), equal_nan=True)
+
+    old = RSIGainzy()
+    old.find_pivot_highs = lambda v, l, r: old_find_pivots(v, l, r, True)
+    old.find_pivot_lows = lambda v, l, r: old_find_pivots(v, l, r, False)
+    assert list(gainzy.calculate_gainzy_colors(df)) == list(old.calculate_gainzy_colors(df))
+
+
+def test_pivots_speed():
+    values = np.random.default_rng(1).normal(size=20000)
+    start = time.perf_counter()
+    old_find_pivots(values, 10, 10, True)
+    looped = time.perf_counter() - start
+    start = time.perf_counter()
+    RSIGainzy().find_pivot_highs(values, 10, 10)
+    sliding = time.perf_counter() - start
+    print(f"20k bars: nested loops {looped:.3f}s, sliding max {sliding:.4f}s")
+    assert sliding < looped
+
+
+if __name__ == "__main__":
+    test_pivots_match_old_with_ties_and_nans()
+    test_sliding_max()
+    test_rsi_pivots_and_colors_unchanged()
+    test_pivots_speed()
+    print("ALL GAINZY PIVOT TESTS PASSED")
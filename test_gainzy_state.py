@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Streaming GainzyState must reproduce RSIGainzy.calculate_gainzy_colors bar for bar
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rsi_gaizy import RSIGainzy, GainzyState
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def load_eth():
+    return pd.read_csv(DATA_FILE)
+
+
+def stream_colors(closes, **params):
+    state = GainzyState(**params)
+    return [state.update(close) for close in closes]
+
+
+def test_stream_matches_batch_on_ethusd():
+    df = load_eth()
+    expected = list(RSIGainzy().calculate_gainzy_colors(df))
+    assert stream_colors(df['close'].values) == expected
+
+    # oldest-first order as the bot feeds candles
+    df = df.sort_values('time').reset_index(drop=True)
+    expected = list(RSIGainzy().calculate_gainzy_colors(df))
+    assert stream_colors(df['close'].values) == expected
+    print(f"{len(df)} bars identical, colors: {pd.Series(expected).value_counts().to_dict()}")
+
+
+def test_stream_matches_batch_other_lengths():
+    df = load_eth().sort_values('time').reset_index(drop=True).iloc[:1200]
+    for rsi_length, pivot_length in ((7, 3), (21, 5), (14, 1)):
+        expected = list(RSIGainzy().calculate_gainzy_colors(df, rsi_length=rsi_length, pivot_length=pivot_length))
+        assert stream_colors(df['close'].values, rsi_length=rsi_length, pivot_length=pivot_length) == expected
+
+
+def test_stream_matches_batch_with_nan_closes():
+    df = load_eth().iloc[:900].copy()
+    df.loc[[100, 101, 450], 'close'] = np.nan
+    expected = list(RSIGainzy().calculate_gainzy_colors(df))
+    assert stream_colors(df['close'].values) == expected
+
+
+def test_peek_does_not_advance_state():
+    closes = load_eth()['close'].values[:600]
+    state = GainzyState()
+    state.seed(closes[:-1])
+    bars, trend, window = state.bars, state.state['trend'], list(state.state['rsi_window'])
+    peeked = state.peek(closes[-1])
+    assert state.bars == bars and state.state['trend'] == trend
+    assert list(state.state['rsi_window']) == window
+    assert state.update(closes[-1]) == peeked
+
+
+if __name__ == "__main__":
+    test_stream_matches_batch_on_ethusd()
+    test_stream_matches_batch_other_lengths()
+    test_stream_matches_batch_with_nan_closes()
+    test_peek_does_not_advance_state()
+    print("ALL GAINZY STATE TESTS PASSED")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Vectorized Heiken-Ashi transform and the streaming HeikinAshiState against the
+old per-row df.at loop
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.heiken_ashi import heiken_ashi_arrays, replace_with_heiken_ashi, HeikinAshiState
+from important import calculate_heiken_ashi, calculate_heiken_ashi_testnet
+from test_recursion import old_heiken_ashi
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def load_candles():
+    df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+    return df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+
+
+def old_in_place(df):
+    """Column layout the old drop / rename produced"""
+    df = old_heiken_ashi(df)
+    df = df.drop(columns=['Open', 'High', 'Low', 'Close'])
+    return df.rename(columns={'HA_Open': 'Open', 'HA_High': 'High', 'HA_Low': 'Low', 'HA_Close': 'Close'})
+
+
+def test_arrays_match_old_loop():
+    df = load_candles()
+    expected = old_heiken_ashi(df)
+    ha_open, ha_high, ha_low, ha_close = heiken_ashi_arrays(df['Open'], df['High'], df['Low'], df['Close'])
+    assert np.array_equal(ha_open, expected['HA_Open'].values)
+    assert np.array_equal(ha_high, expected['HA_High'].values)
+    assert np.array_equal(ha_low, expected['HA_Low'].values)
+    assert np.array_equal(ha_close, expected['HA_Close'].values)
+    assert ha_high[0] == 0.0 and ha_low[0] == 0.0
+
+
+def test_in_place_wrappers_keep_layout():
+    df = load_candles()
+    expected = old_in_place(df)
+
+    in_place = df.copy()
+    assert calculate_heiken_ashi(in_place) is None
+    pd.testing.assert_frame_equal(in_place, expected)
+
+    returned = df.copy()
+    assert calculate_heiken_ashi_testnet(returned) is returned
+    pd.testing.assert_frame_equal(returned, expected)
+
+
+def test_missing_columns_rejected():
+    try:
+        replace_with_heiken_ashi(pd.DataFrame({'close': [1.0]}))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("replace_with_heiken_ashi accepted a frame without OHLC")
+
+
+def test_state_matches_batch():
+    df = load_candles()
+    ha_open, ha_high, ha_low, ha_close = heiken_ashi_arrays(df['Open'], df['High'], df['Low'], df['Close'])
+
+    state = HeikinAshiState()
+    rows = pd.DataFrame([state.update(bar) for bar in df[['Open', 'High', 'Low', 'Close']].to_dict('records')])
+    assert np.array_equal(rows['Open'].values, ha_open)
+    assert np.array_equal(rows['High'].values, ha_high)
+    assert np.array_equal(rows['Low'].values, ha_low)
+    assert np.array_equal(rows['Close'].values, ha_close)
+
+
+def test_state_peek_and_seed():
+    df = load_candles().iloc[:300]
+    state = HeikinAshiState.from_history(df.iloc[:-1])
+    last = df.iloc[-1]
+    peeked = state.peek((last['Open'], last['High'], last['Low'], last['Close']))
+    assert state.bars == len(df) - 1
+    assert state.update(last) == peeked
+
+    ha_open, _, _, ha_close = heiken_ashi_arrays(df['Open'], df['High'], df['Low'], df['Close'])
+    assert peeked['Open'] == ha_open[-1] and peeked['Close'] == ha_close[-1]
+
+
+if __name__ == "__main__":
+    test_arrays_match_old_loop()
+    test_in_place_wrappers_keep_layout()
+    test_missing_columns_rejected()
+    test_state_matches_batch()
+    test_state_peek_and_seed()
+    print("ALL HEIKEN ASHI TESTS PASSED")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP sessions (module/http_session.py) against a local stub server:
+connections are reused across calls and clients, timeouts apply, one session
+per host
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.http_session import get_session, new_session, close_sessions, TimeoutSession
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive JSON server: /v5/market/kline answers with data/ETHUSD.csv,
+    /slow sleeps 1s, /delay/<ms>/... sleeps ms, the rest echoes
+    """
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes, Nagle + delayed ACK would add 40 ms a response
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass    # the client timed out
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.path.startswith('/slow'):
+            time.sleep(1)
+            return self._reply({})
+        if self.path.startswith('/delay/'):
+            time.sleep(int(self.path.split('/')[2]) / 1000)
+            return self._reply({'path': self.path})
+        if self.path.startswith('/v5/market/kline'):
+            rows = self.server.candles[-5:][::-1]   # Bybit lists the newest candle first
+            return self._reply({'retCode': 0, 'result': {'list': rows}})
+        return self._reply({'path': self.path})
+
+    def do_POST(self):
+        self.server.requests += 1
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply({'path': self.path, 'body': json.loads(body or b'null')})
+
+
+def start_stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.connections = server.requests = 0
+    df = pd.read_csv(DATA_FILE)
+    server.candles = [[str(int(t) * 1000), str(o), str(h), str(l), str(c), str(v), '0']
+                      for t, o, h, l, c, v in df[['time', 'open', 'high', 'low', 'close', 'volume']].values]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_keep_alive():
+    server, url = start_stub()
+    try:
+        session = get_session(url)
+        for k in range(20):
+            assert session.get(f"{url}/ping/{k}").json() == {'path': f'/ping/{k}'}
+        response = session.post(f"{url}/order", data=json.dumps({'size': 1}))
+        assert response.json()['body'] == {'size': 1}
+        assert server.requests == 21
+        assert server.connections == 1
+
+        # bare requests: one connection per call
+        for k in range(5):
+            requests.get(f"{url}/ping/{k}")
+        assert server.connections == 6
+    finally:
+        close_sessions()
+        server.shutdown()
+    print("  keep-alive connection reuse OK")
+
+
+def test_session_per_host():
+    close_sessions()
+    first = get_session("https://api.bybit.com/v5/market/kline")
+    assert get_session("https://api.bybit.com") is first
+    assert get_session("https://fapi.binance.com/fapi/v1/klines") is not first
+    assert isinstance(first, TimeoutSession)
+    close_sessions()
+    assert get_session("https://api.bybit.com") is not first
+    close_sessions()
+    print("  one session per host OK")
+
+
+def test_timeout():
+    server, url = start_stub()
+    try:
+        session = new_session(timeout=(1, 0.2))
+        start = time.perf_counter()
+        try:
+            session.get(f"{url}/slow")
+            raise AssertionError("the read timeout did not apply")
+        except requests.exceptions.ReadTimeout:
+            pass
+        assert time.perf_counter() - start < 0.9
+        # an explicit timeout wins over the session default
+        assert session.get(f"{url}/slow", timeout=5).json() == {}
+        # timeout=None waits however long it takes (order POSTs)
+        assert session.get(f"{url}/delay/400", timeout=None).json() == {'path': '/delay/400'}
+        session.close()
+    finally:
+        server.shutdown()
+    print("  default / explicit timeouts OK")
+
+
+def test_http2_timeout_is_a_requests_timeout():
+    # HTTP2 sessions (TimeoutSession when httpx[http2] is not installed) raise the requests exception
+    server, url = start_stub()
+    try:
+        session = new_session(http2=True, timeout=(1, 0.2))
+        try:
+            session.get(f"{url}/slow")
+            raise AssertionError("the read timeout did not apply")
+        except requests.exceptions.ReadTimeout:
+            pass
+        session.close()
+    finally:
+        server.shutdown()
+    print(f"  {type(session).__name__} read timeout OK")
+
+
+def test_clients_share_pool():
+    from bybit_client import BybitClient
+    server, url = start_stub()
+    try:
+        clients = [BybitClient() for _ in range(3)]
+        for client in clients:
+            client.base_url = url
+            client.session = get_session(url)
+            df = client.get_klines(symbol="ETHUSD", category="inverse", interval="5", limit=5)
+            assert len(df) == 5 and df['time'].is_monotonic_increasing
+        assert server.connections == 1
+    finally:
+        close_sessions()
+        server.shutdown()
+    print("  clients share the host pool OK")
+
+
+if __name__ == "__main__":
+    test_keep_alive()
+    test_session_per_host()
+    test_timeout()
+    test_http2_timeout_is_a_requests_timeout()
+    test_clients_share_pool()
+    print("ALL HTTP SESSION TESTS PASSED")
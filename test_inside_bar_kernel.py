@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+inside_ib_box_arrays / calculate_inside_ib_box against the old per-row df.loc
+implementation, on the test_inside_bar_logic candles and on data/ETHUSD.csv
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.ib_indicator import calculate_inside_ib_box, inside_ib_box_arrays
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+RESULT_COLS = ['IsIB', 'BoxHigh', 'BoxLow', 'GreenArrow', 'RedArrow', 'BarColor', 'BarIndex']
+
+
+def old_calculate_inside_ib_box(df, high_low_buffer=0.0, mintick=0.05, bar_highlight=True, show_break=True):
+    """
+    calculate_inside_ib_box before the array kernel. BarColor starts as an object
+    column here, the float column of the original cannot take 'orange' on pandas 3.
+    """
+    df = df.copy()
+    if 'datetime' in df.columns:
+        df['datetime'] = pd.to_datetime(df['datetime'])
+        df.set_index('datetime', inplace=True)
+    elif not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+
+    df['IsIB'] = False
+    df['BoxHigh'] = np.nan
+    df['BoxLow'] = np.nan
+    df['GreenArrow'] = False
+    df['RedArrow'] = False
+    df['BarColor'] = pd.Series(np.nan, index=df.index, dtype=object)
+    df['BarIndex'] = np.nan
+
+    box_high = np.nan
+    box_low = np.nan
+    bar_index = 1
+    f_flag = False
+
+    def is_inside_bar(current_idx, lookback_bars, buffer, mintick_size):
+        if current_idx < lookback_bars:
+            return False
+        reference_bar = df.iloc[current_idx - lookback_bars]
+        current_bar = df.iloc[current_idx]
+        hp = reference_bar['high'] + buffer * mintick_size
+        lp = reference_bar['low'] - buffer * mintick_size
+        return (current_bar['close'] <= hp and current_bar['close'] >= lp and
+                current_bar['open'] <= hp and current_bar['open'] >= lp)
+
+    for i in range(1, len(df)):
+        df.loc[df.index[i], 'BarIndex'] = bar_index
+        is_ib = is_inside_bar(i, bar_index, high_low_buffer, mintick)
+        prev_is_ib = df.loc[df.index[i-1], 'IsIB'] if i > 0 else False
+        df.loc[df.index[i], 'IsIB'] = is_ib
+        if is_ib and bar_highlight:
+            df.loc[df.index[i], 'BarColor'] = 'orange'
+
+        if is_ib and not prev_is_ib:
+            prev_bar = df.iloc[i - 1]
+            box_high = prev_bar['high']
+            box_low = prev_bar['low']
+            f_flag = True
+            df.loc[df.index[i], 'BoxHigh'] = box_high
+            df.loc[df.index[i], 'BoxLow'] = box_low
+            bar_index = bar_index + 1
+        elif is_ib and prev_is_ib:
+            if not np.isnan(box_high):
+                df.loc[df.index[i], 'BoxHigh'] = box_high
+                df.loc[df.index[i], 'BoxLow'] = box_low
+            bar_index = bar_index + 1
+        elif prev_is_ib and not is_ib:
+            bar_index = 1
+        elif not prev_is_ib and not is_ib:
+            f_flag = False
+
+        if show_break and f_flag and not np.isnan(box_high) and not np.isnan(box_low):
+            prev_close = df.iloc[i-1]['close']
+            curr_close = df.iloc[i]['close']
+            if prev_close <= box_high and curr_close > box_high:
+                df.loc[df.index[i], 'GreenArrow'] = True
+            elif prev_close >= box_low and curr_close < box_low:
+                df.loc[df.index[i], 'RedArrow'] = True
+
+    return df
+
+
+def sample_candles():
+    """Candles from module.ib_indicator.test_inside_bar_logic"""
+    return pd.DataFrame({
+        'datetime': pd.date_range('2023-01-01', periods=20, freq='1h'),
+        'open':  [100.0, 102.0, 101.5, 101.8, 101.2, 101.6, 101.4, 103.0, 102.5, 102.7,
+                  104.0, 103.8, 103.5, 103.2, 105.0, 104.2, 104.5, 106.0, 105.5, 107.0],
+        'high':  [101.0, 103.0, 102.0, 102.0, 101.5, 101.9, 101.7, 104.0, 103.0, 103.2,
+                  105.0, 104.5, 104.0, 103.8, 106.0, 105.0, 105.2, 107.0, 106.5, 108.0],
+        'low':   [99.5,  101.5, 101.0, 101.5, 101.0, 101.3, 101.1, 102.8, 102.0, 102.2,
+                  103.5, 103.0, 103.2, 102.9, 104.5, 103.8, 104.0, 105.5, 105.0, 106.5],
+        'close': [100.5, 102.5, 101.8, 101.6, 101.3, 101.7, 101.5, 103.5, 102.8, 102.9,
+                  104.2, 104.0, 103.8, 103.1, 105.5, 104.5, 104.8, 106.5, 106.0, 107.5],
+    })
+
+
+def assert_same(expected, actual):
+    assert actual.index.equals(expected.index)
+    for col in RESULT_COLS:
+        e = expected[col].astype(object).where(expected[col].notna(), None).tolist()
+        a = actual[col].astype(object).where(actual[col].notna(), None).tolist()
+        assert e == a, f"{col} differs"
+
+
+def test_kernel_matches_old_on_sample_candles():
+    df = sample_candles()
+    for params in (dict(), dict(high_low_buffer=2), dict(bar_highlight=False), dict(show_break=False)):
+        assert_same(old_calculate_inside_ib_box(df, **params), calculate_inside_ib_box(df, **params))
+
+    result = calculate_inside_ib_box(df)
+    assert result['IsIB'].sum() == 8
+    assert list(np.flatnonzero(result['GreenArrow'])) == [7, 10, 17, 19]
+    assert list(np.flatnonzero(result['RedArrow'])) == [4, 13]
+
+
+def test_kernel_matches_old_on_ethusd():
+    df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True).iloc[:600]
+    for params in (dict(), dict(high_low_buffer=3, mintick=0.05)):
+        assert_same(old_calculate_inside_ib_box(df, **params), calculate_inside_ib_box(df, **params))
+
+
+def test_arrays_kernel_outputs():
+    df = sample_candles()
+    result = inside_ib_box_arrays(df['open'], df['high'], df['low'], df['close'])
+    assert set(result) == {'IsIB', 'BoxHigh', 'BoxLow', 'GreenArrow', 'RedArrow', 'BarIndex'}
+    assert all(len(values) == len(df) for values in result.values())
+    assert np.isnan(result['BarIndex'][0]) and not result['IsIB'][0]
+    assert inside_ib_box_arrays([], [], [], [])['IsIB'].shape == (0,)
+
+
+if __name__ == "__main__":
+    test_kernel_matches_old_on_sample_candles()
+    test_kernel_matches_old_on_ethusd()
+    test_arrays_kernel_outputs()
+    print("ALL INSIDE BAR KERNEL TESTS PASSED")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Streaming InsideBarState must reproduce inside_ib_box_arrays bar for bar
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.ib_indicator import InsideBarState, inside_ib_box_arrays
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+OUTPUT_COLS = ['IsIB', 'BoxHigh', 'BoxLow', 'GreenArrow', 'RedArrow', 'BarIndex']
+
+
+def load_candles():
+    return pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+
+
+def synthetic_candles(n, seed):
+    """Tight ranges inside wide bars give long inside sequences (large barIndex)"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+    open_ = close + rng.normal(0, 0.2, n)
+    spread = np.where(rng.random(n) < 0.2, 3.0, 0.3)
+    return pd.DataFrame({'open': open_, 'high': np.maximum(open_, close) + spread,
+                         'low': np.minimum(open_, close) - spread, 'close': close})
+
+
+def assert_stream_matches(df, **params):
+    batch = inside_ib_box_arrays(df['open'], df['high'], df['low'], df['close'], **params)
+    state = InsideBarState(**params)
+    rows = pd.DataFrame([state.update(bar) for bar in df[['open', 'high', 'low', 'close']].to_dict('records')])
+    for col in OUTPUT_COLS:
+        assert np.array_equal(rows[col].values.astype(float), batch[col].astype(float), equal_nan=True), col
+    return batch
+
+
+def test_stream_matches_kernel_on_ethusd():
+    df = load_candles()
+    for params in (dict(), dict(high_low_buffer=3), dict(show_break=False)):
+        batch = assert_stream_matches(df, **params)
+    print(f"{len(df)} bars identical, {int(batch['IsIB'].sum())} inside bars")
+
+
+def test_stream_matches_kernel_on_long_sequences():
+    for seed in range(5):
+        batch = assert_stream_matches(synthetic_candles(3000, seed))
+        assert np.nanmax(batch['BarIndex']) > 3  # the lookback really went past the previous bar
+
+
+def test_snapshot_restore_and_peek():
+    df = load_candles().iloc[:500]
+    bars = df[['open', 'high', 'low', 'close']].to_dict('records')
+    state = InsideBarState.from_history(df.iloc[:400])
+
+    snap = state.snapshot()
+    forward = [state.update(bar) for bar in bars[400:]]
+    state.restore(snap)
+    assert state.bars == 400
+    assert [state.update(bar) for bar in bars[400:]] == forward
+
+    state.restore(snap)
+    peeked = state.peek(bars[400])
+    assert state.snapshot() == snap
+    assert state.update(bars[400]) == peeked
+
+
+if __name__ == "__main__":
+    test_stream_matches_kernel_on_ethusd()
+    test_stream_matches_kernel_on_long_sequences()
+    test_snapshot_restore_and_peek()
+    print("ALL INSIDE BAR STATE TESTS PASSED")
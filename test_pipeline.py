@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Indicator pipeline (module/pipeline.py): the main.py / important.py /
+utils/type1_3.py configurations give the same frames as the old rename ->
+Heiken-Ashi -> run_filter -> rename -> RSI -> Gainzy -> IB box -> drop -> tail
+sequence, and only the nodes a column needs are run
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.pipeline import (Node, Pipeline, signal_pipeline, MAIN_SIGNAL_COLUMNS,
+                             IMPORTANT_SIGNAL_COLUMNS, TYPE1_3_SIGNAL_COLUMNS)
+from module.rf import RangeFilter
+from module.ib_indicator import calculate_inside_ib_box
+from module.rsi_buy_sell import RSIBuySellIndicator
+from module.rsi_gaizy import RSIGainzy
+from module.signal_final import combine_signal_final
+from important import calculate_heiken_ashi
+import important
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def load_klines(n=1000):
+    df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+    df = df[['time', 'open', 'high', 'low', 'close', 'volume']].tail(n).reset_index(drop=True)
+    df['Timestamp'] = pd.to_datetime(df['time'], unit='s')
+    return df
+
+
+def old_indicators(df, heiken, atr=False, gainzy=False, drop_filter=True):
+    """The indicator part of the calculate_signals functions before the pipeline"""
+    df.rename(columns={'close': 'Close', 'open': 'Open', 'high': 'High', 'low': 'Low', 'volume': 'Volume'}, inplace=True)
+    if heiken:
+        calculate_heiken_ashi(df)
+    if atr:
+        prev_close = df['Close'].shift(1)
+        true_range = pd.concat([df['High'] - df['Low'], (df['High'] - prev_close).abs(),
+                                (df['Low'] - prev_close).abs()], axis=1).max(axis=1)
+        df['atr'] = true_range.rolling(window=14).mean()
+    df = RangeFilter().run_filter(df)
+    df.rename(columns={'Close': 'close', 'Open': 'open', 'High': 'high', 'Low': 'low', 'Volume': 'volume'}, inplace=True)
+    df['rsi'], df['rsi_buy'], df['rsi_sell'] = RSIBuySellIndicator().generate_signals(df['close'])
+    if gainzy:
+        df['gaizy_color'] = RSIGainzy().calculate_gainzy_colors(df=df)
+    df = calculate_inside_ib_box(df)
+    columns_to_drop = ['RF_UpperBand', 'RF_LowerBand', 'RF_Trend', 'IsIB', 'BoxHigh', 'BoxLow', 'BarColor', 'rsi']
+    if drop_filter:
+        columns_to_drop.append('RF_Filter')
+    return df.drop(columns=columns_to_drop).tail(200)
+
+
+def old_main_signals(df, heiken):
+    df = old_indicators(df, heiken, drop_filter=False)
+    df['Signal_Final'] = combine_signal_final(
+        df['RF_BuySignal'].values, df['RF_SellSignal'].values, df['GreenArrow'].values,
+        df['RedArrow'].values, df['rsi_buy'].values, df['rsi_sell'].values, n_candle_lookback=5)
+    return df
+
+
+def assert_same_frame(expected, actual):
+    # the pipeline keeps the kline index, calculate_inside_ib_box turned it into a DatetimeIndex
+    assert sorted(expected.columns) == sorted(actual.columns), (list(expected.columns), list(actual.columns))
+    for col in expected.columns:
+        assert expected[col].dtype == actual[col].dtype, (col, expected[col].dtype, actual[col].dtype)
+        if expected[col].dtype == float:
+            assert np.array_equal(expected[col].values, actual[col].values, equal_nan=True), col
+        else:
+            assert np.array_equal(expected[col].values, actual[col].values), col
+
+
+def test_main_configuration_matches_old():
+    for heiken in (True, False):
+        klines = load_klines()
+        expected = old_main_signals(klines.copy(), heiken)
+        actual = signal_pipeline(heiken=heiken, n_candle_lookback=5).run(klines, MAIN_SIGNAL_COLUMNS, window=200)
+        assert_same_frame(expected, actual)
+        assert actual['Signal_Final'].abs().sum() > 0
+
+
+def test_important_and_type1_3_configurations_match_old():
+    for heiken in (True, False):
+        klines = load_klines()
+        expected = old_indicators(klines.copy(), heiken, atr=True, gainzy=True)
+        actual = signal_pipeline(heiken=heiken).run(klines, IMPORTANT_SIGNAL_COLUMNS, window=200)
+        assert_same_frame(expected, actual)
+
+        expected = old_indicators(klines.copy(), heiken, gainzy=True)
+        actual = signal_pipeline(heiken=heiken).run(klines, TYPE1_3_SIGNAL_COLUMNS, window=200)
+        assert_same_frame(expected, actual)
+
+
+def test_important_calculate_signals_runs_on_pipeline():
+    klines = load_klines(400)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # calculate_signals writes data/ETHUSD_Final_main.csv relative to the working directory
+        os.makedirs(os.path.join(tmp, 'data'))
+        os.chdir(tmp)
+        try:
+            result = important.calculate_signals(klines.copy())
+        finally:
+            os.chdir(cwd)
+    assert len(result) == 200
+    assert {'atr', 'gaizy_color', 'Signal_Final', 'close'}.issubset(result.columns)
+    assert result['Signal_Final'].isin([0, 1, -1, 2, -2, 3, -3, 4, -4, 5, -5, 6, -6]).all()
+
+
+def test_atr_scale_reuses_true_range():
+    klines = load_klines().rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+    expected = RangeFilter().run_filter(klines, range_scale="ATR")
+    pipeline = signal_pipeline(heiken=False, range_filter={'range_scale': "ATR"})
+    assert 'true_range' in pipeline.producers['RF_Filter'].inputs
+    actual = pipeline.run(klines, ['RF_Filter', 'RF_BuySignal', 'RF_SellSignal'])
+    for col in ('RF_Filter', 'RF_BuySignal', 'RF_SellSignal'):
+        assert np.array_equal(expected[col].values, actual[col].values), col
+
+
+def test_only_needed_nodes_run_once():
+    pipeline = signal_pipeline()
+    names = [node.name for node in pipeline.plan(['rsi_buy', 'gaizy_color'])]
+    assert names == ['candles', 'change', 'rsi', 'rsi_signals', 'gainzy']
+
+    calls = []
+
+    def counted(name, func):
+        def wrapper(*args):
+            calls.append(name)
+            return func(*args)
+        return wrapper
+
+    pipeline = Pipeline([
+        Node('double', counted('double', lambda x: {'double': 2 * x}), ('close',), ('double',)),
+        Node('plus', counted('plus', lambda d, x: {'plus': d + x}), ('double', 'close'), ('plus',)),
+        Node('minus', counted('minus', lambda d, x: {'minus': d - x}), ('double', 'close'), ('minus',)),
+        Node('unused', counted('unused', lambda x: {'unused': x}), ('close',), ('unused',)),
+    ])
+    klines = load_klines(10)
+    before = klines.copy()
+    result = pipeline.run(klines, ['plus', 'minus'])
+    assert calls == ['double', 'plus', 'minus']
+    assert np.allclose(result['plus'], 3 * klines['close']) and np.allclose(result['minus'], klines['close'])
+    assert klines.equals(before)
+
+
+def test_window_and_passthrough_columns():
+    klines = load_klines(300).rename(columns={'close': 'Close', 'volume': 'Volume'})
+    result = signal_pipeline(heiken=False).run(klines, [('close', 'bar_close'), 'rsi'], window=50)
+    assert len(result) == 50
+    assert list(result.columns) == ['time', 'open', 'high', 'low', 'close', 'volume', 'Timestamp', 'rsi']
+    assert result.index.equals(klines.index[-50:])
+    assert np.array_equal(result['close'].values, klines['Close'].values[-50:])
+    assert result['Timestamp'].equals(klines['Timestamp'].iloc[-50:])
+
+
+def test_invalid_graphs_rejected():
+    for nodes, targets in (
+        ([], ['rsi']),
+        ([Node('a', None, ('b',), ('a',)), Node('b', None, ('a',), ('b',))], ['a']),
+        ([Node('w', None, ('close',), ('w',), windowed=True), Node('f', None, ('w',), ('f',))], ['f']),
+    ):
+        try:
+            Pipeline(nodes).plan(targets)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"plan accepted {nodes}")
+    try:
+        Pipeline([Node('a', None, ('close',), ('x',)), Node('b', None, ('close',), ('x',))])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("two producers of the same array accepted")
+
+
+if __name__ == "__main__":
+    test_main_configuration_matches_old()
+    test_important_and_type1_3_configurations_match_old()
+    test_important_calculate_signals_runs_on_pipeline()
+    test_atr_scale_reuses_true_range()
+    test_only_needed_nodes_run_once()
+    test_window_and_passthrough_columns()
+    test_invalid_graphs_rejected()
+    print("ALL PIPELINE TESTS PASSED")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+RangeFilter.run_filter_grid must reproduce run_filter row by row
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rf import RangeFilter
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD_Indicator_main.csv')
+OUTPUT_COLS = ['RF_UpperBand', 'RF_LowerBand', 'RF_Filter', 'RF_Trend',
+               'RF_BuySignal', 'RF_SellSignal', 'RF_Position']
+
+
+def load_candles(rows=None):
+    df = pd.read_csv(DATA_FILE, index_col=0)
+    df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+    if rows is not None:
+        df = df.iloc[:rows].reset_index(drop=True)
+    return df
+
+
+def assert_grid_matches(df, grid_params, **fixed):
+    rf = RangeFilter()
+    grid = rf.run_filter_grid(df, **grid_params, **fixed)
+    assert len(grid['params']) == int(np.prod([np.size(v) for v in grid_params.values()]))
+    for k, row in grid['params'].iterrows():
+        expected = rf.run_filter(df, range_quantity=row['range_quantity'],
+                                 range_period=int(row['range_period']),
+                                 smooth_period=int(row['smooth_period']),
+                                 average_samples=int(row['average_samples']), **fixed)
+        for col in OUTPUT_COLS:
+            assert grid[col].shape == (len(grid['params']), len(df))
+            assert np.array_equal(grid[col][k], expected[col].values.astype(float), equal_nan=True), \
+                f"{col} differs for {dict(row)} {fixed}"
+
+
+def test_grid_matches_run_filter_default_scale():
+    df = load_candles(2000)
+    assert_grid_matches(df, dict(range_quantity=[1.5, 2.618], range_period=[10, 14],
+                                 smooth_period=[20, 27], average_samples=[2, 4]))
+
+
+def test_grid_matches_run_filter_variants():
+    df = load_candles(800)
+    grid_params = dict(range_quantity=[1.0, 3.0], range_period=[7, 14], smooth_period=[9], average_samples=[2, 3])
+    for fixed in (dict(range_scale="ATR"),
+                  dict(range_scale="Standard Deviation"),
+                  dict(range_scale="% of Price", range_quantity=[0.1, 0.3]),
+                  dict(filter_type="Type 2", movement_source="Wicks", range_scale="ATR"),
+                  dict(smooth_range=False, average_filter=False)):
+        params = dict(grid_params, **{k: v for k, v in fixed.items() if k in grid_params})
+        fixed = {k: v for k, v in fixed.items() if k not in grid_params}
+        assert_grid_matches(df, params, **fixed)
+
+
+def test_scalar_params_give_single_row():
+    df = load_candles(500)
+    grid = RangeFilter().run_filter_grid(df)
+    expected = RangeFilter().run_filter(df)
+    assert grid['RF_Filter'].shape == (1, len(df))
+    assert np.array_equal(grid['RF_BuySignal'][0], expected['RF_BuySignal'].values)
+
+
+if __name__ == "__main__":
+    test_grid_matches_run_filter_default_scale()
+    test_grid_matches_run_filter_variants()
+    test_scalar_params_give_single_row()
+    print("ALL RANGE FILTER GRID TESTS PASSED")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Streaming RangeFilterState must reproduce RangeFilter.run_filter bit for bit
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rf import RangeFilter, RangeFilterState
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD_Indicator_main.csv')
+OUTPUT_COLS = ['RF_UpperBand', 'RF_LowerBand', 'RF_Filter', 'RF_Trend',
+               'RF_BuySignal', 'RF_SellSignal', 'RF_Position']
+
+
+def load_candles(rows=None):
+    df = pd.read_csv(DATA_FILE, index_col=0)
+    df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+    if rows is not None:
+        df = df.iloc[:rows].reset_index(drop=True)
+    return df
+
+
+def stream_outputs(df, **params):
+    state = RangeFilterState(**params)
+    rows = [state.update(bar) for bar in df[['High', 'Low', 'Close']].to_dict('records')]
+    return pd.DataFrame(rows)
+
+
+def assert_same(batch, streamed):
+    for col in OUTPUT_COLS:
+        expected = batch[col].values.astype(float)
+        actual = streamed[col].values.astype(float)
+        assert np.array_equal(expected, actual, equal_nan=True), f"{col} differs from run_filter"
+
+
+def test_stream_matches_run_filter_default():
+    df = load_candles()
+    batch = RangeFilter().run_filter(df)
+    streamed = stream_outputs(df)
+    assert_same(batch, streamed)
+    print(f"default params: {len(df)} bars identical, "
+          f"{int(streamed['RF_BuySignal'].sum())} buys / {int(streamed['RF_SellSignal'].sum())} sells")
+
+
+def test_stream_matches_run_filter_variants():
+    df = load_candles(1500)
+    variants = [
+        dict(range_scale="ATR"),
+        dict(range_scale="Standard Deviation", range_period=20),
+        dict(range_scale="% of Price", range_quantity=0.2),
+        dict(filter_type="Type 2", movement_source="Wicks", range_scale="ATR"),
+        dict(smooth_range=False, average_filter=False),
+        dict(range_scale="Points", range_quantity=3, average_samples=4),
+    ]
+    for params in variants:
+        batch = RangeFilter().run_filter(df, **params)
+        assert_same(batch, stream_outputs(df, **params))
+        print(f"{params}: identical")
+
+
+def test_peek_does_not_advance_state():
+    df = load_candles(400)
+    history, forming = df.iloc[:-1], df.iloc[-1]
+
+    state = RangeFilterState.from_history(history)
+    before = dict(state.state)
+    peeked = state.peek(forming)
+    assert state.bars == len(history)
+    assert state.state == before
+
+    # peek on the forming bar equals the last row of a full recompute
+    batch = RangeFilter().run_filter(df).iloc[-1]
+    for col in OUTPUT_COLS:
+        assert peeked[col] == batch[col], f"{col}: {peeked[col]} != {batch[col]}"
+
+    # and committing it gives the same answer
+    assert state.update(forming) == peeked
+
+
+if __name__ == "__main__":
+    test_stream_matches_run_filter_default()
+    test_stream_matches_run_filter_variants()
+    test_peek_does_not_advance_state()
+    print("ALL RANGE FILTER STATE TESTS PASSED")
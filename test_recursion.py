@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shared recursion kernel (module/recursion.py): backends agree bit for bit and the
+four call sites keep their old results and signals
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module import recursion
+from module.rf import RangeFilter
+from module.rsi_gaizy import RSIGainzy
+from module.rsi_buy_sell import RSIBuySellIndicator
+from important import calculate_heiken_ashi
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def old_conditional_ema(values, condition, period):
+    """RangeFilter.conditional_ema before the kernel"""
+    result = np.full_like(values, np.nan, dtype=float)
+    alpha = 2.0 / (period + 1)
+    ema_val = np.nan
+    for i in range(len(values)):
+        if condition[i] and not np.isnan(values[i]):
+            if np.isnan(ema_val):
+                ema_val = values[i]
+            else:
+                ema_val = (values[i] - ema_val) * alpha + ema_val
+        result[i] = ema_val
+    return result
+
+
+def old_gainzy_rsi(close_prices, period=14):
+    """RSIGainzy.calculate_rsi before the kernel"""
+    close_prices = np.array(close_prices, dtype=float)
+    deltas = np.concatenate([[0], np.diff(close_prices)])
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    rsi = np.full(len(close_prices), np.nan)
+    if len(close_prices) < period + 1:
+        return rsi
+    avg_gain = np.mean(gains[1:period+1])
+    avg_loss = np.mean(losses[1:period+1])
+    rsi[period] = 100.0 if avg_loss == 0 else 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+    for i in range(period + 1, len(close_prices)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        rsi[i] = 100.0 if avg_loss == 0 else 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+    return rsi
+
+
+def old_pine_rma(src, length):
+    """RSIBuySellIndicator.pine_rma before the kernel"""
+    result = pd.Series(index=src.index, dtype=float)
+    sma_initial = src.rolling(window=length).mean()
+    for i in range(len(src)):
+        if i < length - 1:
+            result.iloc[i] = np.nan
+        elif i == length - 1:
+            result.iloc[i] = sma_initial.iloc[i]
+        else:
+            prev_rma = result.iloc[i-1]
+            if pd.isna(prev_rma):
+                result.iloc[i] = sma_initial.iloc[i]
+            else:
+                result.iloc[i] = (src.iloc[i] + (length - 1) * prev_rma) / length
+    return result
+
+
+def old_heiken_ashi(df):
+    """important.calculate_heiken_ashi loop before the kernel"""
+    df = df.copy()
+    df['HA_Close'] = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
+    df['HA_Open'] = 0.0
+    df['HA_High'] = 0.0
+    df['HA_Low'] = 0.0
+    df.at[df.index[0], 'HA_Open'] = (df.at[df.index[0], 'Open'] + df.at[df.index[0], 'Close']) / 2
+    for i in range(1, len(df)):
+        df.at[df.index[i], 'HA_Open'] = (df.at[df.index[i - 1], 'HA_Open'] + df.at[df.index[i - 1], 'HA_Close']) / 2
+        df.at[df.index[i], 'HA_High'] = max(df.at[df.index[i], 'High'], df.at[df.index[i], 'HA_Open'], df.at[df.index[i], 'HA_Close'])
+        df.at[df.index[i], 'HA_Low'] = min(df.at[df.index[i], 'Low'], df.at[df.index[i], 'HA_Open'], df.at[df.index[i], 'HA_Close'])
+    return df
+
+
+def load_eth():
+    return pd.read_csv(os.path.join(DATA_DIR, 'ETHUSD.csv'))
+
+
+def test_backends_agree_bit_for_bit():
+    rng = np.random.default_rng(3)
+    values = 2500 + np.cumsum(rng.normal(0, 1, 5000))
+    active = recursion.get_backend()
+    try:
+        results = {}
+        for name in recursion.available_backends():
+            recursion.set_backend(name)
+            results[name] = recursion.ema_filter(values, 2.0 / 28)
+        reference = results['python']
+        for name, result in results.items():
+            assert np.array_equal(result, reference), f"{name} backend differs from python"
+    finally:
+        recursion.set_backend(active)
+
+
+def test_unknown_backend_rejected():
+    try:
+        recursion.set_backend("fortran")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("set_backend accepted an unknown backend")
+
+
+def test_ema_step_matches_filter():
+    values = np.array([3.0, 1.5, 2.25, 7.0, 4.0])
+    alpha = 2.0 / 15
+    filtered = recursion.ema_filter(values, alpha)
+    y = values[0]
+    for i in range(1, len(values)):
+        y = recursion.ema_step(y, values[i], alpha)
+        assert y == filtered[i]
+
+
+def test_conditional_ema_matches_old():
+    close = load_eth()['close'].values.astype(float)
+    close[[0, 1, 50, 51, 900]] = np.nan
+    condition = np.ones(len(close), dtype=bool)
+    condition[::4] = False
+    for period in (1, 14, 27):
+        expected = old_conditional_ema(close, condition, period)
+        actual = RangeFilter().conditional_ema(close, condition, period)
+        assert np.array_equal(np.isnan(expected), np.isnan(actual))
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_gainzy_rsi_and_colors_unchanged():
+    df = load_eth()
+    expected = old_gainzy_rsi(df['close'].values)
+    actual = RSIGainzy().calculate_rsi(df['close'].values)
+    assert np.array_equal(np.isnan(expected), np.isnan(actual))
+    np.testing.assert_allclose(actual, expected, rtol=1e-10)
+
+    new_colors = RSIGainzy().calculate_gainzy_colors(df)
+    old_indicator = RSIGainzy()
+    old_indicator.calculate_rsi = old_gainzy_rsi
+    old_colors = old_indicator.calculate_gainzy_colors(df)
+    assert list(new_colors) == list(old_colors)
+
+
+def test_pine_rma_and_rsi_signals_unchanged():
+    close = load_eth()['close']
+    changes = close.diff()
+    changes.iloc[300] = np.nan  # a gap in src re-seeds the rma from the sma
+    indicator = RSIBuySellIndicator()
+    for length in (2, 14):
+        expected = old_pine_rma(changes.clip(lower=0), length)
+        actual = indicator.pine_rma(changes.clip(lower=0), length)
+        assert np.array_equal(expected.isna().values, actual.isna().values)
+        np.testing.assert_allclose(actual.values, expected.values, rtol=1e-10)
+
+    new_rsi, new_buy, new_sell = indicator.generate_signals(close)
+    old_indicator = RSIBuySellIndicator()
+    old_indicator.pine_rma = old_pine_rma
+    old_rsi, old_buy, old_sell = old_indicator.generate_signals(close)
+    np.testing.assert_allclose(new_rsi.values, old_rsi.values, rtol=1e-10)
+    assert new_buy.equals(old_buy) and new_sell.equals(old_sell)
+
+
+def test_heiken_ashi_unchanged():
+    df = load_eth().rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'})
+    expected = old_heiken_ashi(df)
+    actual = df.copy()
+    calculate_heiken_ashi(actual)
+    for old_col, new_col in (('HA_Open', 'Open'), ('HA_High', 'High'), ('HA_Low', 'Low'), ('HA_Close', 'Close')):
+        assert np.array_equal(actual[new_col].values, expected[old_col].values), new_col
+
+
+if __name__ == "__main__":
+    test_backends_agree_bit_for_bit()
+    test_unknown_backend_rejected()
+    test_ema_step_matches_filter()
+    test_conditional_ema_matches_old()
+    test_gainzy_rsi_and_colors_unchanged()
+    test_pine_rma_and_rsi_signals_unchanged()
+    test_heiken_ashi_unchanged()
+    print("ALL RECURSION TESTS PASSED")
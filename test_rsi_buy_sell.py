@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Array-native RSIBuySellIndicator and the streaming RSIState against the old
+per-element .iloc implementation
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.rsi_buy_sell import RSIBuySellIndicator, RSIState
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def old_pine_rma(src, length):
+    """RSIBuySellIndicator.pine_rma with .iloc writes"""
+    result = pd.Series(index=src.index, dtype=float)
+    sma_initial = src.rolling(window=length).mean()
+    for i in range(len(src)):
+        if i < length - 1:
+            result.iloc[i] = np.nan
+        elif i == length - 1:
+            result.iloc[i] = sma_initial.iloc[i]
+        else:
+            prev_rma = result.iloc[i-1]
+            if pd.isna(prev_rma):
+                result.iloc[i] = sma_initial.iloc[i]
+            else:
+                result.iloc[i] = (src.iloc[i] + (length - 1) * prev_rma) / length
+    return result
+
+
+def old_generate_signals(prices, length=14, upper=70, lower=30):
+    """RSIBuySellIndicator.calculate_rsi / generate_signals with .iloc writes"""
+    changes = prices.diff()
+    up_rma = old_pine_rma(np.maximum(changes, 0), length)
+    down_rma = old_pine_rma(-np.minimum(changes, 0), length)
+    rsi = pd.Series(index=prices.index, dtype=float)
+    for i in range(len(prices)):
+        down_val = down_rma.iloc[i]
+        up_val = up_rma.iloc[i]
+        if pd.isna(down_val) or pd.isna(up_val):
+            rsi.iloc[i] = np.nan
+        elif down_val == 0:
+            rsi.iloc[i] = 100
+        elif up_val == 0:
+            rsi.iloc[i] = 0
+        else:
+            rsi.iloc[i] = 100 - (100 / (1 + up_val / down_val))
+    sell = (rsi.shift(1) > upper) & (rsi <= upper)
+    buy = (rsi.shift(1) < lower) & (rsi >= lower)
+    return rsi, buy, sell
+
+
+def load_close():
+    return pd.read_csv(DATA_FILE)['close'].astype(float)
+
+
+def test_generate_signals_match_old():
+    close = load_close()
+    close.iloc[500] = np.nan  # gap: both rmas go NaN and re-seed from the SMA
+    for length in (2, 14, 21):
+        expected = old_generate_signals(close, length)
+        actual = RSIBuySellIndicator(rsi_length=length).generate_signals(close)
+        assert np.array_equal(expected[0].isna().values, actual[0].isna().values)
+        np.testing.assert_allclose(actual[0].values, expected[0].values, rtol=1e-10)
+        assert actual[1].equals(expected[1]) and actual[2].equals(expected[2])
+        assert actual[0].index.equals(close.index)
+
+
+def test_fewer_bars_than_length():
+    close = load_close()
+    for n in range(1, 14):
+        prices = close.iloc[:n]
+        rsi, buy, sell = RSIBuySellIndicator().generate_signals(prices)
+        expected = old_generate_signals(prices)
+        assert rsi.isna().all() and expected[0].isna().all(), n
+        assert not buy.any() and not sell.any(), n
+        assert buy.equals(expected[1]) and sell.equals(expected[2]), n
+    assert np.isnan(RSIBuySellIndicator.rma_values(close.values[:8], 14)).all()
+
+
+def test_flat_and_one_way_prices():
+    indicator = RSIBuySellIndicator(rsi_length=5)
+    rising = pd.Series(np.arange(1.0, 21.0))
+    falling = rising[::-1].reset_index(drop=True)
+    flat = pd.Series(np.full(20, 7.0))
+    assert (indicator.calculate_rsi(rising).iloc[5:] == 100).all()   # down == 0 -> 100
+    assert (indicator.calculate_rsi(falling).iloc[5:] == 0).all()    # up == 0 -> 0
+    assert (indicator.calculate_rsi(flat).iloc[5:] == 100).all()     # down == 0 wins over up == 0
+    assert indicator.calculate_rsi(rising).iloc[:5].isna().all()     # SMA seed needs 5 changes
+
+
+def test_state_matches_batch_bit_for_bit():
+    close = load_close()
+    close.iloc[[300, 301, 1200]] = np.nan
+    rsi, buy, sell = RSIBuySellIndicator().generate_signals_values(close.values)
+
+    state = RSIState()
+    streamed = [state.update(c) for c in close.values]
+    streamed_rsi = np.array([row[0] for row in streamed])
+    assert np.array_equal(streamed_rsi, rsi, equal_nan=True)
+    assert np.array_equal([row[1] for row in streamed], buy)
+    assert np.array_equal([row[2] for row in streamed], sell)
+
+
+def test_state_peek_does_not_advance():
+    close = load_close().values
+    state = RSIState()
+    state.seed(close[:-1])
+    before = (state.state['up_rma'], state.state['down_rma'], list(state.state['up_window']))
+    peeked = state.peek(close[-1])
+    assert (state.state['up_rma'], state.state['down_rma'], list(state.state['up_window'])) == before
+    assert state.update(close[-1]) == peeked
+
+
+if __name__ == "__main__":
+    test_generate_signals_match_old()
+    test_fewer_bars_than_length()
+    test_flat_and_one_way_prices()
+    test_state_matches_batch_bit_for_bit()
+    test_state_peek_does_not_advance()
+    print("ALL RSI BUY/SELL TESTS PASSED")
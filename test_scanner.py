@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Multi-symbol scanner (module/scanner.py): the shared memory / process pool scan
+gives every symbol the same live Signal_Final as running the pipeline on it alone
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+from module.scanner import SharedCandles, scan_symbols, summarize_signals, SUMMARY_COLUMNS
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def symbol_frames(count=12, bars=300, step=97):
+    """Overlapping slices of data/ETHUSD.csv standing in for different symbols"""
+    df = pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+    return {f"SYM{k:02d}": df.iloc[k * step:k * step + bars].reset_index(drop=True) for k in range(count)}
+
+
+def expected_table(frames):
+    pipeline = signal_pipeline(heiken=True)
+    rows = {symbol: summarize_signals(symbol, pipeline.run(df, MAIN_SIGNAL_COLUMNS, window=200))
+            for symbol, df in frames.items()}
+    return pd.DataFrame(rows.values(), columns=SUMMARY_COLUMNS).set_index('symbol')
+
+
+def test_shared_candles_round_trip():
+    frames = symbol_frames(4)
+    with SharedCandles(frames) as candles:
+        for k, (symbol, df) in enumerate(frames.items()):
+            frame = candles.frame(k)
+            assert frame['time'].dtype == np.int64
+            for col in ('time', 'open', 'high', 'low', 'close', 'volume'):
+                assert np.array_equal(frame[col].values, df[col].values), (symbol, col)
+
+
+def test_scan_matches_single_symbol_pipeline():
+    frames = symbol_frames()
+    expected = expected_table(frames)
+    for processes in (0, 2):
+        table = scan_symbols(frames, processes=processes)
+        assert sorted(table['symbol']) == sorted(frames)
+        pd.testing.assert_frame_equal(table.set_index('symbol').loc[expected.index], expected,
+                                      check_dtype=False)
+
+
+def test_ranking_puts_firing_symbols_first():
+    table = scan_symbols(symbol_frames(), processes=0)
+    firing = (table['Signal_Final'] != 0).values
+    assert not np.any(firing[1:] & ~firing[:-1])
+    quiet = table[~firing]['bars_since_signal'].values
+    known = quiet[~np.isnan(quiet)]
+    assert np.all(np.diff(known) >= 0)
+    assert np.all(np.isnan(quiet[len(known):]))
+
+
+if __name__ == "__main__":
+    test_shared_candles_round_trip()
+    test_scan_matches_single_symbol_pipeline()
+    test_ranking_puts_firing_symbols_first()
+    print("ALL SCANNER TESTS PASSED")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Per-candle memoization (module/signal_cache.py): repeated requests for the same
+kline window reuse the result, any OHLCV change recomputes it
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.signal_cache import SignalCache, KlineCache, kline_window_key
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def load_klines():
+    df = pd.read_csv(os.path.join(DATA_DIR, 'ETHUSD.csv'))
+    return df[['time', 'open', 'high', 'low', 'close', 'volume']].tail(200).reset_index(drop=True)
+
+
+class CountingPipeline:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, df):
+        self.calls += 1
+        df.rename(columns={'close': 'Close'}, inplace=True)  # mutates its input like calculate_signals
+        df['Signal_Final'] = np.sign(df['Close'].diff().fillna(0)).astype(int)
+        return df
+
+
+def test_same_window_computed_once():
+    cache, pipeline = SignalCache(), CountingPipeline()
+    first = cache.get_or_compute(load_klines(), pipeline)
+    for _ in range(5):
+        again = cache.get_or_compute(load_klines(), pipeline)
+        assert again.equals(first)
+    assert pipeline.calls == 1
+    assert cache.hits == 5 and cache.misses == 1
+
+
+def test_price_change_and_new_candle_recompute():
+    cache, pipeline = SignalCache(), CountingPipeline()
+    df = load_klines()
+    cache.get_or_compute(df.copy(), pipeline)
+
+    ticked = df.copy()
+    ticked.loc[ticked.index[-1], 'close'] += 0.05
+    result = cache.get_or_compute(ticked, pipeline)
+    assert pipeline.calls == 2
+    assert result['Close'].iloc[-1] == df['close'].iloc[-1] + 0.05
+
+    rolled = pd.concat([df.iloc[1:], df.iloc[-1:].assign(time=df['time'].iloc[-1] + 900)], ignore_index=True)
+    cache.get_or_compute(rolled, pipeline)
+    assert pipeline.calls == 3
+
+
+def test_hits_are_independent_copies():
+    cache, pipeline = SignalCache(), CountingPipeline()
+    cache.get_or_compute(load_klines(), pipeline)
+    hit = cache.get_or_compute(load_klines(), pipeline)
+    hit.rename(columns={'Close': 'close'}, inplace=True)
+    hit['Signal_Final'] = 99
+    again = cache.get_or_compute(load_klines(), pipeline)
+    assert 'Close' in again.columns and (again['Signal_Final'] != 99).all()
+
+
+def test_key_ignores_column_case_and_dtype():
+    df = load_klines()
+    upper = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'})
+    as_text = df.astype({'open': str, 'close': str})
+    as_text['open'] = pd.to_numeric(as_text['open'])
+    as_text['close'] = pd.to_numeric(as_text['close'])
+    assert kline_window_key(df) == kline_window_key(upper) == kline_window_key(as_text)
+    assert kline_window_key(df)[0] == df['time'].iloc[-1]
+
+
+def test_failed_pipeline_not_cached():
+    cache = SignalCache()
+    calls = []
+    assert cache.get_or_compute(load_klines(), lambda df: calls.append(1)) is None
+    assert cache.get_or_compute(load_klines(), lambda df: calls.append(1)) is None
+    assert len(calls) == 2 and not cache.entries
+
+
+def test_cache_is_bounded():
+    cache, pipeline = SignalCache(maxsize=2), CountingPipeline()
+    df = load_klines()
+    for shift in range(5):
+        cache.get_or_compute(df.assign(close=df['close'] + shift), pipeline)
+    assert len(cache.entries) == 2
+
+
+def test_kline_cache_reuses_recent_fetch():
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return load_klines()
+
+    cache = KlineCache(max_age=60)
+    first = cache.get(fetch)
+    second = cache.get(fetch)
+    assert len(fetches) == 1 and second.equals(first) and second is not first
+
+    disabled = KlineCache(max_age=0)
+    disabled.get(fetch)
+    disabled.get(fetch)
+    assert len(fetches) == 3
+
+
+if __name__ == "__main__":
+    test_same_window_computed_once()
+    test_price_change_and_new_candle_recompute()
+    test_hits_are_independent_copies()
+    test_key_ignores_column_case_and_dtype()
+    test_failed_pipeline_not_cached()
+    test_cache_is_bounded()
+    test_kline_cache_reuses_recent_fetch()
+    print("ALL SIGNAL CACHE TESTS PASSED")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Golden test: the event-scan Signal_Final combiner must reproduce the per-row
+df.iloc loop of main.calculate_signals
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.signal_final import combine_signal_final, new_signal_edges
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SIGNAL_COLS = ['RF_BuySignal', 'RF_SellSignal', 'GreenArrow', 'RedArrow', 'rsi_buy', 'rsi_sell']
+
+
+def old_signal_final(df, n_candle_lookback=5):
+    """The Signal_Final loop of main.calculate_signals before the combiner"""
+    df = df.copy()
+    df['Signal_Final'] = 0
+
+    # Configuration variable for RF signal lookback period
+    N_CANDLE_LOOKBACK = n_candle_lookback
+
+    # Initialize signal tracking variables
+    last_rf_buy_signal = False
+    last_rf_sell_signal = False
+    rf_signal_candle = -1
+    rf_used = False
+
+    # Initialize IB Arrow signal tracking variables
+    last_green_arrow = False
+    last_red_arrow = False
+    arrow_signal_candle = -1
+    arrow_used = False
+
+    # Initialize RSI signal tracking variables
+    last_rsi_buy_signal = False
+    last_rsi_sell_signal = False
+    rsi_signal_candle = -1
+    rsi_used = False
+
+    for i in range(len(df)):
+        row = df.iloc[i]
+        prev_row = df.iloc[i - 1] if i > 0 else None
+
+        # Detect new RF signals (transition from 0 to 1)
+        current_rf_buy = row['RF_BuySignal'] == 1
+        current_rf_sell = row['RF_SellSignal'] == 1
+
+        new_rf_buy = current_rf_buy and (prev_row is None or prev_row['RF_BuySignal'] != 1)
+        new_rf_sell = current_rf_sell and (prev_row is None or prev_row['RF_SellSignal'] != 1)
+
+        # Detect new IB Arrow signals
+        new_green_arrow = row['GreenArrow'] == 1 and (prev_row is None or prev_row['GreenArrow'] != 1)
+        new_red_arrow = row['RedArrow'] == 1 and (prev_row is None or prev_row['RedArrow'] != 1)
+
+        # Detect new RSI signals
+        new_rsi_buy = row['rsi_buy'] == 1 and (prev_row is None or prev_row['rsi_buy'] != 1)
+        new_rsi_sell = row['rsi_sell'] == 1 and (prev_row is None or prev_row['rsi_sell'] != 1)
+
+        # Update RF signal tracking
+        if new_rf_buy:
+            last_rf_buy_signal = True
+            last_rf_sell_signal = False
+            rf_signal_candle = i
+            rf_used = False
+        elif new_rf_sell:
+            last_rf_sell_signal = True
+            last_rf_buy_signal = False
+            rf_signal_candle = i
+            rf_used = False
+
+        # Update IB Arrow signal tracking
+        if new_green_arrow:
+            last_green_arrow = True
+            last_red_arrow = False
+            arrow_signal_candle = i
+            arrow_used = False
+        elif new_red_arrow:
+            last_red_arrow = True
+            last_green_arrow = False
+            arrow_signal_candle = i
+            arrow_used = False
+
+        # Update RSI signal tracking
+        if new_rsi_buy:
+            last_rsi_buy_signal = True
+            last_rsi_sell_signal = False
+            rsi_signal_candle = i
+            rsi_used = False
+        elif new_rsi_sell:
+            last_rsi_sell_signal = True
+            last_rsi_buy_signal = False
+            rsi_signal_candle = i
+            rsi_used = False
+
+        # Reset signals if they're older than specified timeframes and not used
+        # RF signals valid for N_CANDLE_LOOKBACK candles until IB trigger
+        if (i - rf_signal_candle) > N_CANDLE_LOOKBACK and (last_rf_buy_signal or last_rf_sell_signal) and not rf_used:
+            last_rf_buy_signal = False
+            last_rf_sell_signal = False
+            rf_used = False
+
+        # IB Arrow signals valid for 1 candle for RF confirmation
+        if (i - arrow_signal_candle) > 1 and (last_green_arrow or last_red_arrow) and not arrow_used:
+            last_green_arrow = False
+            last_red_arrow = False
+            arrow_used = False
+
+        # RSI signals valid for 1 candle for IB confirmation
+        if (i - rsi_signal_candle) > 1 and (last_rsi_buy_signal or last_rsi_sell_signal) and not rsi_used:
+            last_rsi_buy_signal = False
+            last_rsi_sell_signal = False
+            rsi_used = False
+
+        signal = 0
+
+        # CONDITION 4: IB and RF in same candle (Highest Priority)
+        if new_rf_buy and new_green_arrow and not rf_used and not arrow_used:
+            signal = 2  # RF + IB_Box buy signal (same candle)
+            rf_used = True
+            arrow_used = True
+            last_rf_buy_signal = False
+            last_green_arrow = False
+        elif new_rf_sell and new_red_arrow and not rf_used and not arrow_used:
+            signal = -2  # RF + IB_Box sell signal (same candle)
+            rf_used = True
+            arrow_used = True
+            last_rf_sell_signal = False
+            last_red_arrow = False
+        
+        # CONDITION 1: RF signal first, then IB box after few candles
+        elif last_rf_buy_signal and not rf_used and new_green_arrow:
+            signal = 2  # RF + IB_Box buy signal
+            rf_used = True
+            arrow_used = True
+            last_rf_buy_signal = False
+            last_green_arrow = False
+        elif last_rf_sell_signal and not rf_used and new_red_arrow:
+            signal = -2  # RF + IB_Box sell signal
+            rf_used = True
+            arrow_used = True
+            last_rf_sell_signal = False
+            last_red_arrow = False
+
+        # CONDITION 2: IB box first, then RF signal on immediate next candle
+        elif last_green_arrow and not arrow_used and new_rf_buy and (i - arrow_signal_candle) == 1:
+            signal = 2  # RF + IB_Box buy signal
+            arrow_used = True
+            rf_used = True
+            last_green_arrow = False
+            last_rf_buy_signal = False
+        elif last_red_arrow and not arrow_used and new_rf_sell and (i - arrow_signal_candle) == 1:
+            signal = -2  # RF + IB_Box sell signal
+            arrow_used = True
+            rf_used = True
+            last_red_arrow = False
+            last_rf_sell_signal = False
+
+        # CONDITION 5: RSI and IB in same candle
+        elif signal == 0 and new_rsi_buy and new_green_arrow and not rsi_used:
+            signal = 4  # RSI + IB_Box buy signal (same candle)
+            rsi_used = True
+            last_rsi_buy_signal = False
+        elif signal == 0 and new_rsi_sell and new_red_arrow and not rsi_used:
+            signal = -4  # RSI + IB_Box sell signal (same candle)
+            rsi_used = True
+            last_rsi_sell_signal = False
+
+        # CONDITION 3: RSI signal first, then IB on immediate next candle
+        elif signal == 0 and last_rsi_buy_signal and not rsi_used and new_green_arrow and (i - rsi_signal_candle) == 1:
+            signal = 4  # RSI + IB_Box buy signal
+            rsi_used = True
+            last_rsi_buy_signal = False
+        elif signal == 0 and last_rsi_sell_signal and not rsi_used and new_red_arrow and (i - rsi_signal_candle) == 1:
+            signal = -4  # RSI + IB_Box sell signal
+            rsi_used = True
+            last_rsi_sell_signal = False
+
+        # Assign the final signal
+        df.iat[i, df.columns.get_loc('Signal_Final')] = signal
+
+    return df['Signal_Final'].values
+
+
+def combine(df, n_candle_lookback=5):
+    return combine_signal_final(*(df[col].values for col in SIGNAL_COLS), n_candle_lookback=n_candle_lookback)
+
+
+def random_signals(n, seed, density):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({col: (rng.random(n) < density).astype(int) for col in SIGNAL_COLS})
+    df['rsi_buy'] = df['rsi_buy'].astype(bool)   # the bot has bools here
+    df['rsi_sell'] = df['rsi_sell'].astype(bool)
+    return df
+
+
+def test_golden_delta_final_files():
+    for name in ('Delta_Final.csv', 'ETHUSD_Final_main.csv'):
+        df = pd.read_csv(os.path.join(DATA_DIR, name), index_col=0)
+        expected = old_signal_final(df)
+        actual = combine(df)
+        assert np.array_equal(actual, expected), name
+        print(f"{name}: {np.count_nonzero(expected)} signals {sorted(set(expected.tolist()))}")
+
+
+def test_matches_old_loop_on_dense_random_signals():
+    for seed in range(30):
+        df = random_signals(300, seed, density=[0.05, 0.15, 0.35][seed % 3])
+        for lookback in (0, 1, 5):
+            assert np.array_equal(combine(df, lookback), old_signal_final(df, lookback)), (seed, lookback)
+
+
+def test_priority_and_used_flags():
+    n = 12
+    df = pd.DataFrame({col: np.zeros(n, dtype=int) for col in SIGNAL_COLS})
+    df.loc[2, 'RF_BuySignal'] = 1          # RF buy ...
+    df.loc[4, 'GreenArrow'] = 1            # ... then an arrow inside the lookback -> 2
+    df.loc[5, 'GreenArrow'] = 1            # arrow still 1: not a new edge, RF already used
+    df.loc[8, ['rsi_buy', 'GreenArrow']] = 1   # RSI + arrow on the same candle -> 4
+    signals = combine(df)
+    assert signals.tolist() == [0, 0, 0, 0, 2, 0, 0, 0, 4, 0, 0, 0]
+
+
+def test_new_signal_edges():
+    assert new_signal_edges([1, 1, 0, 1, True, False]).tolist() == [True, False, False, True, False, False]
+
+
+if __name__ == "__main__":
+    test_golden_delta_final_files()
+    test_matches_old_loop_on_dense_random_signals()
+    test_priority_and_used_flags()
+    test_new_signal_edges()
+    print("ALL SIGNAL_FINAL TESTS PASSED")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+As-of signal history (module/signal_history.py): one forward pass over the
+updates gives the same signal at every update as recomputing the whole frame
+with the forming candle appended
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+from module.signal_final import SignalFinalState, combine_signal_final
+from module.signal_history import (RepaintLog, intrabar_updates, replay_signal_history,
+                                   COMPONENTS)
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def load_updates(n=1500):
+    """15m forming-candle snapshots from the 5m candles in data/ETHUSD.csv"""
+    df = pd.read_csv(DATA_FILE).sort_values('time').tail(n)
+    return intrabar_updates(df, 900)
+
+
+def recompute_asof(updates, k, heiken):
+    """The naive O(n) per update answer: closed candles + the snapshot, full recompute"""
+    closed = updates.iloc[:k + 1]
+    closed = closed[(closed['time'].shift(-1) != closed['time']) | (closed.index == closed.index[-1])]
+    frame = closed[['time', 'open', 'high', 'low', 'close']].reset_index(drop=True)
+    return signal_pipeline(heiken=heiken).run(frame, MAIN_SIGNAL_COLUMNS).iloc[-1]
+
+
+def test_intrabar_updates():
+    df = pd.read_csv(DATA_FILE).sort_values('time').tail(30).reset_index(drop=True)
+    updates = intrabar_updates(df, 900)
+    assert len(updates) == len(df)
+    assert (updates['time'] % 900 == 0).all()
+    last_candle = updates[updates['time'] == updates['time'].iloc[-1]]
+    raw = df[df['time'] >= last_candle['time'].iloc[0]]
+    assert last_candle['open'].nunique() == 1 and last_candle['open'].iloc[0] == raw['open'].iloc[0]
+    assert np.array_equal(last_candle['high'].values, raw['high'].cummax().values)
+    assert np.array_equal(last_candle['low'].values, raw['low'].cummin().values)
+    assert np.array_equal(last_candle['volume'].values, raw['volume'].cumsum().values)
+    assert (updates['asof'] == df['time'] + 300).all()
+
+
+def test_final_rows_match_batch_pipeline():
+    updates = load_updates()
+    for heiken in (True, False):
+        log = replay_signal_history(updates, heiken=heiken)
+        final = log.final()
+        candles = updates[np.r_[updates['time'].values[1:] != updates['time'].values[:-1], True]]
+        batch = signal_pipeline(heiken=heiken).run(candles.reset_index(drop=True), MAIN_SIGNAL_COLUMNS)
+        assert np.array_equal(final['time'].values, batch['time'].values)
+        for col in COMPONENTS + ('Signal_Final',):
+            assert np.array_equal(final[col].values, batch[col].values.astype(final[col].dtype)), col
+        assert (final['Signal_Final'] != 0).sum() > 0
+
+
+def test_every_update_matches_naive_recompute():
+    updates = load_updates(600)
+    for heiken in (True, False):
+        log = replay_signal_history(updates, heiken=heiken).to_frame()
+        for k in range(len(updates) - 90, len(updates)):
+            expected = recompute_asof(updates, k, heiken)
+            for col in COMPONENTS + ('Signal_Final',):
+                assert log[col].iloc[k] == expected[col], (heiken, k, col)
+
+
+def test_repaint_summary_and_candle_query():
+    updates = load_updates()
+    log = replay_signal_history(updates)
+    summary = log.repaints()
+    frame = log.to_frame()
+
+    assert len(summary) == updates['time'].nunique()
+    assert summary['updates'].sum() == len(log)
+    assert np.array_equal(summary['final_signal'].values, log.final()['Signal_Final'].values)
+
+    for _, row in summary.iterrows():
+        signals = frame.loc[frame['time'] == row['time'], 'Signal_Final'].values
+        assert row['flips'] == np.count_nonzero(np.diff(signals))
+        assert row['repainted'] == bool(((signals != 0) & (signals != signals[-1])).any())
+        nonzero = signals[signals != 0]
+        assert row['first_signal'] == (nonzero[0] if len(nonzero) else 0)
+
+    candle_time = summary['time'].iloc[len(summary) // 2]
+    candle = log.candle(candle_time)
+    assert (candle['time'] == candle_time).all() and candle['final'].iloc[-1] and not candle['final'].iloc[:-1].any()
+    try:
+        log.candle(candle_time + 1)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("candle() found a candle that does not exist")
+
+    empty = RepaintLog({name: np.empty(0) for name in frame.columns})
+    assert len(empty.repaints()) == 0
+
+
+def test_signal_final_state_matches_combiner():
+    state = SignalFinalState()
+    rng = np.random.default_rng(5)
+    values = rng.integers(0, 2, size=(400, 6))
+    expected = combine_signal_final(*values.T)
+    for i, row in enumerate(values):
+        assert state.peek(*row) == expected[i]
+        assert state.update(*row) == expected[i]
+
+
+if __name__ == "__main__":
+    test_intrabar_updates()
+    test_final_rows_match_batch_pipeline()
+    test_every_update_matches_naive_recompute()
+    test_repaint_summary_and_candle_query()
+    test_signal_final_state_matches_combiner()
+    print("ALL SIGNAL HISTORY TESTS PASSED")
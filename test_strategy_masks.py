@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+K-mode bitmask evaluator (module/strategy_masks.py): every K-mode column
+matches SignalManager.should_take_trade on the same signals, bar by bar
+"""
+
+import sys
+import os
+import itertools
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.pipeline import signal_pipeline, IMPORTANT_SIGNAL_COLUMNS
+from module.signal_manager import SignalManager
+from module.strategy_masks import (SIGNAL_BITS, STRATEGY_COLUMNS, encode_signals, encode_signal_frame,
+                                   evaluate_strategies, strategy_bits)
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+FLAG_NAMES = [name for name in SIGNAL_BITS if not name.startswith('gaizy')]
+COLORS = ['black', 'bright_green', 'dark_green', 'green', 'light_green', 'red', 'pink', 'blue']
+
+
+def open_manager():
+    manager = SignalManager()
+    manager.waiting_for_fail = False
+    return manager
+
+
+def frame_signals(df, i):
+    """The SignalManager signals dict of bar i of a pipeline frame"""
+    row = df.iloc[i]
+    prev = df.iloc[i - 1] if i > 0 else None
+    signals = {
+        'rf_buy': row['RF_BuySignal'] == 1, 'rf_sell': row['RF_SellSignal'] == 1,
+        'rsi_buy': bool(row['rsi_buy']), 'rsi_sell': bool(row['rsi_sell']),
+        'ib_buy': bool(row['GreenArrow']), 'ib_sell': bool(row['RedArrow']),
+        'rsi_gaizy': row['gaizy_color'],
+    }
+    for name, column in (('rf_buy', 'RF_BuySignal'), ('rf_sell', 'RF_SellSignal'),
+                         ('rsi_buy', 'rsi_buy'), ('rsi_sell', 'rsi_sell')):
+        signals[name + '_prev'] = prev is not None and prev[column] == 1
+    return signals
+
+
+def test_every_flag_combination_matches_signal_manager():
+    manager = open_manager()
+    for bits in itertools.product((False, True), repeat=len(FLAG_NAMES)):
+        for color in COLORS:
+            signals = dict(zip(FLAG_NAMES, bits), rsi_gaizy=color)
+            taken = strategy_bits([encode_signals(signals)])[0]
+            for k in STRATEGY_COLUMNS:
+                assert bool(taken >> k & 1) == manager.should_take_trade(signals, k), (signals, k)
+
+
+def test_history_columns_match_signal_manager():
+    klines = pd.read_csv(DATA_FILE).sort_values('time').tail(800).reset_index(drop=True)
+    df = signal_pipeline(heiken=True).run(klines, IMPORTANT_SIGNAL_COLUMNS)
+    df.loc[df.index[::7], 'gaizy_color'] = 'bright_green'   # the colors only SignalManager knows
+    strategies = evaluate_strategies(df)
+    assert list(strategies.columns) == list(STRATEGY_COLUMNS.values())
+    assert strategies.any().all()
+
+    masks = encode_signal_frame(df)
+    manager = open_manager()
+    for i in range(len(df)):
+        signals = frame_signals(df, i)
+        assert masks[i] == encode_signals(signals), i
+        for k in STRATEGY_COLUMNS:
+            expected = manager.should_take_trade(signals, k)
+            assert strategies[STRATEGY_COLUMNS[k]].iloc[i] == expected, (i, k)
+            assert manager.take_trade_from_strategies(strategies.iloc[i], k) == expected
+
+
+def test_waiting_for_fail_gate():
+    manager = SignalManager()
+    manager.waiting_for_fail = True
+    row = pd.Series({column: True for column in STRATEGY_COLUMNS.values()})
+    assert not manager.take_trade_from_strategies(row, 0)
+    manager.update_trade_result('loss')
+    assert manager.take_trade_from_strategies(row, 0)
+    assert not manager.take_trade_from_strategies(row, 7)
+
+
+if __name__ == "__main__":
+    test_every_flag_combination_matches_signal_manager()
+    test_history_columns_match_signal_manager()
+    test_waiting_for_fail_gate()
+    print("ALL STRATEGY MASK TESTS PASSED")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Multi-timeframe engine (module/timeframes.py): 15m / 1h candles built
+incrementally from the 5m candles of data/ETHUSD.csv match the batch
+aggregation, and every timeframe's signals match the pipeline on its own bars
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.pipeline import signal_pipeline, MAIN_SIGNAL_COLUMNS
+from module.timeframes import (CandleAggregator, MultiTimeframeEngine, aggregate_candles,
+                               interval_length)
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+TIMEFRAMES = {'15m': 900, '1h': 3600}
+
+
+def load_candles():
+    return pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+
+
+def test_interval_length():
+    assert interval_length('15m') == 900
+    assert interval_length('1h', unit=1000) == 3_600_000
+    assert interval_length('15') == interval_length('15m')
+    assert interval_length('60') == interval_length('1h')
+    assert interval_length('D') == interval_length('1d') == 86400
+
+
+def test_incremental_bars_match_batch():
+    candles = load_candles()
+    for length in TIMEFRAMES.values():
+        agg = CandleAggregator(length, source_length=300)
+        bars = [bar for candle in candles.to_dict('records') for bar in agg.update(candle)]
+        expected = aggregate_candles(candles, length, complete_only=True)
+        got = pd.DataFrame(bars)
+        complete = got['time'].isin(expected['time'])
+        pd.testing.assert_frame_equal(got[complete].reset_index(drop=True), expected[got.columns],
+                                      check_dtype=False)
+        assert (got['time'] % length == 0).all()
+
+
+def test_gap_closes_bar_and_duplicates_are_ignored():
+    agg = CandleAggregator(900, source_length=300)
+    assert agg.update({'time': 0, 'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 1}) == []
+    assert agg.update({'time': 0, 'open': 9, 'high': 9, 'low': 9, 'close': 9, 'volume': 9}) == []
+    # 300 is missing, the candle at 900 belongs to the next bar
+    closed = agg.update({'time': 900, 'open': 2, 'high': 3, 'low': 1, 'close': 2.5, 'volume': 2})
+    assert closed == [{'time': 0, 'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 1.0}]
+    assert agg.forming['time'] == 900
+    assert agg.update((1200, 2.5, 4, 2, 3, 1)) == []
+    closed = agg.update((1500, 3, 3.5, 2.5, 3.2, 1))
+    assert closed == [{'time': 900, 'open': 2.0, 'high': 4.0, 'low': 1.0, 'close': 3.2, 'volume': 4.0}]
+    assert agg.forming is None
+
+
+def test_timeframe_signals_match_pipeline():
+    candles = load_candles()
+    engine = MultiTimeframeEngine(TIMEFRAMES, source_length=300, history=10_000, heiken=True)
+    rows = {name: [] for name in TIMEFRAMES}
+    for candle in candles.to_dict('records'):
+        for name, row in engine.update(candle).items():
+            rows[name].append(row)
+
+    for name in TIMEFRAMES:
+        bars = engine.frame(name)
+        expected = signal_pipeline(heiken=True).run(bars, MAIN_SIGNAL_COLUMNS)
+        got = pd.DataFrame(rows[name])
+        assert np.array_equal(got['time'].values, bars['time'].values)
+        for col in ('Signal_Final', 'RF_BuySignal', 'RF_SellSignal', 'GreenArrow', 'RedArrow',
+                    'rsi_buy', 'rsi_sell', 'RF_Position'):
+            assert np.array_equal(got[col].values.astype(float), expected[col].values.astype(float)), (name, col)
+    assert len(engine.bars['15m']) == 4 * len(engine.bars['1h'])
+
+
+def test_confirm_gates_by_higher_timeframe_trend():
+    candles = load_candles()
+    engine = MultiTimeframeEngine(TIMEFRAMES, source_length=300)
+    assert engine.confirm('15m', '1h') is None
+    gated = []
+    for candle in candles.to_dict('records'):
+        if '15m' in engine.update(candle):
+            gated.append((engine.last['15m'], engine.confirm('15m', '1h')))
+    gated = [(row, result) for row, result in gated if result is not None]
+    assert gated
+    for row, result in gated:
+        if result['Signal_Final'] != 0:
+            assert result['Signal_Final'] == row['Signal_Final']
+            assert np.sign(result['Signal_Final']) == result['trend']
+        assert not result['GreenArrow'] or result['trend'] == 1
+        assert not result['RedArrow'] or result['trend'] == -1
+    assert any(row['Signal_Final'] != 0 and result['Signal_Final'] == 0 for row, result in gated)
+    assert engine.peek('15m') is None or 'Signal_Final' in engine.peek('15m')
+
+
+if __name__ == "__main__":
+    test_interval_length()
+    test_incremental_bars_match_batch()
+    test_gap_closes_bar_and_duplicates_are_ignored()
+    test_timeframe_signals_match_pipeline()
+    test_confirm_gates_by_higher_timeframe_trend()
+    print("ALL TIMEFRAME TESTS PASSED")
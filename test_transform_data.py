@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+transform_data.convert_to_complete_format: the array expression version gives
+the same frame as the old row-wise apply, the streaming CompleteFormatState the
+same rows, and important.py's copy the same columns without Signal_Final
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import important
+from transform_data import convert_to_complete_format, CompleteFormatState, COLUMNS_ORDER
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'SAMPLE.csv')
+
+
+def load_candles():
+    return pd.read_csv(DATA_FILE)[['timestamp', 'volume', 'close', 'open', 'high', 'low']]
+
+
+def old_convert_to_complete_format(df):
+    """convert_to_complete_format before the array rewrite (Signal_Final via df.apply)"""
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['price_change'] = df['close'].diff()
+    df['price_change_pct'] = df['close'].pct_change()
+
+    def calculate_rsi(data, periods=14):
+        delta = data.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+    df['RSI'] = calculate_rsi(df['close'])
+    df['RF_BuySignal'] = ((df['price_change'] > 0) & (df['RSI'] < 30)).astype(int)
+    df['RF_SellSignal'] = ((df['price_change'] < 0) & (df['RSI'] > 70)).astype(int)
+    df['rsi_buy'] = df['RSI'] < 30
+    df['rsi_sell'] = df['RSI'] > 70
+    df['gaizy_color'] = np.where(df['close'] > df['open'], 'green', 'black')
+    df['GreenArrow'] = (df['price_change_pct'] > 0.001) & (df['close'] > df['open'])
+    df['RedArrow'] = (df['price_change_pct'] < -0.001) & (df['close'] < df['open'])
+
+    def calculate_signal_final(row):
+        buy_conditions = [row['RF_BuySignal'] == 1, row['rsi_buy'] == True, row['GreenArrow'] == True,
+                          row['gaizy_color'] == 'green']
+        sell_conditions = [row['RF_SellSignal'] == 1, row['rsi_sell'] == True, row['RedArrow'] == True,
+                           row['gaizy_color'] == 'black']
+        if sum(buy_conditions) >= 2:
+            return 1
+        elif sum(sell_conditions) >= 2:
+            return -1
+        return 0
+
+    df['Signal_Final'] = df.apply(calculate_signal_final, axis=1)
+    df = df.rename(columns={'timestamp': 'Timestamp'})
+    df['time'] = df['Timestamp'].astype('datetime64[ns]').astype(np.int64) // 10**9
+    return df[COLUMNS_ORDER]
+
+
+def synthetic_candles(n=5000, seed=11):
+    """Random walk candles with flat stretches (zero changes) and large moves"""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 1, n) * rng.choice([0.0, 1.0, 40.0], size=n, p=[0.1, 0.8, 0.1])
+    close = 2000 + np.cumsum(steps)
+    open_ = close - rng.normal(0, 2, n)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=n, freq='min').astype(str),
+        'volume': rng.random(n), 'close': close, 'open': open_,
+        'high': np.maximum(open_, close) + 1, 'low': np.minimum(open_, close) - 1,
+    })
+
+
+def test_matches_row_wise_apply():
+    for candles in (load_candles(), synthetic_candles()):
+        expected = old_convert_to_complete_format(candles.copy())
+        result = convert_to_complete_format(candles.copy())
+        assert list(result.columns) == COLUMNS_ORDER
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        assert (result['Signal_Final'] != 0).sum() > 0
+
+
+def test_time_is_unix_seconds():
+    result = convert_to_complete_format(load_candles())
+    assert result['time'].iloc[0] == int(pd.Timestamp('2025-06-14 19:18:00').timestamp())
+    assert (np.diff(result['time'].values) == 60).all()
+
+
+def test_streaming_matches_batch():
+    candles = synthetic_candles(3000)
+    batch = convert_to_complete_format(candles)
+    state = CompleteFormatState()
+    rows = pd.DataFrame([state.update(candle) for candle in candles.to_dict('records')])
+    for col in COLUMNS_ORDER:
+        assert np.array_equal(rows[col].values, batch[col].values), col
+
+    # from_history + one appended candle = the batch row of that candle
+    appended = CompleteFormatState.from_history(candles.iloc[:-1]).update(candles.iloc[-1].to_dict())
+    assert appended == rows.iloc[-1].to_dict()
+
+
+def test_important_copy_has_no_signal_final():
+    candles = load_candles()
+    result = important.convert_to_complete_format(candles.copy())
+    assert list(result.columns) == COLUMNS_ORDER[:-1]
+    pd.testing.assert_frame_equal(result, convert_to_complete_format(candles)[COLUMNS_ORDER[:-1]])
+
+
+def test_column_names_any_case():
+    candles = load_candles()
+    expected = convert_to_complete_format(candles.copy())
+    renamed = candles.rename(columns={'volume': 'Volume', 'close': 'Close'})
+    pd.testing.assert_frame_equal(convert_to_complete_format(renamed), expected)
+    state = CompleteFormatState.from_history(renamed.iloc[:100])
+    assert state.last == CompleteFormatState.from_history(candles.iloc[:100]).last
+    print("  'Volume' / 'Close' columns OK")
+
+
+if __name__ == "__main__":
+    test_matches_row_wise_apply()
+    test_time_is_unix_seconds()
+    test_streaming_matches_batch()
+    test_important_copy_has_no_signal_final()
+    test_column_names_any_case()
+    print("ALL TRANSFORM DATA TESTS PASSED")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Warmup calculator (module/warmup.py): the formula bars per component and the
+empirical check that a warmup sized window gives the 200 candle signals
+"""
+
+import sys
+import os
+import math
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from module.warmup import ema_warmup, warmup_components, warmup_bars, verify_warmup, calibrate_warmup
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ETHUSD.csv')
+
+
+def load_klines():
+    return pd.read_csv(DATA_FILE).sort_values('time').reset_index(drop=True)
+
+
+def test_ema_warmup_is_the_smallest_bound():
+    for alpha in (0.5, 2.0 / 15, 2.0 / 28, 1.0 / 14):
+        for tolerance in (1e-2, 1e-3, 1e-4):
+            k = ema_warmup(alpha, tolerance)
+            assert (1 - alpha) ** k < tolerance or math.isclose((1 - alpha) ** k, tolerance)
+            assert (1 - alpha) ** (k - 1) > tolerance
+    assert ema_warmup(1.0) == 0
+
+
+def test_warmup_grows_with_precision():
+    loose, default, strict = (warmup_components(tolerance) for tolerance in (1e-2, 1e-3, 1e-4))
+    for name in ('heiken_ashi', 'range_filter', 'rsi'):
+        assert loose[name] < default[name] < strict[name], name
+    assert warmup_bars(1e-2) < warmup_bars(1e-3) < warmup_bars(1e-4)
+    assert warmup_components(heiken=False)['heiken_ashi'] == 0
+    assert 'gainzy' in warmup_components(pivot_length=10)
+    assert warmup_bars(output_bars=200) == warmup_bars(output_bars=2) + 198
+
+
+def test_warmup_window_matches_reference():
+    # candles 330-360 end inside a long inside bar sequence, the hardest windows of the file
+    df = load_klines().head(700)
+    bars = warmup_bars(1e-3)
+    result = verify_warmup(df, bars, reference_bars=200, step=1)
+    assert result['windows'] > 0
+    assert result['match_rate'] == 1.0
+    assert result['max_filter_error'] < 1e-3
+    assert verify_warmup(df.head(360), bars - 1, reference_bars=200, step=1)['mismatches'] > 0
+
+    short = verify_warmup(df, 40, reference_bars=300, step=5)
+    assert short['mismatches'] > 0
+
+
+def test_calibrate_warmup():
+    df = load_klines().head(400)
+    assert calibrate_warmup(df) == warmup_bars()
+
+
+if __name__ == "__main__":
+    test_ema_warmup_is_the_smallest_bound()
+    test_warmup_grows_with_precision()
+    test_warmup_window_matches_reference()
+    test_calibrate_warmup()
+    print("ALL WARMUP TESTS PASSED")
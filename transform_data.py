@@ -1,98 +1,181 @@
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime
 
-# Read the source file
-def convert_to_complete_format(df):
-    # df = pd.read_csv('Sample.csv')
-
-    # Convert timestamp to datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-    # Calculate price changes and patterns
-    df['price_change'] = df['close'].diff()
-    df['price_change_pct'] = df['close'].pct_change()
-
-    # Calculate RSI (Relative Strength Index)
-    def calculate_rsi(data, periods=14):
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-
-    df['RSI'] = calculate_rsi(df['close'])
-
-    # Calculate signals based on price movements and RSI
-    df['RF_BuySignal'] = ((df['price_change'] > 0) & (df['RSI'] < 30)).astype(int)
-    df['RF_SellSignal'] = ((df['price_change'] < 0) & (df['RSI'] > 70)).astype(int)
-
-    # RSI buy/sell signals
-    df['rsi_buy'] = df['RSI'] < 30
-    df['rsi_sell'] = df['RSI'] > 70
-
-    # Calculate gaizy color based on price movement
-    df['gaizy_color'] = np.where(df['close'] > df['open'], 'green', 'black')
-
-    # Calculate Green and Red arrows based on significant price movements
-    df['GreenArrow'] = (df['price_change_pct'] > 0.001) & (df['close'] > df['open'])
-    df['RedArrow'] = (df['price_change_pct'] < -0.001) & (df['close'] < df['open'])
-
-    # Calculate Signal_Final based on conditions
-    def calculate_signal_final(row):
-        # Buy conditions
-        buy_conditions = [
-            row['RF_BuySignal'] == 1,  # Random Forest Buy Signal
-            row['rsi_buy'] == True,    # RSI indicates oversold
-            row['GreenArrow'] == True, # Strong upward movement
-            row['gaizy_color'] == 'green'  # Price closed higher than open
-        ]
-        
-        # Sell conditions
-        sell_conditions = [
-            row['RF_SellSignal'] == 1,  # Random Forest Sell Signal
-            row['rsi_sell'] == True,    # RSI indicates overbought
-            row['RedArrow'] == True,    # Strong downward movement
-            row['gaizy_color'] == 'black'  # Price closed lower than open
-        ]
-        
-        # Calculate signal strength
-        buy_strength = sum(buy_conditions)
-        sell_strength = sum(sell_conditions)
-        
-        # Determine final signal
-        if buy_strength >= 2:  # At least 2 buy conditions met
-            return 1  # Buy signal
-        elif sell_strength >= 2:  # At least 2 sell conditions met
-            return -1  # Sell signal
-        else:
-            return 0  # No clear signal
-
-    # Apply the signal calculation to each row
-    df['Signal_Final'] = df.apply(calculate_signal_final, axis=1)
-
-    # Rename columns to match Sample2.csv
-    df = df.rename(columns={
-        'timestamp': 'Timestamp',
-        'Volume': 'volume',
-        'close': 'close',
-        'open': 'open',
-        'high': 'high',
-        'low': 'low'
-    })
-
-    # Add time column (Unix timestamp)
-    df['time'] = df['Timestamp'].astype(np.int64) // 10**9
-
-    # Reorder columns to match Sample2.csv
-    columns_order = [
-        'time', 'volume', 'Timestamp', 'close', 'open', 'high', 'low',
-        'RF_BuySignal', 'RF_SellSignal', 'rsi_buy', 'rsi_sell',
-        'gaizy_color', 'GreenArrow', 'RedArrow', 'Signal_Final'
-    ]
-    df = df[columns_order]
-
-    # Save the transformed data
-    # df.to_csv('Sample2.csv', index=False)
-    # print("Transformation completed successfully!") 
-    return df
\ No newline at end of file
+RSI_PERIODS = 14
+ARROW_CHANGE_PCT = 0.001  # GreenArrow / RedArrow need a close to close move above 0.1%
+
+# Columns of the complete format (Sample2.csv)
+COLUMNS_ORDER = [
+    'time', 'volume', 'Timestamp', 'close', 'open', 'high', 'low',
+    'RF_BuySignal', 'RF_SellSignal', 'rsi_buy', 'rsi_sell',
+    'gaizy_color', 'GreenArrow', 'RedArrow', 'Signal_Final'
+]
+
+
+def _candle_columns(df):
+    """The timestamp / volume / open / high / low / close columns of df, whatever their case ('Volume')"""
+    columns = {str(col).lower(): col for col in df.columns}
+    return {field: df[columns[field]] for field in ('timestamp', 'volume', 'open', 'high', 'low', 'close')}
+
+
+def _epoch_seconds(timestamps):
+    """Unix seconds of datetime64 values, whatever their resolution (ns, us, ms)"""
+    return ((timestamps - pd.Timestamp(0)) // pd.Timedelta(seconds=1)).astype(np.int64)
+
+
+def _rolling_rsi(close, periods=RSI_PERIODS):
+    """Simple moving average RSI; the first bar's change counts as 0 gain / 0 loss"""
+    delta = np.diff(close, prepend=np.nan)
+    gain = pd.Series(np.where(delta > 0, delta, 0.0)).rolling(window=periods).mean().values
+    loss = pd.Series(np.where(delta < 0, -delta, 0.0)).rolling(window=periods).mean().values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def _signal_final(rf_buy, rf_sell, rsi_buy, rsi_sell, green_arrow, red_arrow, green_candle):
+    """
+    1 when at least 2 of RF buy / RSI oversold / GreenArrow / green candle agree,
+    else -1 when at least 2 of RF sell / RSI overbought / RedArrow / black candle
+    agree, else 0. Works on scalars and arrays.
+    """
+    buy_strength = (np.asarray(rf_buy) == 1).astype(int) + rsi_buy + green_arrow + green_candle
+    sell_strength = (np.asarray(rf_sell) == 1).astype(int) + rsi_sell + red_arrow + ~np.asarray(green_candle)
+    return np.where(buy_strength >= 2, 1, np.where(sell_strength >= 2, -1, 0))
+
+
+def convert_to_complete_format(df, signal_final=True):
+    """
+    Sample.csv style candles (timestamp, volume, open, high, low, close) -> the
+    complete format (COLUMNS_ORDER). All columns are array expressions over the
+    whole frame; signal_final=False leaves Signal_Final out (important.py).
+    """
+    candles = _candle_columns(df)
+    timestamp = pd.to_datetime(candles['timestamp'])
+    close = candles['close'].values.astype(float)
+    open_ = candles['open'].values.astype(float)
+
+    # Price changes and RSI
+    price_change = np.diff(close, prepend=np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change_pct = price_change / np.r_[np.nan, close[:-1]]
+    rsi = _rolling_rsi(close)
+
+    rsi_buy = rsi < 30
+    rsi_sell = rsi > 70
+    green_candle = close > open_
+    green_arrow = (price_change_pct > ARROW_CHANGE_PCT) & green_candle
+    red_arrow = (price_change_pct < -ARROW_CHANGE_PCT) & (close < open_)
+    rf_buy = ((price_change > 0) & rsi_buy).astype(int)
+    rf_sell = ((price_change < 0) & rsi_sell).astype(int)
+
+    result = pd.DataFrame({
+        'time': _epoch_seconds(timestamp).values,
+        'volume': candles['volume'].values,
+        'Timestamp': timestamp.values,
+        'close': candles['close'].values,
+        'open': candles['open'].values,
+        'high': candles['high'].values,
+        'low': candles['low'].values,
+        'RF_BuySignal': rf_buy,
+        'RF_SellSignal': rf_sell,
+        'rsi_buy': rsi_buy,
+        'rsi_sell': rsi_sell,
+        'gaizy_color': np.where(green_candle, 'green', 'black'),
+        'GreenArrow': green_arrow,
+        'RedArrow': red_arrow,
+    }, index=df.index)
+    if signal_final:
+        result['Signal_Final'] = _signal_final(rf_buy, rf_sell, rsi_buy, rsi_sell, green_arrow, red_arrow,
+                                               green_candle)
+    return result
+
+
+class CompleteFormatState:
+    """
+    Streaming convert_to_complete_format - appends one candle at a time
+
+    Keeps the previous close and the last RSI_PERIODS gains / losses, so a new
+    candle costs O(periods) instead of re-converting the whole frame.
+
+    Usage:
+        state = CompleteFormatState.from_history(candles)   # or CompleteFormatState()
+        row = state.update(candle)      # dict with the COLUMNS_ORDER keys
+
+    The rows match convert_to_complete_format on the same candles (the RSI
+    to rounding, the signal columns exactly).
+    """
+
+    def __init__(self, periods=RSI_PERIODS, signal_final=True):
+        self.periods = periods
+        self.signal_final = signal_final
+        self.reset()
+
+    def reset(self):
+        """Forget all history - the next candle is treated as the first"""
+        self.prev_close = np.nan
+        self.gains = deque(maxlen=self.periods)
+        self.losses = deque(maxlen=self.periods)
+        self.last = None
+
+    def update(self, candle):
+        """Append one candle (dict / Series with timestamp, volume, open, high, low, close), returns its row"""
+        timestamp = pd.Timestamp(candle['timestamp'])
+        close = float(candle['close'])
+        open_ = float(candle['open'])
+
+        price_change = close - self.prev_close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change_pct = np.float64(price_change) / np.float64(self.prev_close)
+        self.gains.append(price_change if price_change > 0 else 0.0)
+        self.losses.append(-price_change if price_change < 0 else 0.0)
+        self.prev_close = close
+
+        rsi = np.nan
+        if len(self.gains) == self.periods:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rsi = 100 - (100 / (1 + np.float64(np.mean(self.gains)) / np.float64(np.mean(self.losses))))
+
+        rsi_buy = bool(rsi < 30)
+        rsi_sell = bool(rsi > 70)
+        green_candle = close > open_
+        green_arrow = bool(price_change_pct > ARROW_CHANGE_PCT) and green_candle
+        red_arrow = bool(price_change_pct < -ARROW_CHANGE_PCT) and close < open_
+        rf_buy = int(price_change > 0 and rsi_buy)
+        rf_sell = int(price_change < 0 and rsi_sell)
+
+        row = {
+            'time': int((timestamp - pd.Timestamp(0)) // pd.Timedelta(seconds=1)),
+            'volume': candle['volume'],
+            'Timestamp': timestamp,
+            'close': candle['close'],
+            'open': candle['open'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'RF_BuySignal': rf_buy,
+            'RF_SellSignal': rf_sell,
+            'rsi_buy': rsi_buy,
+            'rsi_sell': rsi_sell,
+            'gaizy_color': 'green' if green_candle else 'black',
+            'GreenArrow': green_arrow,
+            'RedArrow': red_arrow,
+        }
+        if self.signal_final:
+            row['Signal_Final'] = int(_signal_final(rf_buy, rf_sell, rsi_buy, rsi_sell, green_arrow, red_arrow,
+                                                    green_candle))
+        self.last = row
+        return row
+
+    def seed(self, df):
+        """Replay candles from history, returns the row of the last one"""
+        self.reset()
+        for candle in pd.DataFrame(_candle_columns(df)).to_dict('records'):
+            self.update(candle)
+        return self.last
+
+    @classmethod
+    def from_history(cls, df, **params):
+        state = cls(**params)
+        state.seed(df)
+        return state
@@ -1,6 +1,6 @@
-import requests
 import json
 from datetime import datetime
+from module.http_session import get_session
 
 def send_webhook(url, data):
     """
@@ -21,7 +21,7 @@ def send_webhook(url, data):
             'Accept': 'application/json'
         }
         
-        response = requests.post(url, json=payload, headers=headers)
+        response = get_session(url).post(url, json=payload, headers=headers)
         
         if response.status_code == 200:
             print(f"Webhook sent successfully: {json.dumps(payload, indent=2)}")
@@ -1359,53 +1359,6 @@ def is_time_in_range_ist():
     end_time = time(END_HOUR, END_MINUTE)
     return start_time <= current_time <= end_time
 
-def calculate_heiken_ashi_testnet(df):
-    try:
-        # print("heiken-ashi is being calculated.")
-        # Ensure required columns exist
-        required_cols = {'Open', 'High', 'Low', 'Close'}
-        if not required_cols.issubset(df.columns):
-            raise ValueError(f"DataFrame must contain the following columns: {required_cols}")
-
-        # Create new columns for Heiken-Ashi
-        df['HA_Close'] = (df['Open'] + df['High'] + df['Low'] + df['Close']) / 4
-        df['HA_Open'] = 0.0
-        df['HA_High'] = 0.0
-        df['HA_Low'] = 0.0
-
-        # Initialize first HA_Open
-        df.at[df.index[0], 'HA_Open'] = (df.at[df.index[0], 'Open'] + df.at[df.index[0], 'Close']) / 2
-
-        # Calculate remaining Heiken-Ashi values
-        for i in range(1, len(df)):
-            prev_ha_open = df.at[df.index[i - 1], 'HA_Open']
-            prev_ha_close = df.at[df.index[i - 1], 'HA_Close']
-
-            df.at[df.index[i], 'HA_Open'] = (prev_ha_open + prev_ha_close) / 2
-            df.at[df.index[i], 'HA_High'] = max(
-                df.at[df.index[i], 'High'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-            df.at[df.index[i], 'HA_Low'] = min(
-                df.at[df.index[i], 'Low'],
-                df.at[df.index[i], 'HA_Open'],
-                df.at[df.index[i], 'HA_Close']
-            )
-
-        # Replace original OHLC columns with Heiken-Ashi values
-        df.drop(columns=['Open', 'High', 'Low', 'Close'], inplace=True)
-        df.rename(columns={
-            'HA_Open': 'Open',
-            'HA_High': 'High',
-            'HA_Low': 'Low',
-            'HA_Close': 'Close'
-        }, inplace=True)
-        return df
-        # print("DONE")
-    except Exception as e:
-        print(f"Error in heiken-ashi calculation : {e}")
-
 def calculate_takeprofit( entry_price, side):
     """Calculate take profit based on risk-reward ratio"""
     try:
@@ -1,33 +1,11 @@
 # replace this function with the function to calculate signals 
 from config import *
-from important import calculate_heiken_ashi
+from module.pipeline import signal_pipeline, TYPE1_3_SIGNAL_COLUMNS
 
 def calculate_signals(df):
     try:
-        from module.rf import RangeFilter
-        from module.ib_indicator import calculate_inside_ib_box
-        from module.rsi_gaizy import RSIGainzy
-        from module.rsi_buy_sell import RSIBuySellIndicator
-        rf = RangeFilter()
-        bsrsi = RSIBuySellIndicator()
-        Grsi = RSIGainzy()
-        df.rename(columns={'close':'Close','open':'Open','high':'High','low':'Low','volume':'Volume'},inplace=True)
-        if MASTER_HEIKEN_CHOICE==1:
-            calculate_heiken_ashi(df)
-        df = rf.run_filter(df)
-        # df['gaizy_color'] = self.Grsi.calculate_signals(df=df)
-        df.rename(columns={'Close':'close','Open':'open','High':'high','Low':'low','Volume':'volume'},inplace=True)
-        df['rsi'],df['rsi_buy'],df['rsi_sell'] = bsrsi.generate_signals(df['close'])
-        df['gaizy_color'] = Grsi.calculate_gainzy_colors(df=df)
-        # df,_ = calculate_inside_bar_boxes(df)
-        df = calculate_inside_ib_box(df)
-        columns_to_drop = [
-            'RF_UpperBand', 'RF_LowerBand', 'RF_Filter', 'RF_Trend',
-            'IsIB', 'BoxHigh', 'BoxLow', 'BarColor','rsi'
-        ]
-        df = df.drop(columns=columns_to_drop)
-
-        df = df.tail(200)
+        # Heiken-Ashi candles -> RF, RSI, Gainzy colors and IB box in one pass (module/pipeline.py)
+        df = signal_pipeline(heiken=MASTER_HEIKEN_CHOICE==1).run(df, TYPE1_3_SIGNAL_COLUMNS, window=200)
         df['Signal_Final'] = 0
 
         # Initialize signal tracking variables
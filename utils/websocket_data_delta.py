@@ -1,5 +1,13 @@
 import websocket
 import json
+import hashlib
+import hmac
+import threading
+import time
+
+DELTA_PUBLIC_WS = "wss://socket.delta.exchange"
+DELTA_PRIVATE_WS = "wss://socket.india.delta.exchange"
+
 
 def on_message_delta(ws,message):
     try:
@@ -31,7 +39,220 @@ def on_open_delta(ws):
     }
     ws.send(json.dumps(subscribe_msg))
 
-ws_url = "wss://socket.delta.exchange"
-ws = websocket.WebSocketApp(ws_url,on_open=on_open_delta,on_message=on_message_delta,on_error=on_error_delta,on_close=on_close_delta)
 
-ws.run_forever()
\ No newline at end of file
+class DeltaPrivateSocket:
+    """
+    Order and position book of one Delta account, kept up to date by the
+    authenticated websocket (orders / positions channels)
+
+    MartingaleManager polled get_order_status for both bracket legs and
+    get_active_positions on every loop iteration. With the socket live,
+    DeltaBroker answers those from this book instead (no REST call), and the
+    main loop wakes up on the push of a fill instead of after its sleep.
+
+    Usage:
+        socket = DeltaPrivateSocket(DELTA_API_KEY, DELTA_API_SECRET, symbols=["ETHUSD"])
+        socket.start()
+        socket.order_status(order_id)   # get_order_status shaped dict, None when unknown
+        socket.position_size("ETHUSD")  # None while not live or the symbol is unknown
+        socket.wait_for_event(2)        # True as soon as an order / position changed
+
+    The book is only trusted while is_live(): authenticated, both snapshots
+    received and a message (or heartbeat) within max_age seconds. The
+    callers fall back to REST otherwise; every (re)connect starts from fresh
+    snapshots.
+    """
+
+    def __init__(self, api_key, api_secret, symbols=("ETHUSD",), url=DELTA_PRIVATE_WS, max_age=None,
+                 ping_interval=20):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.symbols = list(symbols)
+        self.url = url
+        # Delta sends a heartbeat every 30 seconds once enabled
+        self.max_age = max_age if max_age is not None else 35
+        self.ping_interval = ping_interval
+
+        self.lock = threading.RLock()
+        self.orders = {}
+        self.positions = {}
+        self.snapshots = set()
+        self.authenticated = False
+        self.connected = False
+        self.last_message = None
+        self.event = threading.Event()
+        self.ws = None
+        self.thread = None
+        self.stopped = threading.Event()
+        self.messages = 0
+
+    def generate_signature(self, secret, message):
+        # same signature as DeltaBroker.generate_signature
+        return hmac.new(bytes(secret, 'utf-8'), bytes(message, 'utf-8'), hashlib.sha256).hexdigest()
+
+    def auth_message(self, timestamp=None):
+        """key-auth request: signature of GET + timestamp + /live"""
+        timestamp = str(int(time.time())) if timestamp is None else str(timestamp)
+        signature = self.generate_signature(self.api_secret, "GET" + timestamp + "/live")
+        return {"type": "key-auth", "payload": {"api-key": self.api_key, "signature": signature,
+                                                 "timestamp": timestamp}}
+
+    def subscribe_message(self):
+        return {"type": "subscribe", "payload": {"channels": [
+            {"name": "orders", "symbols": self.symbols},
+            {"name": "positions", "symbols": self.symbols},
+        ]}}
+
+    def is_live(self):
+        """Authenticated, order / position snapshots received and a message within max_age seconds"""
+        return (self.connected and self.authenticated and {'orders', 'positions'} <= self.snapshots
+                and self.last_message is not None and time.monotonic() - self.last_message < self.max_age)
+
+    def _reset_book(self):
+        with self.lock:
+            self.orders.clear()
+            self.positions.clear()
+            self.snapshots.clear()
+            self.authenticated = False
+
+    def _apply_order(self, order, action):
+        # snapshot items carry 'id', some update pushes only 'order_id'
+        order_id = order.get('id', order.get('order_id'))
+        if order_id is None:
+            return
+        with self.lock:
+            known = self.orders.get(order_id, {})
+            # 'delete' is the last message of a cancelled / filled order, keep it for order_status
+            self.orders[order_id] = dict(known, **order)
+            self.orders[order_id]['id'] = order_id
+
+    def _apply_position(self, position, action):
+        # snapshot items carry 'product_symbol', update pushes 'symbol'
+        symbol = position.get('product_symbol', position.get('symbol'))
+        if symbol is None:
+            return
+        with self.lock:
+            if action == 'delete':
+                self.positions[symbol] = dict(position, size=0)
+            else:
+                self.positions[symbol] = dict(self.positions.get(symbol, {}), **position)
+
+    def handle_message(self, message):
+        """Apply one websocket message (str or dict) to the book"""
+        data = json.loads(message) if isinstance(message, (str, bytes)) else message
+        kind = data.get('type')
+        self.last_message = time.monotonic()
+        self.messages += 1
+
+        if kind in ('key-auth', 'auth'):
+            if data.get('success'):
+                self.authenticated = True
+                if self.ws is not None:
+                    self.ws.send(json.dumps(self.subscribe_message()))
+            else:
+                print(f"Delta websocket authentication failed: {data}")
+            return
+        if kind not in ('orders', 'positions'):
+            return  # heartbeat, pong, subscriptions
+
+        action = data.get('action')
+        apply = self._apply_order if kind == 'orders' else self._apply_position
+        with self.lock:
+            if action == 'snapshot':
+                (self.orders if kind == 'orders' else self.positions).clear()
+                for item in data.get('result', []):
+                    apply(item, action)
+                self.snapshots.add(kind)
+            else:
+                apply(data, action)
+        self.event.set()
+
+    def order_status(self, order_id):
+        """The order as DeltaBroker.get_order_status returns it, None when the book does not know it"""
+        with self.lock:
+            order = self.orders.get(order_id)
+            return {'success': True, 'result': dict(order)} if order is not None else None
+
+    def position_size(self, symbol):
+        """
+        Position size of a symbol (0 when flat), None while the socket is not
+        live or when no snapshot / push has named the symbol yet (the callers
+        ask REST then)
+        """
+        if not self.is_live():
+            return None
+        with self.lock:
+            position = self.positions.get(symbol)
+            return float(position.get('size', 0) or 0) if position is not None else None
+
+    def wait_for_event(self, timeout):
+        """Sleep up to timeout seconds, waking on the next order / position push; True when woken"""
+        if not self.is_live():
+            time.sleep(timeout)
+            return False
+        woken = self.event.wait(timeout)
+        self.event.clear()
+        return woken
+
+    def _on_open(self, ws):
+        self._reset_book()
+        self.connected = True
+        ws.send(json.dumps(self.auth_message()))
+        ws.send(json.dumps({"type": "enable_heartbeat"}))
+        print("Delta private websocket connection opened")
+
+    def _on_message(self, ws, message):
+        try:
+            self.handle_message(message)
+        except Exception as e:
+            print(f"Error processing Delta websocket message: {e}")
+
+    def _on_error(self, ws, error):
+        print(f"Delta websocket error: {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        self.connected = False
+        print("Delta private websocket connection closed")
+
+    def _heartbeat(self):
+        while not self.stopped.wait(self.ping_interval):
+            try:
+                if self.connected and self.ws is not None:
+                    self.ws.send(json.dumps({"type": "ping"}))
+            except Exception as e:
+                print(f"Error sending the websocket ping : {e}")
+
+    def _run(self):
+        delay = 1
+        while not self.stopped.is_set():
+            started = time.monotonic()
+            self.ws = websocket.WebSocketApp(self.url, on_open=self._on_open, on_message=self._on_message,
+                                             on_error=self._on_error, on_close=self._on_close)
+            self.ws.run_forever()
+            self.connected = False
+            if self.stopped.is_set():
+                break
+            # reconnect, backing off while the connection keeps dropping right away
+            delay = 1 if time.monotonic() - started > 60 else min(delay * 2, 60)
+            self.stopped.wait(delay)
+
+    def start(self):
+        """Start the websocket / heartbeat threads"""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.connected = False
+        if self.ws is not None:
+            self.ws.close()
+
+
+if __name__ == "__main__":
+    ws_url = DELTA_PUBLIC_WS
+    ws = websocket.WebSocketApp(ws_url,on_open=on_open_delta,on_message=on_message_delta,on_error=on_error_delta,on_close=on_close_delta)
+
+    ws.run_forever()